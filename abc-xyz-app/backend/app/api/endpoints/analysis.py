@@ -2,24 +2,33 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.core.auth import get_current_active_user
-from app.database import get_db
-from app.models.analysis import AnalysisResult, AnalysisResultDetail, AnalysisResultMonthly
+from app.core.cache import dashboard_cache, whatif_cache
+from app.database import get_db, SessionLocal
+from app.models.analysis import AnalysisResult, AnalysisResultDetail, AnalysisResultMonthly, AnalysisRunProfile
 from app.models.configuration import AnalysisConfiguration
 from app.models.user import User
 from app.schemas.analysis import AnalysisResult as AnalysisResultSchema
-from app.schemas.analysis import AnalysisRequest, AnalysisSummary, ResultDetail
-from app.services.analysis_service import run_abc_xyz_analysis, get_analysis_summary, run_abc_xyz_script
-from datetime import datetime
+from app.schemas.analysis import (
+    AnalysisBatchRequest, AnalysisJob, AnalysisRequest, AnalysisSummary, ResultCacheStats, ResultDetail, StageProfile,
+    WhatIfRequest, WhatIfResult
+)
+from app.services.analysis_service import (
+    get_analysis_summary, result_cache_stats, run_whatif
+)
+from app.services.job_service import JobQueueFull, enqueue_analysis, enqueue_batch_analysis, job_queue
+from datetime import datetime, timedelta
 router = APIRouter()
 
-@router.post("/run", response_model=AnalysisResultSchema, status_code=status.HTTP_201_CREATED)
-async def run_analysis(
+@router.post("/run", response_model=AnalysisJob, status_code=status.HTTP_202_ACCEPTED)
+def run_analysis(
     analysis_request: AnalysisRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Pokreće ABC-XYZ analizu s navedenim parametrima.
+    Dodaje ABC-XYZ analizu s pragovima i faktorima odabrane konfiguracije u red poslova.
+    
+    Stanje posla i ResultID po završetku prate se preko GET /analysis/jobs/{job_id}.
     """
     # Provjera postoji li konfiguracija
     config_id = analysis_request.config_id
@@ -41,50 +50,131 @@ async def run_analysis(
                 detail=f"Configuration with ID {config_id} not found"
             )
     
-    # Pokretanje analize
     try:
-        result = run_abc_xyz_analysis(
-            db=db,
+        job_id = enqueue_analysis(
+            SessionLocal,
             config_id=config_id,
             analysis_name=analysis_request.analysis_name,
             start_date=analysis_request.start_date,
             end_date=analysis_request.end_date,
             warehouse_zones=analysis_request.warehouse_zones,
             item_codes=analysis_request.item_codes,
-            created_by=current_user.Username
+            created_by=current_user.Username,
+            force_refresh=analysis_request.force_refresh
+        )
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    return job_queue.get(job_id)
+
+@router.post("/run-batch", response_model=AnalysisJob, status_code=status.HTTP_202_ACCEPTED)
+def run_analysis_batch(
+    batch_request: AnalysisBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Dodaje ABC-XYZ analizu za više konfiguracija (jedno učitavanje podataka) u red poslova.
+    
+    Svaka konfiguracija sprema se kao zasebna analiza; po završetku posla
+    GET /analysis/jobs/{job_id} vraća result_ids redom kao config_ids.
+    """
+    config_ids = batch_request.config_ids
+    if not config_ids or len(set(config_ids)) != len(config_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="config_ids must be a non-empty list without duplicates"
+        )
+    
+    # Provjera postoje li sve konfiguracije
+    found = {
+        config_id for (config_id,) in
+        db.query(AnalysisConfiguration.ConfigID).filter(AnalysisConfiguration.ConfigID.in_(config_ids)).all()
+    }
+    missing = [config_id for config_id in config_ids if config_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Configurations not found: {missing}"
+        )
+    
+    try:
+        job_id = enqueue_batch_analysis(
+            SessionLocal,
+            config_ids=config_ids,
+            analysis_name=batch_request.analysis_name,
+            start_date=batch_request.start_date,
+            end_date=batch_request.end_date,
+            warehouse_zones=batch_request.warehouse_zones,
+            item_codes=batch_request.item_codes,
+            created_by=current_user.Username,
+            force_refresh=batch_request.force_refresh
         )
-        return result
-    except Exception as e:
+    except JobQueueFull as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(e)
         )
+    return job_queue.get(job_id)
 
-@router.post("/run-script", response_model=AnalysisResultSchema, status_code=status.HTTP_201_CREATED)
+@router.post("/run-script", response_model=AnalysisJob, status_code=status.HTTP_202_ACCEPTED)
 async def run_abc_xyz_script_endpoint(
     analysis_request: AnalysisRequest,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Pokreće ABC-XYZ.py skriptu s navedenim parametrima.
+    Dodaje ABC-XYZ analizu u red poslova i odmah vraća ID posla.
+    
+    Stanje posla prati se preko GET /analysis/jobs/{job_id}.
     """
+    # Zadano razdoblje: zadnjih godinu dana
+    end_date = analysis_request.end_date or datetime.now()
+    start_date = analysis_request.start_date or end_date - timedelta(days=365)
+    
     try:
-        result = run_abc_xyz_script(
-            db=db,
+        job_id = enqueue_analysis(
+            SessionLocal,
             analysis_name=analysis_request.analysis_name,
-            start_date=analysis_request.start_date,
-            end_date=analysis_request.end_date,
+            start_date=start_date,
+            end_date=end_date,
             warehouse_zones=analysis_request.warehouse_zones,
             item_codes=analysis_request.item_codes,
-            created_by=current_user.Username
+            created_by=current_user.Username,
+            force_refresh=analysis_request.force_refresh
         )
-        return result
-    except Exception as e:
+    except JobQueueFull as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(e)
         )
+    return job_queue.get(job_id)
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJob)
+async def read_analysis_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Dohvaća stanje posla analize (stanje, trenutnu fazu i ResultID po završetku).
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+@router.get("/cache/stats", response_model=ResultCacheStats)
+async def read_result_cache_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Dohvaća brojače ponovno korištenih rezultata analize (pogoci, promašaji i prisilna osvježavanja).
+    """
+    return dict(result_cache_stats)
 
 @router.get("/", response_model=List[AnalysisSummary])
 async def read_analyses(
@@ -161,6 +251,67 @@ async def read_analysis_details(
     
     return details
 
+@router.get("/{result_id}/profile", response_model=List[StageProfile])
+async def read_analysis_profile(
+    result_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Dohvaća profil faza analize (trajanje, procesorsko vrijeme i vršnu memoriju) redom izvođenja.
+    """
+    analysis = db.query(AnalysisResult).filter(AnalysisResult.ResultID == result_id).first()
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    
+    stages = (
+        db.query(AnalysisRunProfile)
+        .filter(AnalysisRunProfile.ResultID == result_id)
+        .order_by(AnalysisRunProfile.StageOrder)
+        .all()
+    )
+    return [
+        StageProfile(
+            stage=stage.Stage,
+            wall_seconds=stage.WallSeconds,
+            cpu_seconds=stage.CpuSeconds,
+            peak_memory_mb=stage.PeakMemoryMB
+        )
+        for stage in stages
+    ]
+
+@router.post("/{result_id}/what-if", response_model=WhatIfResult)
+async def whatif_analysis(
+    result_id: int,
+    whatif_request: WhatIfRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Reklasificira spremljenu analizu s izmijenjenim granicama i faktorima, bez ponovnog čitanja pikova.
+    
+    Vraća broj artikala po klasi prije i poslije, prelaske između ABC-XYZ klasa
+    i promjene min/max količina. Ništa se ne sprema.
+    """
+    analysis = db.query(AnalysisResult).filter(AnalysisResult.ResultID == result_id).first()
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    
+    overrides = whatif_request.dict(exclude={'changed_items_limit'})
+    try:
+        return run_whatif(db, analysis, overrides, whatif_request.changed_items_limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
 @router.delete("/{result_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_analysis(
     result_id: int,
@@ -181,5 +332,7 @@ async def delete_analysis(
     # Brisanje analize (kaskadno će se obrisati i svi detalji)
     db.delete(analysis)
     db.commit()
+    dashboard_cache.invalidate()
+    whatif_cache.invalidate(result_id)
     
     return None
@@ -1,57 +1,63 @@
-from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.auth import get_current_active_user
+from app.core.config import settings
+from app.core.cache import dashboard_cache
 from app.database import get_db, execute_query
 from app.models.user import User
-from app.services.data_service import get_warehouse_zones
 import pandas as pd
 
 router = APIRouter()
 
+# Sažetak za dashboard: sva četiri broja jednim upitom
+DASHBOARD_SUMMARY_QUERY = """
+SELECT
+    (SELECT COUNT(DISTINCT ItemCode) FROM dbo.Picking) AS ItemCount,
+    (SELECT COUNT(*) FROM dbo.Picking WHERE PickDateTime >= DATEADD(day, -30, GETDATE())) AS PickingCount,
+    (SELECT COUNT(DISTINCT Storage_system) FROM dbo.Locations WHERE Storage_system IS NOT NULL) AS ZoneCount,
+    (SELECT COUNT(*) FROM dbo.AnalysisResults) AS AnalysisCount
+"""
+
+def load_dashboard_summary() -> Dict[str, int]:
+    """
+    Dohvaća broj artikala, broj pikova u zadnjih 30 dana, broj zona i broj analiza jednim upitom.
+    """
+    df = execute_query(DASHBOARD_SUMMARY_QUERY)
+    row = df.iloc[0] if not df.empty else {}
+    return {
+        "item_count": int(row.get('ItemCount', 0) or 0),
+        "picking_count": int(row.get('PickingCount', 0) or 0),
+        "zone_count": int(row.get('ZoneCount', 0) or 0),
+        "analysis_count": int(row.get('AnalysisCount', 0) or 0)
+    }
+
 @router.get("/summary")
 async def get_dashboard_summary(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Dohvaća sažetak podataka za dashboard.
-    """
-    # Dohvaćanje broja artikala
-    item_count_query = """
-    SELECT COUNT(DISTINCT ItemCode) AS ItemCount
-    FROM dbo.Picking
-    """
-    item_count_df = execute_query(item_count_query)
-    item_count = item_count_df['ItemCount'].iloc[0] if not item_count_df.empty else 0
     
-    # Dohvaćanje broja picking operacija u zadnjih 30 dana
-    picking_count_query = """
-    SELECT COUNT(*) AS PickingCount
-    FROM dbo.Picking
-    WHERE PickDateTime >= DATEADD(day, -30, GETDATE())
+    Rezultat se čuva u predmemoriji do isteka DASHBOARD_CACHE_TTL ili do
+    završetka dnevnog importa (POST /dashboard/cache/invalidate).
     """
-    picking_count_df = execute_query(picking_count_query)
-    picking_count = picking_count_df['PickingCount'].iloc[0] if not picking_count_df.empty else 0
-    
-    # Dohvaćanje broja zona skladišta
-    warehouse_zones = get_warehouse_zones()
-    zone_count = len(warehouse_zones)
-    
-    # Dohvaćanje broja analiza
-    analysis_count_query = """
-    SELECT COUNT(*) AS AnalysisCount
-    FROM dbo.AnalysisResults
+    return dashboard_cache.get_or_set('summary', load_dashboard_summary)
+
+@router.post("/cache/invalidate", status_code=status.HTTP_204_NO_CONTENT)
+async def invalidate_dashboard_cache(
+    x_import_token: Optional[str] = Header(None)
+):
     """
-    analysis_count_df = execute_query(analysis_count_query)
-    analysis_count = analysis_count_df['AnalysisCount'].iloc[0] if not analysis_count_df.empty else 0
-    
-    return {
-        "item_count": item_count,
-        "picking_count": picking_count,
-        "zone_count": zone_count,
-        "analysis_count": analysis_count
-    }
+    Poništava predmemoriju dashboarda; poziva se nakon dnevnog importa picking podataka.
+    """
+    if not settings.IMPORT_NOTIFY_TOKEN or x_import_token != settings.IMPORT_NOTIFY_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid import token"
+        )
+    dashboard_cache.invalidate()
+    return None
 
 @router.get("/picking-trend")
 async def get_picking_trend(
@@ -62,25 +68,41 @@ async def get_picking_trend(
     """
     Dohvaća trend picking operacija za zadani broj dana.
     """
-    query = f"""
-    SELECT 
-        CAST(PickDateTime AS DATE) AS PickDate,
-        COUNT(*) AS PickCount
-    FROM 
-        dbo.Picking
-    WHERE 
-        PickDateTime >= DATEADD(day, -{days}, GETDATE())
-    GROUP BY 
-        CAST(PickDateTime AS DATE)
-    ORDER BY 
-        PickDate
-    """
+    if settings.DASHBOARD_DAILY_AGGREGATE:
+        # Dnevni agregat (create_picking_daily.sql i backfill moraju biti izvršeni)
+        query = f"""
+        SELECT 
+            PickDate,
+            SUM(PickCount) AS PickCount
+        FROM 
+            dbo.PickingDaily
+        WHERE 
+            PickDate >= CAST(DATEADD(day, -{days}, GETDATE()) AS DATE)
+        GROUP BY 
+            PickDate
+        ORDER BY 
+            PickDate
+        """
+    else:
+        query = f"""
+        SELECT 
+            CAST(PickDateTime AS DATE) AS PickDate,
+            COUNT(*) AS PickCount
+        FROM 
+            dbo.Picking
+        WHERE 
+            PickDateTime >= DATEADD(day, -{days}, GETDATE())
+        GROUP BY 
+            CAST(PickDateTime AS DATE)
+        ORDER BY 
+            PickDate
+        """
     
     df = execute_query(query)
     
     # Pretvaranje u format za frontend
     if not df.empty:
-        df['PickDate'] = df['PickDate'].dt.strftime('%Y-%m-%d')
+        df['PickDate'] = pd.to_datetime(df['PickDate']).dt.strftime('%Y-%m-%d')
         result = df.to_dict(orient='records')
     else:
         result = []
@@ -96,21 +118,38 @@ async def get_top_items(
     """
     Dohvaća top artikle po broju picking operacija.
     """
-    query = f"""
-    SELECT TOP {limit}
-        ItemCode,
-        ItemName,
-        COUNT(*) AS PickCount,
-        SUM(Qty) AS TotalQty
-    FROM 
-        dbo.Picking
-    WHERE 
-        PickDateTime >= DATEADD(month, -3, GETDATE())
-    GROUP BY 
-        ItemCode, ItemName
-    ORDER BY 
-        PickCount DESC
-    """
+    if settings.DASHBOARD_DAILY_AGGREGATE:
+        query = f"""
+        SELECT TOP {limit}
+            ItemCode,
+            ItemName,
+            SUM(PickCount) AS PickCount,
+            SUM(QtySum) AS TotalQty
+        FROM 
+            dbo.PickingDaily
+        WHERE 
+            PickDate >= CAST(DATEADD(month, -3, GETDATE()) AS DATE)
+        GROUP BY 
+            ItemCode, ItemName
+        ORDER BY 
+            PickCount DESC
+        """
+    else:
+        query = f"""
+        SELECT TOP {limit}
+            ItemCode,
+            ItemName,
+            COUNT(*) AS PickCount,
+            SUM(Qty) AS TotalQty
+        FROM 
+            dbo.Picking
+        WHERE 
+            PickDateTime >= DATEADD(month, -3, GETDATE())
+        GROUP BY 
+            ItemCode, ItemName
+        ORDER BY 
+            PickCount DESC
+        """
     
     df = execute_query(query)
     
@@ -127,20 +166,36 @@ async def get_warehouse_distribution(
     """
     Dohvaća distribuciju picking operacija po zonama skladišta.
     """
-    query = """
-    SELECT 
-        Storage_system AS WarehouseZone,
-        COUNT(*) AS PickCount
-    FROM 
-        dbo.v_pickingStorageSystem
-    WHERE 
-        Storage_system IS NOT NULL
-        AND PickDateTime >= DATEADD(month, -3, GETDATE())
-    GROUP BY 
-        Storage_system
-    ORDER BY 
-        PickCount DESC
-    """
+    if settings.DASHBOARD_DAILY_AGGREGATE:
+        query = """
+        SELECT 
+            Storage_system AS WarehouseZone,
+            SUM(PickCount) AS PickCount
+        FROM 
+            dbo.PickingDaily
+        WHERE 
+            Storage_system IS NOT NULL
+            AND PickDate >= CAST(DATEADD(month, -3, GETDATE()) AS DATE)
+        GROUP BY 
+            Storage_system
+        ORDER BY 
+            PickCount DESC
+        """
+    else:
+        query = """
+        SELECT 
+            Storage_system AS WarehouseZone,
+            COUNT(*) AS PickCount
+        FROM 
+            dbo.v_pickingStorageSystem
+        WHERE 
+            Storage_system IS NOT NULL
+            AND PickDateTime >= DATEADD(month, -3, GETDATE())
+        GROUP BY 
+            Storage_system
+        ORDER BY 
+            PickCount DESC
+        """
     
     df = execute_query(query)
     
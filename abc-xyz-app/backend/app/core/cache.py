@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Jednostavna predmemorija u memoriji procesa s vremenom isteka zapisa.
+
+    Zapisi istječu nakon ttl_seconds ili kad se eksplicitno ponište
+    (npr. nakon dnevnog importa picking podataka).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Vraća zapis iz predmemorije ili ga izračunava pozivom factory() i sprema.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+
+        value = factory()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """
+        Poništava jedan zapis ili, bez ključa, cijelu predmemoriju.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self.stats['invalidations'] += 1
+
+
+# Predmemorija sažetka dashboarda; poništava se nakon dnevnog importa i nakon spremanja/brisanja analize
+dashboard_cache = TTLCache(settings.DASHBOARD_CACHE_TTL)
+
+# Pripremljeni spremljeni rezultati za "što ako" reklasifikaciju, po ResultID-u; poništava se brisanjem analize
+whatif_cache = TTLCache(settings.WHATIF_CACHE_TTL)
@@ -5,6 +5,9 @@ from dotenv import load_dotenv
 # Učitavanje varijabli okruženja iz .env datoteke
 load_dotenv()
 
+# Korijenski direktorij repozitorija (ABC_XYZ.py i paket abc_xyz)
+DEFAULT_ANALYSIS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+
 class Settings(BaseSettings):
     # Postavke aplikacije
     APP_NAME: str = os.getenv("APP_NAME", "ABC-XYZ Analysis")
@@ -20,6 +23,37 @@ class Settings(BaseSettings):
     DB_USER: str = os.getenv("DB_USER", "")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
     DB_TRUSTED_CONNECTION: bool = os.getenv("DB_TRUSTED_CONNECTION", "True").lower() == "true"
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    
+    # Postavke analize
+    ANALYSIS_ROOT: str = os.getenv("ANALYSIS_ROOT", DEFAULT_ANALYSIS_ROOT)
+    PICKING_CACHE_DIR: str = os.getenv("PICKING_CACHE_DIR", "")
+    ANALYSIS_RESULTS_DIR: str = os.getenv("ANALYSIS_RESULTS_DIR", "")
+    AGGREGATE_CACHE_DIR: str = os.getenv("AGGREGATE_CACHE_DIR", "")
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "2"))
+    ANALYSIS_MAX_PENDING_JOBS: int = int(os.getenv("ANALYSIS_MAX_PENDING_JOBS", "20"))
+    # Mjesečni zbrojevi po artiklu računaju se u bazi umjesto prijenosa svih pikova;
+    # ima prednost pred PICKING_CACHE_DIR i ANALYSIS_LOCATION_LOOKUP (ne i pred AGGREGATE_CACHE_DIR)
+    ANALYSIS_PUSHDOWN: bool = os.getenv("ANALYSIS_PUSHDOWN", "True").lower() == "true"
+    # Dnevni agregat dbo.PickingDaily uključuje se tek nakon create_picking_daily.sql i
+    # jednokratnog punjenja povijesti (python -m abc_xyz.daily backfill); bez toga su rezultati prazni
+    ANALYSIS_DAILY_AGGREGATE: bool = os.getenv("ANALYSIS_DAILY_AGGREGATE", "False").lower() == "true"
+    ANALYSIS_LOCATION_LOOKUP: bool = os.getenv("ANALYSIS_LOCATION_LOOKUP", "False").lower() == "true"
+    LOCATIONS_REFRESH_SECONDS: int = int(os.getenv("LOCATIONS_REFRESH_SECONDS", "3600"))
+    # Profil faza po analizi; praćenje memorije (tracemalloc) je sporo i zajedničko
+    # svim dretvama, pa ima smisla samo uz ANALYSIS_WORKERS=1
+    ANALYSIS_PROFILE: bool = os.getenv("ANALYSIS_PROFILE", "True").lower() == "true"
+    ANALYSIS_PROFILE_MEMORY: bool = os.getenv("ANALYSIS_PROFILE_MEMORY", "False").lower() == "true"
+    WHATIF_CACHE_TTL: int = int(os.getenv("WHATIF_CACHE_TTL", "1800"))
+    
+    # Postavke dashboarda
+    DASHBOARD_CACHE_TTL: int = int(os.getenv("DASHBOARD_CACHE_TTL", "3600"))
+    DASHBOARD_DAILY_AGGREGATE: bool = os.getenv("DASHBOARD_DAILY_AGGREGATE", "False").lower() == "true"
+    IMPORT_NOTIFY_TOKEN: str = os.getenv("IMPORT_NOTIFY_TOKEN", "")
     
     # Postavke za CORS
     CORS_ORIGINS: list = ["http://localhost:3000"]
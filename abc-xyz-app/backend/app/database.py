@@ -1,4 +1,7 @@
-import pyodbc
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -11,8 +14,16 @@ if settings.DB_TRUSTED_CONNECTION:
 else:
     connection_string = f"Driver={{{settings.DB_DRIVER}}};Server={settings.DB_SERVER};Database={settings.DB_NAME};UID={settings.DB_USER};PWD={settings.DB_PASSWORD};"
 
-# Kreiranje SQLAlchemy engine-a
-engine = create_engine(f"mssql+pyodbc:///?odbc_connect={connection_string}")
+# Kreiranje SQLAlchemy engine-a (fast_executemany ubrzava skupne INSERT-e)
+engine = create_engine(
+    f"mssql+pyodbc:///?odbc_connect={connection_string}",
+    fast_executemany=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING
+)
 
 # Kreiranje sesije
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -28,13 +39,77 @@ def get_db():
     finally:
         db.close()
 
-# Funkcija za direktno izvršavanje SQL upita i dobivanje rezultata kao DataFrame
-def execute_query(query, params=None):
+# Brojači preuzimanja konekcija preko pooled_connection, zasebno za svaki pool
+_pool_counters = weakref.WeakKeyDictionary()
+_pool_counters_lock = threading.Lock()
+
+def _counters(pool) -> dict:
+    # Poziva se unutar _pool_counters_lock
+    if pool not in _pool_counters:
+        _pool_counters[pool] = {'checkouts': 0, 'waits': 0, 'wait_seconds': 0.0}
+    return _pool_counters[pool]
+
+def _pool_exhausted(pool) -> bool:
+    # QueuePool: sve konekcije i dopušteni preljev su zauzeti (preljev -1 je neograničen)
+    max_overflow = getattr(pool, '_max_overflow', -1)
+    if not hasattr(pool, 'size') or max_overflow < 0:
+        return False
+    return pool.checkedout() >= pool.size() + max_overflow
+
+@contextmanager
+def pooled_connection(bind=None):
+    """
+    Posuđuje DBAPI konekciju (pyodbc) iz poola engine-a.
+    
+    Na kraju se konekcija vraća u pool umjesto zatvaranja, pa se ne plaća
+    ponovno spajanje i prijava na SQL Server za svaki upit.
+    
+    Args:
+        bind: Engine čiji se pool koristi (zadano: engine aplikacije)
+    """
+    bind = bind if bind is not None else engine
+    exhausted = _pool_exhausted(bind.pool)
+    start = time.perf_counter()
+    conn = bind.raw_connection()
+    waited = time.perf_counter() - start
+    
+    with _pool_counters_lock:
+        counters = _counters(bind.pool)
+        counters['checkouts'] += 1
+        if exhausted:
+            counters['waits'] += 1
+            counters['wait_seconds'] += waited
+    
     try:
-        conn = pyodbc.connect(connection_string)
-        df = pd.read_sql(query, conn, params=params)
+        yield conn
+    finally:
         conn.close()
-        return df
+
+def get_pool_stats(bind=None) -> dict:
+    """
+    Vraća stanje poola konekcija i brojače preuzimanja.
+    
+    Returns:
+        Rječnik s veličinom poola, brojem posuđenih i slobodnih konekcija,
+        preljevom te brojem preuzimanja i čekanja na slobodnu konekciju
+    """
+    pool = (bind if bind is not None else engine).pool
+    stats = {
+        'pool_size': pool.size() if hasattr(pool, 'size') else None,
+        'max_overflow': getattr(pool, '_max_overflow', None),
+        'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+        'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+        'overflow': pool.overflow() if hasattr(pool, 'overflow') else None
+    }
+    with _pool_counters_lock:
+        stats.update(_counters(pool))
+    return stats
+
+# Funkcija za direktno izvršavanje SQL upita i dobivanje rezultata kao DataFrame
+def execute_query(query, params=None, bind=None):
+    try:
+        with pooled_connection(bind) as conn:
+            return pd.read_sql(query, conn, params=params)
     except Exception as e:
         print(f"Error executing query: {e}")
         raise
@@ -2,7 +2,7 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.routes import api_router
-from app.database import engine, Base
+from app.database import engine, Base, get_pool_stats
 
 # Kreiranje FastAPI aplikacije
 app = FastAPI(
@@ -39,6 +39,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Stanje poola konekcija na bazu
+@app.get("/health/db")
+async def db_pool_stats():
+    return get_pool_stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=6000, reload=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -19,9 +19,13 @@ class AnalysisResult(Base):
     Y_Items = Column(Integer)
     Z_Items = Column(Integer)
     CreatedBy = Column(String(100))
+    Fingerprint = Column(String(64), index=True)  # Sažetak parametara i vodenog žiga podataka
+    AnalysisParams = Column(Text)  # Granice i faktori s kojima je analiza izvedena (JSON)
     
     # Relacije
     details = relationship("AnalysisResultDetail", back_populates="result", cascade="all, delete-orphan")
+    profile = relationship("AnalysisRunProfile", back_populates="result", cascade="all, delete-orphan",
+                           order_by="AnalysisRunProfile.StageOrder")
     configuration = relationship("AnalysisConfiguration")
 
 class AnalysisResultDetail(Base):
@@ -59,3 +63,17 @@ class AnalysisResultMonthly(Base):
     
     # Relacije
     detail = relationship("AnalysisResultDetail", back_populates="monthly_data")
+
+class AnalysisRunProfile(Base):
+    __tablename__ = "AnalysisRunProfiles"
+    
+    ProfileID = Column(Integer, primary_key=True, index=True)
+    ResultID = Column(Integer, ForeignKey("AnalysisResults.ResultID"), nullable=False)
+    StageOrder = Column(Integer, nullable=False)
+    Stage = Column(String(50), nullable=False)
+    WallSeconds = Column(Float)
+    CpuSeconds = Column(Float)
+    PeakMemoryMB = Column(Float)  # NULL ako se memorija nije pratila
+    
+    # Relacije
+    result = relationship("AnalysisResult", back_populates="profile")
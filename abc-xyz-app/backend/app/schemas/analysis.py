@@ -80,6 +80,17 @@ class AnalysisRequest(BaseModel):
     end_date: Optional[datetime] = None
     warehouse_zones: Optional[List[str]] = None
     item_codes: Optional[List[str]] = None
+    force_refresh: bool = False  # Izračun i kad postoji isti raniji rezultat nad istim podacima
+
+# Shema za zahtjev za usporednu analizu više konfiguracija nad jednim učitavanjem podataka
+class AnalysisBatchRequest(BaseModel):
+    analysis_name: str
+    config_ids: List[int]
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    warehouse_zones: Optional[List[str]] = None
+    item_codes: Optional[List[str]] = None
+    force_refresh: bool = False
 
 # Shema za sažetak analize
 class AnalysisSummary(BaseModel):
@@ -92,3 +103,83 @@ class AnalysisSummary(BaseModel):
     
     class Config:
         orm_mode = True
+
+# Shema za stanje posla analize u redu poslova
+class AnalysisJob(BaseModel):
+    job_id: str
+    name: Optional[str] = None
+    state: str
+    stage: Optional[str] = None
+    result_id: Optional[int] = None
+    result_ids: Optional[List[int]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+# Shema za fazu profila analize (trajanje, procesorsko vrijeme i vršna memorija)
+class StageProfile(BaseModel):
+    stage: str
+    wall_seconds: Optional[float] = None
+    cpu_seconds: Optional[float] = None
+    peak_memory_mb: Optional[float] = None
+
+# Shema za brojače ponovno korištenih rezultata analize
+class ResultCacheStats(BaseModel):
+    hits: int
+    misses: int
+    forced_refreshes: int
+
+# Shema za "što ako" reklasifikaciju spremljenog rezultata (nezadane vrijednosti iz konfiguracije analize)
+class WhatIfRequest(BaseModel):
+    abc_a_threshold: Optional[float] = None
+    abc_b_threshold: Optional[float] = None
+    xyz_x_threshold: Optional[float] = None
+    xyz_y_threshold: Optional[float] = None
+    lead_time_weeks: Optional[float] = None
+    safety_stock_x_factor: Optional[float] = None
+    safety_stock_y_factor: Optional[float] = None
+    safety_stock_z_factor: Optional[float] = None
+    max_qty_a_factor: Optional[float] = None
+    max_qty_b_factor: Optional[float] = None
+    max_qty_c_factor: Optional[float] = None
+    changed_items_limit: int = 100
+
+class ClassCounts(BaseModel):
+    before: dict
+    after: dict
+
+class ClassMigration(BaseModel):
+    from_class: str
+    to_class: str
+    item_count: int
+
+class MinMaxChange(BaseModel):
+    items_changed: int
+    min_qty_before: float
+    min_qty_after: float
+    max_qty_before: float
+    max_qty_after: float
+
+class WhatIfItem(BaseModel):
+    item_code: str
+    total_turnover: float
+    abc_before: str
+    abc_after: str
+    xyz_before: str
+    xyz_after: str
+    min_qty_before: Optional[float] = None
+    min_qty_after: Optional[float] = None
+    max_qty_before: Optional[float] = None
+    max_qty_after: Optional[float] = None
+
+class WhatIfResult(BaseModel):
+    result_id: int
+    total_items: int
+    parameters: dict
+    abc_counts: ClassCounts
+    xyz_counts: ClassCounts
+    migrations: List[ClassMigration]
+    min_max: MinMaxChange
+    changed_items: List[WhatIfItem]
+    elapsed_ms: float
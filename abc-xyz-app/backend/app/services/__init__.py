@@ -0,0 +1,6 @@
+import sys
+from app.core.config import settings
+
+# Paket abc_xyz nalazi se u korijenu repozitorija, uz ABC_XYZ.py
+if settings.ANALYSIS_ROOT not in sys.path:
+    sys.path.append(settings.ANALYSIS_ROOT)
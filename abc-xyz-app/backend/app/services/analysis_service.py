@@ -1,15 +1,401 @@
-import subprocess
+import hashlib
 import os
+import threading
+import time
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-from app.models.analysis import AnalysisResult, AnalysisResultDetail, AnalysisResultMonthly
+from app.core.cache import dashboard_cache, whatif_cache
+from app.core.config import settings
+from app.models.analysis import AnalysisResult, AnalysisResultDetail, AnalysisResultMonthly, AnalysisRunProfile
 from app.models.configuration import AnalysisConfiguration
 from app.schemas.analysis import AnalysisRequest
-from app.database import execute_query
+from app.database import execute_query, pooled_connection
+from abc_xyz.aggregation import month_label_index
+from abc_xyz.artifact import monthly_columns, read_results_artifact, results_table, write_results_artifact
+from abc_xyz.data import read_data_watermark
+from abc_xyz.inventory import analysis_params_from_config, inventory_params_from_config
+from abc_xyz.locations import LocationZones
+from abc_xyz.pipeline import analyze_aggregate, analyze_aggregate_configs, load_picking_aggregate
+from abc_xyz.profiling import StageProfiler
+from abc_xyz.whatif import WHATIF_COLUMNS, Reclassifier
 import json
-import tempfile
+
+# Zona po šifri lokacije iz tablice Locations, zajednička za sve analize u procesu
+location_zones = LocationZones(settings.LOCATIONS_REFRESH_SECONDS)
+
+# Broj redaka po jednom INSERT-u kod spremanja detalja i mjesečnih podataka
+RESULT_BATCH_SIZE = 5000
+
+# Polja zahtjeva za "što ako" reklasifikaciju i odgovarajuće kolone konfiguracije
+WHATIF_OVERRIDES = {
+    'abc_a_threshold': 'ABC_A_Threshold',
+    'abc_b_threshold': 'ABC_B_Threshold',
+    'xyz_x_threshold': 'XYZ_X_Threshold',
+    'xyz_y_threshold': 'XYZ_Y_Threshold',
+    'lead_time_weeks': 'LeadTimeWeeks',
+    'safety_stock_x_factor': 'SafetyStock_X_Factor',
+    'safety_stock_y_factor': 'SafetyStock_Y_Factor',
+    'safety_stock_z_factor': 'SafetyStock_Z_Factor',
+    'max_qty_a_factor': 'MaxQty_A_Factor',
+    'max_qty_b_factor': 'MaxQty_B_Factor',
+    'max_qty_c_factor': 'MaxQty_C_Factor'
+}
+
+def analysis_param_columns(analysis_params: dict) -> Dict[str, float]:
+    """
+    Parametri analize (argumenti analyze_aggregate) pod nazivima kolona konfiguracije,
+    sa zadanim vrijednostima za nezadane parametre; sprema se uz rezultat kao AnalysisParams.
+    """
+    params = {**analysis_params_from_config(None), **analysis_params}
+    inventory_params = params['inventory_params']
+    columns = {
+        'ABC_A_Threshold': params['a_threshold'],
+        'ABC_B_Threshold': params['b_threshold'],
+        'XYZ_X_Threshold': params['x_threshold'],
+        'XYZ_Y_Threshold': params['y_threshold'],
+        'LeadTimeWeeks': inventory_params['lead_time_weeks']
+    }
+    for xyz, factor in inventory_params['safety_stock_factors'].items():
+        columns[f'SafetyStock_{xyz}_Factor'] = factor
+    for abc, factor in inventory_params['max_qty_factors'].items():
+        columns[f'MaxQty_{abc}_Factor'] = factor
+    return {column: float(value) for column, value in columns.items()}
+
+# Brojači ponovno korištenih rezultata (isti parametri i isti vodeni žig podataka)
+result_cache_stats = {'hits': 0, 'misses': 0, 'forced_refreshes': 0}
+_result_cache_lock = threading.Lock()
+
+def _count_result_cache(name: str) -> None:
+    with _result_cache_lock:
+        result_cache_stats[name] += 1
+
+def analysis_fingerprint(
+    start_date: str,
+    end_date: str,
+    warehouse_zones: Optional[list],
+    item_codes: Optional[list],
+    config_id: Optional[int],
+    analysis_params: dict,
+    watermark: dict
+) -> str:
+    """
+    SHA-256 sažetak svega o čemu ovisi rezultat analize.
+    
+    Uz razdoblje, filtere i ConfigID uključuje i same pragove i faktore
+    konfiguracije (konfiguracija se može izmijeniti), izvor podataka
+    (dnevni agregat ili pikovi) i vodeni žig podataka u razdoblju.
+    Redoslijed zona i artikala u filteru nije bitan.
+    """
+    payload = {
+        'start_date': start_date,
+        'end_date': end_date,
+        'warehouse_zones': sorted(set(warehouse_zones or [])),
+        'item_codes': sorted(set(item_codes or [])),
+        'config_id': config_id,
+        'analysis_params': analysis_params,
+        'daily_aggregate': settings.ANALYSIS_DAILY_AGGREGATE,
+        'location_lookup': settings.ANALYSIS_LOCATION_LOOKUP,
+        'watermark': watermark
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+# Kolone tablice rezultata i odgovarajuće kolone spremljenih detalja
+RESULT_DETAIL_COLUMNS = {
+    'Item': AnalysisResultDetail.ItemCode,
+    'Name': AnalysisResultDetail.ItemName,
+    'Warehouse zone': AnalysisResultDetail.WarehouseZone,
+    'ABC': AnalysisResultDetail.ABC_Class,
+    'XYZ': AnalysisResultDetail.XYZ_Class,
+    'Total Turnover': AnalysisResultDetail.TotalTurnover,
+    'Total Qty': AnalysisResultDetail.TotalQuantity,
+    'Cumulative %': AnalysisResultDetail.CumulativePercentage,
+    'Coefficient Variation': AnalysisResultDetail.CoefficientVariation,
+    'Min Qty Monthly': AnalysisResultDetail.MinQtyMonthly,
+    'Max Qty Monthly': AnalysisResultDetail.MaxQtyMonthly
+}
+
+def load_result_table(db: Session, analysis_result: AnalysisResult, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Učitava spremljeni rezultat analize kao mjesečnu tablicu (Item, Name, ..., Turnover_<mjesec>, QTY_<mjesec>).
+    
+    Čita Parquet rezultat iz ANALYSIS_RESULTS_DIR ako postoji, inače detalje i
+    mjesečne podatke iz baze. Redovi su poredani po rangu.
+    
+    Args:
+        db: SQLAlchemy sesija
+        analysis_result: Spremljeni rezultat analize
+        columns: Kolone po artiklu (ključevi RESULT_DETAIL_COLUMNS); zadano kolone mjesečne tablice
+    """
+    columns = columns or ['Item', 'Name', 'Warehouse zone', 'ABC', 'XYZ', 'Total Turnover', 'Total Qty']
+    
+    if settings.ANALYSIS_RESULTS_DIR:
+        path = os.path.join(settings.ANALYSIS_RESULTS_DIR, f"result_{analysis_result.ResultID}.parquet")
+        if os.path.exists(path):
+            table = read_results_artifact(path)
+            return table[[col for col in columns if col in table.columns] + monthly_columns(table)]
+    
+    details = pd.DataFrame(
+        db.query(AnalysisResultDetail.DetailID, *[RESULT_DETAIL_COLUMNS[col] for col in columns])
+        .filter(AnalysisResultDetail.ResultID == analysis_result.ResultID)
+        .order_by(AnalysisResultDetail.Rank)
+        .all(),
+        columns=['DetailID'] + columns
+    )
+    monthly = pd.DataFrame(
+        db.query(
+            AnalysisResultMonthly.DetailID, AnalysisResultMonthly.YearMonth,
+            AnalysisResultMonthly.Turnover, AnalysisResultMonthly.Quantity
+        )
+        .join(AnalysisResultDetail, AnalysisResultDetail.DetailID == AnalysisResultMonthly.DetailID)
+        .filter(AnalysisResultDetail.ResultID == analysis_result.ResultID)
+        .all(),
+        columns=['DetailID', 'YearMonth', 'Turnover', 'Quantity']
+    )
+    
+    # Mjesečne kolone u parovima (Turnover i QTY), kronološki kao u izvještaju
+    months = sorted(monthly['YearMonth'].unique(), key=month_label_index)
+    pivot = monthly.pivot(index='DetailID', columns='YearMonth', values=['Turnover', 'Quantity'])
+    table = details.set_index('DetailID')
+    for month in months:
+        table[f'Turnover_{month}'] = pivot[('Turnover', month)]
+        table[f'QTY_{month}'] = pivot[('Quantity', month)]
+    return table.reset_index(drop=True)
+
+def _insert_in_batches(db: Session, model, df: pd.DataFrame, batch_size: int) -> None:
+    # NaN se sprema kao NULL
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    for start in range(0, len(records), batch_size):
+        db.bulk_insert_mappings(model, records[start:start + batch_size])
+
+def save_result_details(
+    db: Session,
+    result_id: int,
+    table: pd.DataFrame,
+    batch_size: int = RESULT_BATCH_SIZE
+) -> int:
+    """
+    Sprema detalje analize i mjesečne podatke u velikim serijama, bez upita po retku.
+    
+    Detalji se upisuju skupno, DetailID-ovi se dohvaćaju jednim upitom po ResultID-u,
+    a zatim se skupno upisuje po jedan mjesečni zapis (promet i količina) po artiklu i mjesecu.
+    
+    Args:
+        db: SQLAlchemy sesija
+        result_id: ID rezultata analize
+        table: Tablica rezultata iz abc_xyz.artifact.results_table
+        batch_size: Broj redaka po jednom INSERT-u
+        
+    Returns:
+        Ukupan broj upisanih redaka
+    """
+    details = pd.DataFrame({
+        'ResultID': result_id,
+        'ItemCode': table['Item'],
+        'ItemName': table['Name'],
+        'ABC_Class': table['ABC'],
+        'XYZ_Class': table['XYZ'],
+        'WarehouseZone': table['Warehouse zone'],
+        'TotalTurnover': table['Total Turnover'].astype(float),
+        'TotalQuantity': table['Total Qty'].astype(float),
+        'PercentageOfTurnover': table['Percentage'],
+        'CumulativePercentage': table['Cumulative %'],
+        'CoefficientVariation': table['Coefficient Variation'],
+        'AvgMonthlyQty': table.get('Avg Monthly Qty'),
+        'MinQtyMonthly': table.get('Min Qty Monthly'),
+        'MaxQtyMonthly': table.get('Max Qty Monthly'),
+        'Rank': table['Rank']
+    })
+    _insert_in_batches(db, AnalysisResultDetail, details, batch_size)
+    
+    # DetailID-ove dodjeljuje baza; šifra artikla je jedinstvena unutar rezultata
+    detail_ids = dict(
+        db.query(AnalysisResultDetail.ItemCode, AnalysisResultDetail.DetailID)
+        .filter(AnalysisResultDetail.ResultID == result_id)
+        .all()
+    )
+    
+    # Jedan zapis po artiklu i mjesecu s prometom i količinom
+    months = [col.split('_', 1)[1] for col in monthly_columns(table) if col.startswith('Turnover_')]
+    monthly = pd.DataFrame({
+        'DetailID': np.repeat(table['Item'].map(detail_ids).to_numpy(), len(months)),
+        'YearMonth': np.tile(np.array(months, dtype=object), len(table)),
+        'Turnover': table[[f'Turnover_{month}' for month in months]].to_numpy(dtype=float).ravel(),
+        'Quantity': table[[f'QTY_{month}' for month in months]].to_numpy(dtype=float).ravel()
+    })
+    
+    # Preskakanje mjeseci bez vrijednosti
+    monthly = monthly[monthly[['Turnover', 'Quantity']].notna().any(axis=1)]
+    monthly[['Turnover', 'Quantity']] = monthly[['Turnover', 'Quantity']].fillna(0)
+    _insert_in_batches(db, AnalysisResultMonthly, monthly, batch_size)
+    
+    return len(details) + len(monthly)
+
+def save_run_profile(db: Session, result_id: int, profiler: StageProfiler) -> None:
+    """
+    Sprema trajanje, procesorsko vrijeme i vršnu memoriju faza analize (tablica AnalysisRunProfiles).
+    """
+    db.bulk_insert_mappings(AnalysisRunProfile, [
+        {
+            'ResultID': result_id,
+            'StageOrder': order,
+            'Stage': record['stage'],
+            'WallSeconds': record['wall_seconds'],
+            'CpuSeconds': record['cpu_seconds'],
+            'PeakMemoryMB': record['peak_memory_mb']
+        }
+        for order, record in enumerate(profiler.as_records(), start=1)
+    ])
+
+def _frontend_data(analysis_result: AnalysisResult, df: pd.DataFrame, cached: bool = False) -> dict:
+    """
+    Slaže rezultat za frontend (distribucije, matrica, Pareto, top artikli i tablica)
+    iz mjesečne tablice analize; cached označava ponovno korišten raniji rezultat.
+    """
+    # Učitavanje dodatnih podataka za frontend
+    # Distribucije ABC i XYZ
+    abc_distribution = df.groupby('ABC').size().reset_index(name='count')
+    abc_distribution['percentage'] = abc_distribution['count'] / len(df) * 100
+    
+    xyz_distribution = df.groupby('XYZ').size().reset_index(name='count')
+    xyz_distribution['percentage'] = xyz_distribution['count'] / len(df) * 100
+    
+    # ABC-XYZ matrica
+    matrix_counts = df.groupby(['ABC', 'XYZ']).size().unstack(fill_value=0)
+    matrix_percentages = matrix_counts / len(df) * 100
+    
+    # Pareto podaci
+    df_sorted = df.sort_values('Total Turnover', ascending=False)
+    df_sorted['percentage'] = df_sorted['Total Turnover'] / df_sorted['Total Turnover'].sum() * 100
+    df_sorted['cumulative'] = df_sorted['percentage'].cumsum()
+    
+    # Top artikli
+    top_items = []
+    for _, row in df_sorted.head(10).iterrows():
+        item_data = {
+            'code': row['Item'],
+            'name': row['Name'],
+            'abc': row['ABC'],
+            'xyz': row['XYZ'],
+            'turnover': row['Total Turnover'],
+            'months': []
+        }
+        
+        # Dodavanje mjesečnih podataka
+        for col in df.columns:
+            if col.startswith('Turnover_'):
+                month_str = col.split('_', 1)[1]
+                if not pd.isna(row[col]):
+                    item_data['months'].append({
+                        'month': month_str,
+                        'value': float(row[col])
+                    })
+        
+        top_items.append(item_data)
+    
+    # Kreiranje rezultata za frontend
+    frontend_data = {
+        'result_id': analysis_result.ResultID,
+        'analysis_name': analysis_result.AnalysisName,
+        'config_id': analysis_result.ConfigID,
+        'analysis_date': analysis_result.AnalysisDate,
+        'start_date': analysis_result.StartDate.strftime("%Y-%m-%d"),
+        'end_date': analysis_result.EndDate.strftime("%Y-%m-%d"),
+        'distributions': {
+            'abc': abc_distribution.to_dict('records'),
+            'xyz': xyz_distribution.to_dict('records')
+        },
+        'matrix': {
+            'categories': [[row, col] for row in matrix_counts.index for col in matrix_counts.columns],
+            'counts': matrix_counts.values.tolist(),
+            'percentages': matrix_percentages.values.tolist()
+        },
+        'paretoData': {
+            'items': df_sorted['Item'].tolist(),
+            'values': df_sorted['Total Turnover'].tolist(),
+            'cumulative': df_sorted['cumulative'].tolist()
+        },
+        'topItems': top_items,
+        'tableData': df.to_dict('records'),
+        'cached': cached
+    }
+    
+    return frontend_data
+
+def _find_cached_result(db: Session, fingerprint: str) -> Optional[AnalysisResult]:
+    # Najnoviji spremljeni rezultat s istim sažetkom parametara i podataka
+    return (
+        db.query(AnalysisResult)
+        .filter(AnalysisResult.Fingerprint == fingerprint)
+        .order_by(AnalysisResult.ResultID.desc())
+        .first()
+    )
+
+def _save_analysis_result(
+    db: Session,
+    results: dict,
+    analysis_name: str,
+    start_date: datetime,
+    end_date: datetime,
+    created_by: str,
+    config: Optional[AnalysisConfiguration],
+    analysis_params: dict,
+    fingerprint: str,
+    profiler: StageProfiler
+):
+    """
+    Sprema rezultat analyze_aggregate kao AnalysisResult s detaljima, mjesečnim
+    podacima i (uz ANALYSIS_RESULTS_DIR) Parquet rezultatom, bez commita.
+    
+    Uz rezultat se spremaju i parametri s kojima je izračunat (analysis_param_columns).
+    
+    Returns:
+        Tuple (analysis_result, mjesečna tablica za _frontend_data)
+    """
+    # Stupčasti rezultat (jedan redak po artiklu) i mjesečna tablica
+    # u istom obliku kao list 'Monthly Breakdown' izvještaja
+    with profiler.stage('results_table'):
+        table = results_table(results)
+    df = table[['Item'] + results['final_columns']]
+    
+    # Kreiranje zapisa o analizi u bazi
+    abc_counts = table['ABC'].value_counts()
+    xyz_counts = table['XYZ'].value_counts()
+    analysis_result = AnalysisResult(
+        AnalysisName=analysis_name,
+        StartDate=start_date,
+        EndDate=end_date,
+        AnalysisDate=datetime.now(),
+        CreatedBy=created_by,
+        ConfigID=config.ConfigID if config is not None else 1,  # Bez konfiguracije koristimo zadanu
+        Fingerprint=fingerprint,
+        AnalysisParams=json.dumps(analysis_param_columns(analysis_params)),
+        TotalItems=len(table),
+        A_Items=int(abc_counts.get('A', 0)),
+        B_Items=int(abc_counts.get('B', 0)),
+        C_Items=int(abc_counts.get('C', 0)),
+        X_Items=int(xyz_counts.get('X', 0)),
+        Y_Items=int(xyz_counts.get('Y', 0)),
+        Z_Items=int(xyz_counts.get('Z', 0))
+    )
+    
+    db.add(analysis_result)
+    db.flush()  # Dobivanje ID-a analize
+    
+    # Spremanje stupčastog rezultata za kasnije čitanje bez ponovne analize
+    if settings.ANALYSIS_RESULTS_DIR:
+        with profiler.stage('parquet'):
+            write_results_artifact(results, settings.ANALYSIS_RESULTS_DIR, f"result_{analysis_result.ResultID}.parquet")
+    
+    # Spremanje detalja i mjesečnih podataka u serijama
+    with profiler.stage('save_details'):
+        save_result_details(db, analysis_result.ResultID, table)
+    
+    return analysis_result, df
+
 def run_abc_xyz_script(
     db: Session,
     analysis_name: str,
@@ -17,196 +403,289 @@ def run_abc_xyz_script(
     end_date: datetime,
     warehouse_zones: list = None,
     item_codes: list = None,
-    created_by: str = "system"
+    created_by: str = "system",
+    config: AnalysisConfiguration = None,
+    progress: Optional[Callable[[str], None]] = None,
+    force_refresh: bool = False
 ) -> dict:
     """
-    Pokreće ABC_XYZ.py skriptu s navedenim parametrima i sprema rezultate u bazu.
+    Izvodi ABC-XYZ analizu (istu logiku kao ABC_XYZ.py) u procesu servera i sprema rezultate u bazu.
+    
+    Ako već postoji rezultat s istim parametrima i istim vodenim žigom picking
+    podataka (analysis_fingerprint), vraća se taj rezultat bez ponovnog izračuna.
+    
+    Args:
+        db: SQLAlchemy sesija
+        analysis_name: Naziv analize
+        start_date: Početni datum
+        end_date: Završni datum
+        warehouse_zones: Lista zona skladišta za filtriranje
+        item_codes: Lista šifri artikala za filtriranje
+        created_by: Korisnik koji je pokrenuo analizu
+        config: Konfiguracija s pragovima i faktorima; bez nje se koriste zadane vrijednosti skripte
+        progress: Funkcija koja se poziva s nazivom faze ('loading', 'cached', 'analyzing', 'saving')
+        force_refresh: Analiza se izvodi i kad postoji isti prethodni rezultat
+        
+    Returns:
+        Rječnik s rezultatima za frontend
     """
-    # Kreiranje privremenog direktorija za rezultate
-    temp_dir = tempfile.mkdtemp()
+    progress = progress or (lambda stage: None)
     
-    # Priprema parametara za skriptu
-    script_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), "ABC_XYZ.py")
+    # Faze se mjere po dretvi jer se više analiza izvodi istodobno
+    profiler = StageProfiler(
+        enabled=settings.ANALYSIS_PROFILE,
+        memory=settings.ANALYSIS_PROFILE_MEMORY,
+        per_thread=True
+    )
     
-    # Formatiranje datuma za skriptu
+    # Formatiranje datuma za upit
     start_date_str = start_date.strftime("%Y-%m-%d")
     end_date_str = end_date.strftime("%Y-%m-%d")
     
-    # Priprema parametara za filtriranje
-    params = [
-        "python", 
-        script_path,
-        "--output-dir", temp_dir,
-        "--start-date", start_date_str,
-        "--end-date", end_date_str
-    ]
-    
-    # Dodavanje opcionalnih parametara
-    if warehouse_zones:
-        params.extend(["--warehouse-zones", ",".join(warehouse_zones)])
+    # Pragovi i parametri zaliha iz konfiguracije
+    analysis_params = analysis_params_from_config(config) if config is not None else {}
     
-    if item_codes:
-        params.extend(["--item-codes", ",".join(item_codes)])
-    
-    # Pokretanje skripte
+    # Pokretanje analize
     try:
-        result = subprocess.run(
-            params,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Provjera je li skripta uspješno izvršena
-        if result.returncode != 0:
-            raise Exception(f"Script execution failed: {result.stderr}")
+        progress('loading')
+        with pooled_connection() as conn:
+            # Prethodni rezultat za iste parametre nad nepromijenjenim podacima
+            watermark = read_data_watermark(
+                conn, start_date_str, end_date_str,
+                warehouse_zones=warehouse_zones,
+                item_codes=item_codes,
+                daily_aggregate=settings.ANALYSIS_DAILY_AGGREGATE
+            )
+            fingerprint = analysis_fingerprint(
+                start_date_str, end_date_str, warehouse_zones, item_codes,
+                config.ConfigID if config is not None else None, analysis_params, watermark
+            )
+            if force_refresh:
+                _count_result_cache('forced_refreshes')
+            else:
+                cached_result = _find_cached_result(db, fingerprint)
+                if cached_result is not None:
+                    _count_result_cache('hits')
+                    progress('cached')
+                    return _frontend_data(cached_result, load_result_table(db, cached_result), cached=True)
+                _count_result_cache('misses')
+            
+            agg = load_picking_aggregate(
+                conn,
+                start_date_str,
+                end_date_str,
+                warehouse_zones=warehouse_zones,
+                item_codes=item_codes,
+                pushdown=settings.ANALYSIS_PUSHDOWN,
+                cache_dir=settings.PICKING_CACHE_DIR or None,
+                daily_aggregate=settings.ANALYSIS_DAILY_AGGREGATE,
+                location_zones=location_zones if settings.ANALYSIS_LOCATION_LOOKUP else None,
+                aggregate_cache_dir=settings.AGGREGATE_CACHE_DIR or None,
+                profiler=profiler
+            )
         
-        # Učitavanje rezultata iz Excel datoteke
-        excel_path = os.path.join(temp_dir, "abc_xyz_monthly_breakdown.xlsx")
-        df = pd.read_excel(excel_path, sheet_name="Monthly Breakdown")
+        progress('analyzing')
+        results = analyze_aggregate(agg, profiler=profiler, **analysis_params)
         
-        # Kreiranje zapisa o analizi u bazi
-        analysis_result = AnalysisResult(
-            AnalysisName=analysis_name,
-            StartDate=start_date,
-            EndDate=end_date,
-            AnalysisDate=datetime.now(),
-            CreatedBy=created_by,
-            ConfigID=1  # Pretpostavljamo da koristimo zadanu konfiguraciju
+        progress('saving')
+        analysis_result, df = _save_analysis_result(
+            db, results, analysis_name, start_date, end_date, created_by, config, analysis_params, fingerprint,
+            profiler
         )
         
-        db.add(analysis_result)
-        db.flush()  # Dobivanje ID-a analize
-        
-        # Spremanje detalja analize u bazu
-        for index, row in df.iterrows():
-            item_code = row['Item']
-            
-            # Kreiranje zapisa o detaljima analize
-            detail = AnalysisResultDetail(
-                ResultID=analysis_result.ResultID,
-                ItemCode=item_code,
-                ItemName=row['Name'],
-                ABC_Class=row['ABC'],
-                XYZ_Class=row['XYZ'],
-                WarehouseZone=row['Warehouse zone'],
-                TotalTurnover=row['Total Turnover'],
-                TotalQuantity=row['Total Qty'],
-                CoefficientVariation=row.get('Coefficient Variation', 0),
-                Rank=index + 1
-            )
-            
-            db.add(detail)
-            db.flush()  # Dobivanje ID-a detalja
-            
-            # Spremanje mjesečnih podataka
-            for col in df.columns:
-                if col.startswith('Turnover_') or col.startswith('QTY_'):
-                    month_str = col.split('_', 1)[1]
-                    is_turnover = col.startswith('Turnover_')
-                    
-                    # Preskakanje ako je vrijednost NaN
-                    if pd.isna(row[col]):
-                        continue
-                    
-                    # Ako već postoji zapis za ovaj mjesec, ažuriraj ga
-                    existing = db.query(AnalysisResultMonthly).filter(
-                        AnalysisResultMonthly.DetailID == detail.DetailID,
-                        AnalysisResultMonthly.YearMonth == month_str
-                    ).first()
-                    
-                    if existing:
-                        if is_turnover:
-                            existing.Turnover = row[col]
-                        else:
-                            existing.Quantity = row[col]
-                    else:
-                        # Kreiranje novog zapisa
-                        monthly = AnalysisResultMonthly(
-                            DetailID=detail.DetailID,
-                            YearMonth=month_str,
-                            Turnover=row[col] if is_turnover else 0,
-                            Quantity=0 if is_turnover else row[col]
-                        )
-                        db.add(monthly)
+        # Profil faza uz rezultat, za praćenje trajanja analiza kroz vrijeme
+        if profiler.enabled:
+            profiler.stop()
+            save_run_profile(db, analysis_result.ResultID, profiler)
         
         # Commit promjena u bazi
         db.commit()
+        dashboard_cache.invalidate()
         
-        # Učitavanje dodatnih podataka za frontend
-        # Distribucije ABC i XYZ
-        abc_distribution = df.groupby('ABC').size().reset_index(name='count')
-        abc_distribution['percentage'] = abc_distribution['count'] / len(df) * 100
+        return _frontend_data(analysis_result, df)
         
-        xyz_distribution = df.groupby('XYZ').size().reset_index(name='count')
-        xyz_distribution['percentage'] = xyz_distribution['count'] / len(df) * 100
+    except Exception as e:
+        db.rollback()
+        profiler.stop()
+        raise Exception(f"Error running ABC_XYZ analysis: {str(e)}")
+
+def run_abc_xyz_analysis(
+    db: Session,
+    config_id: int,
+    analysis_name: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    warehouse_zones: Optional[List[str]] = None,
+    item_codes: Optional[List[str]] = None,
+    created_by: str = "system",
+    force_refresh: bool = False,
+    progress: Optional[Callable[[str], None]] = None
+) -> dict:
+    """
+    Izvodi ABC-XYZ analizu s pragovima i faktorima zaliha iz odabrane konfiguracije.
+    
+    Args:
+        db: SQLAlchemy sesija
+        config_id: ID konfiguracije analize
+        analysis_name: Naziv analize
+        start_date: Početni datum (zadano: godinu dana prije završnog datuma)
+        end_date: Završni datum (zadano: danas)
+        warehouse_zones: Lista zona skladišta za filtriranje
+        item_codes: Lista šifri artikala za filtriranje
+        created_by: Korisnik koji je pokrenuo analizu
+        force_refresh: Analiza se izvodi i kad postoji isti prethodni rezultat
+        progress: Funkcija koja se poziva s nazivom faze (vidi run_abc_xyz_script)
         
-        # ABC-XYZ matrica
-        matrix_counts = df.groupby(['ABC', 'XYZ']).size().unstack(fill_value=0)
-        matrix_percentages = matrix_counts / len(df) * 100
+    Returns:
+        Rječnik s rezultatima za frontend (vidi run_abc_xyz_script)
+    """
+    config = db.query(AnalysisConfiguration).filter(AnalysisConfiguration.ConfigID == config_id).first()
+    if not config:
+        raise ValueError(f"Configuration with ID {config_id} not found")
+    
+    # Zadano razdoblje: zadnjih godinu dana
+    end_date = end_date or datetime.now()
+    start_date = start_date or end_date - timedelta(days=365)
+    
+    return run_abc_xyz_script(
+        db=db,
+        analysis_name=analysis_name,
+        start_date=start_date,
+        end_date=end_date,
+        warehouse_zones=warehouse_zones,
+        item_codes=item_codes,
+        created_by=created_by,
+        config=config,
+        progress=progress,
+        force_refresh=force_refresh
+    )
+
+def run_abc_xyz_batch(
+    db: Session,
+    config_ids: List[int],
+    analysis_name: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    warehouse_zones: Optional[List[str]] = None,
+    item_codes: Optional[List[str]] = None,
+    created_by: str = "system",
+    force_refresh: bool = False,
+    progress: Optional[Callable[[str], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Izvodi ABC-XYZ analizu za više konfiguracija nad jednim učitavanjem podataka.
+    
+    Podaci se učitaju i sažmu jednom, pivot tablice, rang i koeficijenti
+    varijacije računaju se jednom, a za svaku konfiguraciju samo klase i
+    min/max količine (analyze_aggregate_configs). Svaka konfiguracija sprema
+    se kao zaseban AnalysisResult s nazivom "<naziv> (<naziv konfiguracije>)"
+    i vlastitim sažetkom, pa je kasnije jednaka pojedinačnoj analizi. Za
+    konfiguracije s istim ranijim rezultatom nad istim podacima vraća se taj
+    rezultat. Profil faza cijele serije sprema se uz svaki novi rezultat.
+    
+    Args:
+        db: SQLAlchemy sesija
+        config_ids: ID-ovi konfiguracija redom za usporedbu
+        analysis_name: Osnovni naziv analiza
+        start_date, end_date, warehouse_zones, item_codes, created_by, force_refresh: Vidi run_abc_xyz_analysis
+        progress: Funkcija koja se poziva s nazivom faze (vidi run_abc_xyz_script)
         
-        # Pareto podaci
-        df_sorted = df.sort_values('Total Turnover', ascending=False)
-        df_sorted['percentage'] = df_sorted['Total Turnover'] / df_sorted['Total Turnover'].sum() * 100
-        df_sorted['cumulative'] = df_sorted['percentage'].cumsum()
+    Returns:
+        Sažeci analiza (get_analysis_summary) redom kao config_ids
         
-        # Top artikli
-        top_items = []
-        for _, row in df_sorted.head(10).iterrows():
-            item_data = {
-                'code': row['Item'],
-                'name': row['Name'],
-                'abc': row['ABC'],
-                'xyz': row['XYZ'],
-                'turnover': row['Total Turnover'],
-                'months': []
-            }
-            
-            # Dodavanje mjesečnih podataka
-            for col in df.columns:
-                if col.startswith('Turnover_'):
-                    month_str = col.split('_', 1)[1]
-                    if not pd.isna(row[col]):
-                        item_data['months'].append({
-                            'month': month_str,
-                            'value': float(row[col])
-                        })
+    Raises:
+        ValueError: Ako neka konfiguracija ne postoji
+    """
+    configs = []
+    for config_id in config_ids:
+        config = db.query(AnalysisConfiguration).filter(AnalysisConfiguration.ConfigID == config_id).first()
+        if not config:
+            raise ValueError(f"Configuration with ID {config_id} not found")
+        configs.append(config)
+    
+    # Zadano razdoblje: zadnjih godinu dana
+    end_date = end_date or datetime.now()
+    start_date = start_date or end_date - timedelta(days=365)
+    start_date_str = start_date.strftime("%Y-%m-%d")
+    end_date_str = end_date.strftime("%Y-%m-%d")
+    
+    profiler = StageProfiler(
+        enabled=settings.ANALYSIS_PROFILE,
+        memory=settings.ANALYSIS_PROFILE_MEMORY,
+        per_thread=True
+    )
+    analysis_params = [analysis_params_from_config(config) for config in configs]
+    progress = progress or (lambda stage: None)
+    
+    try:
+        progress('loading')
+        result_ids = [None] * len(configs)
+        fingerprints = []
+        with pooled_connection() as conn:
+            # Jedan vodeni žig podataka za sve konfiguracije
+            watermark = read_data_watermark(
+                conn, start_date_str, end_date_str,
+                warehouse_zones=warehouse_zones,
+                item_codes=item_codes,
+                daily_aggregate=settings.ANALYSIS_DAILY_AGGREGATE
+            )
+            for position, (config, params) in enumerate(zip(configs, analysis_params)):
+                fingerprint = analysis_fingerprint(
+                    start_date_str, end_date_str, warehouse_zones, item_codes, config.ConfigID, params, watermark
+                )
+                fingerprints.append(fingerprint)
+                if force_refresh:
+                    _count_result_cache('forced_refreshes')
+                    continue
+                cached_result = _find_cached_result(db, fingerprint)
+                if cached_result is not None:
+                    _count_result_cache('hits')
+                    result_ids[position] = cached_result.ResultID
+                else:
+                    _count_result_cache('misses')
             
-            top_items.append(item_data)
+            pending = [position for position, result_id in enumerate(result_ids) if result_id is None]
+            if pending:
+                agg = load_picking_aggregate(
+                    conn,
+                    start_date_str,
+                    end_date_str,
+                    warehouse_zones=warehouse_zones,
+                    item_codes=item_codes,
+                    pushdown=settings.ANALYSIS_PUSHDOWN,
+                    cache_dir=settings.PICKING_CACHE_DIR or None,
+                    daily_aggregate=settings.ANALYSIS_DAILY_AGGREGATE,
+                    location_zones=location_zones if settings.ANALYSIS_LOCATION_LOOKUP else None,
+                    aggregate_cache_dir=settings.AGGREGATE_CACHE_DIR or None,
+                    profiler=profiler
+                )
         
-        # Kreiranje rezultata za frontend
-        frontend_data = {
-            'result_id': analysis_result.ResultID,
-            'analysis_name': analysis_name,
-            'start_date': start_date_str,
-            'end_date': end_date_str,
-            'distributions': {
-                'abc': abc_distribution.to_dict('records'),
-                'xyz': xyz_distribution.to_dict('records')
-            },
-            'matrix': {
-                'categories': [[row, col] for row in matrix_counts.index for col in matrix_counts.columns],
-                'counts': matrix_counts.values.tolist(),
-                'percentages': matrix_percentages.values.tolist()
-            },
-            'paretoData': {
-                'items': df_sorted['Item'].tolist(),
-                'values': df_sorted['Total Turnover'].tolist(),
-                'cumulative': df_sorted['cumulative'].tolist()
-            },
-            'topItems': top_items,
-            'tableData': df.to_dict('records')
-        }
+        if pending:
+            progress('analyzing')
+            batch = analyze_aggregate_configs(agg, [analysis_params[position] for position in pending], profiler=profiler)
+            progress('saving')
+            for position, results in zip(pending, batch):
+                config = configs[position]
+                analysis_result, _ = _save_analysis_result(
+                    db, results, f"{analysis_name} ({config.ConfigName})", start_date, end_date,
+                    created_by, config, analysis_params[position], fingerprints[position], profiler
+                )
+                result_ids[position] = analysis_result.ResultID
+            
+            if profiler.enabled:
+                profiler.stop()
+                for position in pending:
+                    save_run_profile(db, result_ids[position], profiler)
+            
+            db.commit()
+            dashboard_cache.invalidate()
         
-        return frontend_data
+        return [get_analysis_summary(db, result_id) for result_id in result_ids]
         
     except Exception as e:
         db.rollback()
-        raise Exception(f"Error running ABC_XYZ analysis: {str(e)}")
-    finally:
-        # Čišćenje privremenih datoteka
-        import shutil
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        profiler.stop()
+        raise Exception(f"Error running ABC_XYZ batch analysis: {str(e)}")
 
 def get_safety_stock_factor(xyz_class: str, config: AnalysisConfiguration) -> float:
     """
@@ -271,3 +750,99 @@ def get_analysis_summary(db: Session, result_id: int) -> Dict[str, Any]:
     
     return summary
 
+def whatif_baseline(db: Session, analysis_result: AnalysisResult) -> Dict[str, Any]:
+    """
+    Vraća Reclassifier spremljenog rezultata i parametre s kojima je rezultat izračunat;
+    priprema se jednom i čuva u whatif_cache.
+    
+    Parametri se čitaju iz AnalysisParams; za rezultate spremljene prije te kolone
+    uzimaju se iz konfiguracije analize. U oba slučaja provjerava se daju li
+    spremljene metrike s tim parametrima spremljene klase i min/max količine.
+    
+    Raises:
+        ValueError: Ako rezultat nema potrebne metrike ili ih parametri ne reproduciraju
+    """
+    def prepare():
+        table = load_result_table(db, analysis_result, WHATIF_COLUMNS + ['Min Qty Monthly', 'Max Qty Monthly'])
+        
+        # Rezultati spremljeni prije spremanja metrika nemaju kumulativni postotak
+        # (NULL), a koeficijent varijacije im je 0 za sve artikle
+        if table['Cumulative %'].isna().any() or table['Coefficient Variation'].isna().any():
+            raise ValueError(
+                f"Analysis {analysis_result.ResultID} has no stored cumulative percentages or "
+                "coefficients of variation; run the analysis again to use what-if"
+            )
+        
+        if analysis_result.AnalysisParams:
+            parameters = json.loads(analysis_result.AnalysisParams)
+        else:
+            parameters = analysis_param_columns(analysis_params_from_config(analysis_result.configuration))
+        
+        reclassifier = Reclassifier(table)
+        baseline = reclassifier.reclassify(**_reclassify_args(parameters))
+        if not reclassifier.reproduces(baseline):
+            raise ValueError(
+                f"Stored metrics of analysis {analysis_result.ResultID} do not reproduce its classes with the "
+                "analysis parameters (legacy result or edited configuration); run the analysis again to use what-if"
+            )
+        return {'reclassifier': reclassifier, 'parameters': parameters}
+    
+    return whatif_cache.get_or_set(analysis_result.ResultID, prepare)
+
+def _reclassify_args(parameters: Dict[str, float]) -> Dict[str, Any]:
+    # Parametri pod nazivima kolona konfiguracije kao argumenti Reclassifier.reclassify
+    return {
+        'a_threshold': parameters['ABC_A_Threshold'],
+        'b_threshold': parameters['ABC_B_Threshold'],
+        'x_threshold': parameters['XYZ_X_Threshold'],
+        'y_threshold': parameters['XYZ_Y_Threshold'],
+        'inventory_params': inventory_params_from_config(SimpleNamespace(**parameters))
+    }
+
+def run_whatif(
+    db: Session,
+    analysis_result: AnalysisResult,
+    overrides: Dict[str, Optional[float]],
+    changed_items_limit: int = 100
+) -> Dict[str, Any]:
+    """
+    Reklasificira spremljeni rezultat analize s izmijenjenim granicama i faktorima,
+    bez ponovnog čitanja pikova.
+    
+    Nezadane vrijednosti preuzimaju se iz parametara s kojima je analiza izvedena
+    (whatif_baseline), a ne iz trenutne konfiguracije.
+    
+    Args:
+        db: SQLAlchemy sesija
+        analysis_result: Spremljeni rezultat analize
+        overrides: Izmijenjene vrijednosti po ključevima WHATIF_OVERRIDES (None znači bez izmjene)
+        changed_items_limit: Najveći broj izmijenjenih artikala u odgovoru
+        
+    Returns:
+        Rječnik s korištenim parametrima, brojem artikala po klasi, prelascima
+        između klasa, promjenama min/max količina i trajanjem u milisekundama
+        
+    Raises:
+        ValueError: Ako su granice klasa nedosljedne ili rezultat nema potrebne metrike
+    """
+    start = time.perf_counter()
+    baseline = whatif_baseline(db, analysis_result)
+    reclassifier = baseline['reclassifier']
+    
+    # Parametri analize s izmijenjenim vrijednostima
+    values = dict(baseline['parameters'])
+    values.update({
+        WHATIF_OVERRIDES[name]: float(value) for name, value in overrides.items()
+        if name in WHATIF_OVERRIDES and value is not None
+    })
+    
+    reclassified = reclassifier.reclassify(**_reclassify_args(values))
+    comparison = reclassifier.compare(reclassified, changed_items_limit)
+    
+    return {
+        'result_id': analysis_result.ResultID,
+        'total_items': len(reclassifier),
+        'parameters': {name: values[column] for name, column in WHATIF_OVERRIDES.items()},
+        **comparison,
+        'elapsed_ms': (time.perf_counter() - start) * 1000
+    }
@@ -1,6 +1,8 @@
 import pandas as pd
 from sqlalchemy.orm import Session
-from app.database import execute_query
+from app.core.config import settings
+from app.database import execute_query, pooled_connection
+from abc_xyz.cache import PickingCache
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -22,6 +24,10 @@ def get_picking_data(
     Returns:
         DataFrame s podacima o picking operacijama
     """
+    # Ako je uključena lokalna predmemorija, zatvoreni mjeseci se čitaju iz Parquet datoteka
+    if settings.PICKING_CACHE_DIR and start_date and end_date:
+        return get_cached_picking_data(start_date, end_date, warehouse_zones, item_codes)
+    
     # Osnovni upit
     query = """
     SELECT 
@@ -44,9 +50,10 @@ def get_picking_data(
         query += " AND p.PickDateTime >= ?"
         params[len(params)] = start_date
     
+    # Završni dan ulazi cijeli, kao u abc_xyz.data.date_range_params
     if end_date:
-        query += " AND p.PickDateTime <= ?"
-        params[len(params)] = end_date
+        query += " AND p.PickDateTime < ?"
+        params[len(params)] = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
     
     # Dodavanje filtera za zone skladišta
     if warehouse_zones and len(warehouse_zones) > 0:
@@ -71,6 +78,35 @@ def get_picking_data(
     
     return df
 
+def get_cached_picking_data(
+    start_date: datetime,
+    end_date: datetime,
+    warehouse_zones: Optional[List[str]] = None,
+    item_codes: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Dohvaća picking podatke iz lokalne mjesečne predmemorije.
+    
+    Iz baze se dohvaćaju samo mjeseci kojih nema u predmemoriji i novi redovi
+    otvorenih mjeseci (LogID veći od zadnjeg učitanog).
+    
+    Returns:
+        DataFrame s istim kolonama kao get_picking_data
+    """
+    cache = PickingCache(settings.PICKING_CACHE_DIR)
+    with pooled_connection() as conn:
+        df = cache.load_picking(conn, start_date, end_date, warehouse_zones, item_codes)
+    print(cache.summary())
+    
+    df = df.rename(columns={
+        'Artikl': 'ItemCode',
+        'Naziv artikla': 'ItemName',
+        'Datum pikiranja': 'Date',
+        'Količina pikiranja': 'PickQty',
+        'Zona': 'WarehouseZone'
+    })
+    return df[['ItemCode', 'ItemName', 'Date', 'PickQty', 'WarehouseZone']]
+
 def get_stock_data(
     warehouse_zones: Optional[List[str]] = None,
     item_codes: Optional[List[str]] = None
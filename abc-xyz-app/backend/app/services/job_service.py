@@ -0,0 +1,179 @@
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from app.core.config import settings
+from app.services.analysis_service import run_abc_xyz_analysis, run_abc_xyz_batch, run_abc_xyz_script
+
+# Stanja posla
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """
+    Red poslova je pun; novi posao nije prihvaćen.
+    """
+
+
+class JobQueue:
+    """
+    Red poslova analize s ograničenim brojem radnih dretvi u procesu servera.
+
+    Posao je funkcija koja prima funkciju za javljanje faze (progress) i vraća
+    ResultID spremljene analize (ili listu ResultID-ova za seriju analiza). Stanje poslova drži se u memoriji, pa red ne
+    treba vanjski broker, a u testovima se može koristiti zasebna instanca.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 20, max_finished: int = 200):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _prune_finished(self) -> None:
+        # Čuvaju se samo najnoviji završeni poslovi (poziva se unutar lock-a)
+        finished = [job for job in self._jobs.values() if job['state'] in (JOB_COMPLETED, JOB_FAILED)]
+        for job in sorted(finished, key=lambda job: job['finished_at'])[:max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job['job_id']]
+            self._futures.pop(job['job_id'], None)
+
+    def _run(self, job_id: str, func: Callable[[Callable[[str], None]], Union[int, List[int], None]]) -> None:
+        self._update(job_id, state=JOB_RUNNING, started_at=datetime.now())
+        try:
+            result = func(lambda stage: self._update(job_id, stage=stage))
+            # Serija analiza vraća listu; result_id je tada prvi rezultat
+            result_ids = result if isinstance(result, list) else None
+            result_id = (result_ids[0] if result_ids else None) if result_ids is not None else result
+            self._update(
+                job_id, state=JOB_COMPLETED, stage="done", result_id=result_id, result_ids=result_ids,
+                finished_at=datetime.now()
+            )
+        except Exception as e:
+            traceback.print_exc()
+            self._update(job_id, state=JOB_FAILED, error=str(e), finished_at=datetime.now())
+
+    def submit(self, func: Callable[[Callable[[str], None]], Union[int, List[int], None]], name: str = "") -> str:
+        """
+        Dodaje posao u red i vraća njegov ID.
+
+        Raises:
+            JobQueueFull: Ako u redu već čeka max_pending poslova
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job['state'] == JOB_QUEUED)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"Too many queued analysis jobs ({pending})")
+
+            self._prune_finished()
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'name': name,
+                'state': JOB_QUEUED,
+                'stage': None,
+                'result_id': None,
+                'result_ids': None,
+                'error': None,
+                'created_at': datetime.now(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self._futures[job_id] = self._executor.submit(self._run, job_id, func)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Vraća kopiju stanja posla ili None ako posao ne postoji.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Čeka završetak posla (za testove i skripte) i vraća njegovo stanje.
+        """
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+# Zajednički red poslova servera
+job_queue = JobQueue(
+    max_workers=settings.ANALYSIS_WORKERS,
+    max_pending=settings.ANALYSIS_MAX_PENDING_JOBS
+)
+
+
+def enqueue_analysis(
+    session_factory: Callable, queue: JobQueue = None, config_id: Optional[int] = None, **analysis_kwargs
+) -> str:
+    """
+    Dodaje ABC-XYZ analizu (run_abc_xyz_script, odnosno run_abc_xyz_analysis
+    uz config_id) u red poslova.
+
+    Posao otvara vlastitu DB sesiju jer se izvodi u drugoj dretvi; zato se
+    konfiguracija zadaje ID-om i učitava u sesiji posla.
+
+    Args:
+        session_factory: Funkcija koja vraća novu SQLAlchemy sesiju (npr. SessionLocal)
+        queue: Red poslova (zadano: zajednički job_queue)
+        config_id: ID konfiguracije s pragovima i faktorima (zadano: vrijednosti skripte)
+        **analysis_kwargs: Ostali argumenti za run_abc_xyz_script (bez db i progress)
+
+    Returns:
+        ID posla
+    """
+    def job(progress):
+        db = session_factory()
+        try:
+            if config_id is not None:
+                result = run_abc_xyz_analysis(db=db, config_id=config_id, progress=progress, **analysis_kwargs)
+            else:
+                result = run_abc_xyz_script(db=db, progress=progress, **analysis_kwargs)
+            return result['result_id']
+        finally:
+            db.close()
+
+    return (queue or job_queue).submit(job, name=analysis_kwargs.get('analysis_name', ''))
+
+
+def enqueue_batch_analysis(session_factory: Callable, queue: JobQueue = None, **batch_kwargs) -> str:
+    """
+    Dodaje ABC-XYZ analizu više konfiguracija (run_abc_xyz_batch) u red poslova.
+
+    Po završetku posla result_ids sadrži ResultID-ove redom kao config_ids.
+
+    Args:
+        session_factory: Funkcija koja vraća novu SQLAlchemy sesiju (npr. SessionLocal)
+        queue: Red poslova (zadano: zajednički job_queue)
+        **batch_kwargs: Argumenti za run_abc_xyz_batch (bez db i progress)
+
+    Returns:
+        ID posla
+    """
+    def job(progress):
+        db = session_factory()
+        try:
+            summaries = run_abc_xyz_batch(db=db, progress=progress, **batch_kwargs)
+            return [summary['result_id'] for summary in summaries]
+        finally:
+            db.close()
+
+    return (queue or job_queue).submit(job, name=batch_kwargs.get('analysis_name', ''))
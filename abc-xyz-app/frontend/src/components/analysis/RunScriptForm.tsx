@@ -20,7 +20,7 @@ import {
 import { DatePicker } from '@mui/x-date-pickers/DatePicker';
 import { LocalizationProvider } from '@mui/x-date-pickers/LocalizationProvider';
 import { AdapterDateFns } from '@mui/x-date-pickers/AdapterDateFns';
-import { runABCXYZScript } from '../../services/analysisService';
+import { runABCXYZScript, waitForAnalysisJob } from '../../services/analysisService';
 import { useNavigate } from 'react-router-dom';
 
 // Tipovi za props
@@ -33,6 +33,7 @@ const RunScriptForm: React.FC<RunScriptFormProps> = ({ onSuccess }) => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState<string | null>(null);
+  const [jobStatus, setJobStatus] = useState<string | null>(null);
   
   // Form state
   const [analysisName, setAnalysisName] = useState('');
@@ -86,7 +87,7 @@ const RunScriptForm: React.FC<RunScriptFormProps> = ({ onSuccess }) => {
     setSuccess(null);
     
     try {
-      const result = await runABCXYZScript({
+      const job = await runABCXYZScript({
         analysis_name: analysisName,
         start_date: startDate?.toISOString().split('T')[0],
         end_date: endDate?.toISOString().split('T')[0],
@@ -94,15 +95,26 @@ const RunScriptForm: React.FC<RunScriptFormProps> = ({ onSuccess }) => {
         item_codes: itemCodes.length > 0 ? itemCodes : undefined
       });
       
-      setSuccess('Analiza uspješno pokrenuta!');
+      // Analiza se izvodi u redu poslova; čeka se njezin završetak
+      const finished = await waitForAnalysisJob(job.job_id, (update) => {
+        setJobStatus(update.state === 'queued' ? 'Analiza čeka u redu...' : `Analiza u tijeku${update.stage ? ` (${update.stage})` : ''}...`);
+      });
+      
+      if (finished.state === 'failed' || !finished.result_id) {
+        setError(`Analiza nije uspjela: ${finished.error || 'nepoznata greška'}`);
+        return;
+      }
+      
+      const resultId = finished.result_id;
+      setSuccess('Analiza uspješno završena!');
       
       // Call onSuccess callback if provided
-      if (onSuccess && result.result_id) {
-        onSuccess(result.result_id);
+      if (onSuccess) {
+        onSuccess(resultId);
       } else {
         // Navigate to results page after 2 seconds
         setTimeout(() => {
-          navigate(`/results/${result.result_id}`);
+          navigate(`/results/${resultId}`);
         }, 2000);
       }
     } catch (err) {
@@ -110,6 +122,7 @@ const RunScriptForm: React.FC<RunScriptFormProps> = ({ onSuccess }) => {
       setError('Došlo je do greške prilikom pokretanja analize. Molimo pokušajte ponovno.');
     } finally {
       setLoading(false);
+      setJobStatus(null);
     }
   };
   
@@ -245,7 +258,7 @@ const RunScriptForm: React.FC<RunScriptFormProps> = ({ onSuccess }) => {
                 startIcon={loading ? <CircularProgress size={20} /> : null}
                 fullWidth
               >
-                {loading ? 'Pokretanje analize...' : 'Pokreni analizu'}
+                {loading ? (jobStatus || 'Pokretanje analize...') : 'Pokreni analizu'}
               </Button>
             </Grid>
           </Grid>
@@ -29,6 +29,7 @@ import {
 } from '../services/configurationService';
 import { 
   runAnalysis, 
+  waitForAnalysisJob,
   AnalysisRequest 
 } from '../services/analysisService';
 import { 
@@ -128,14 +129,24 @@ const NewAnalysis: React.FC = () => {
         item_codes: selectedItems.length > 0 ? selectedItems : undefined
       };
       
-      const result = await runAnalysis(request);
-      
+      const job = await runAnalysis(request);
       setSuccess('Analiza uspješno pokrenuta');
+      
+      // Analiza se izvodi u redu poslova; čeka se njezin završetak
+      const finished = await waitForAnalysisJob(job.job_id);
       setLoading(false);
       
+      if (finished.state === 'failed' || !finished.result_id) {
+        setSuccess(null);
+        setError(`Analiza nije uspjela: ${finished.error || 'nepoznata greška'}`);
+        return;
+      }
+      
+      setSuccess('Analiza uspješno završena');
+      
       // Preusmjeravanje na stranicu s rezultatima
       setTimeout(() => {
-        navigate(`/analysis/${result.result_id}`);
+        navigate(`/analysis/${finished.result_id}`);
       }, 1500);
     } catch (err) {
       console.error('Error running analysis:', err);
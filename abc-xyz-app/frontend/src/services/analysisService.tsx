@@ -59,7 +59,22 @@ export interface ResultDetail {
   rank: number;
 }
 
-export const runAnalysis = async (request: AnalysisRequest) => {
+// Stanje posla analize iz GET /analysis/jobs/{job_id}
+export interface AnalysisJob {
+  job_id: string;
+  name?: string;
+  state: 'queued' | 'running' | 'completed' | 'failed';
+  stage?: string;
+  result_id?: number;
+  result_ids?: number[];
+  error?: string;
+  created_at: string;
+  started_at?: string;
+  finished_at?: string;
+}
+
+// Analiza se dodaje u red poslova; vraća posao (vidi waitForAnalysisJob)
+export const runAnalysis = async (request: AnalysisRequest): Promise<AnalysisJob> => {
   const response = await api.post('/analysis/run', request);
   return response.data;
 };
@@ -105,6 +120,31 @@ export const runABCXYZScript = async (params: any) => {
   const response = await api.post('/analysis/run-script', params);
   return response.data;
 };
+
+// Stanje posla analize (queued, running, completed, failed) i ResultID po završetku
+export const getAnalysisJob = async (jobId: string): Promise<AnalysisJob> => {
+  const response = await api.get(`/analysis/jobs/${jobId}`);
+  return response.data;
+};
+
+// Provjerava stanje posla svakih intervalMs dok ne završi (completed ili failed)
+export const waitForAnalysisJob = async (
+  jobId: string,
+  onUpdate?: (job: AnalysisJob) => void,
+  intervalMs: number = 2000
+): Promise<AnalysisJob> => {
+  for (;;) {
+    const job = await getAnalysisJob(jobId);
+    if (onUpdate) {
+      onUpdate(job);
+    }
+    if (job.state === 'completed' || job.state === 'failed') {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
+
 // Dodaj ovu funkciju u analysisService.tsx
 export const getAnalysesByDateRange = async (startDate: string, endDate: string) => {
   const response = await api.get(`/analysis?start_date=${startDate}&end_date=${endDate}`);
@@ -0,0 +1,228 @@
+import math
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from abc_xyz.aggregation import AGGREGATE_COLUMNS, DESC_COL, GROUP_COL, ITEM_COL, MONTH_COL
+from abc_xyz.cache import atomic_write, directory_lock, read_manifest, write_manifest
+from abc_xyz.data import (
+    build_aggregate_range_query, build_daily_aggregate_query, build_picking_aggregate_query, combine_month_watermarks,
+    date_range_params, read_data_watermark, read_month_watermarks, read_picking_aggregate
+)
+
+MANIFEST_FILE = "manifest.json"
+
+
+class AggregateCache:
+    """
+    Lokalna predmemorija mjesečnih agregata po artiklu, nazivu i zoni za zatvorene mjesece.
+
+    Zatvoreni mjesec (osvježen barem closed_after_days dana nakon svog kraja)
+    jednom se sažme u bazi i spremi kao Parquet datoteka s istim recima koje
+    vraća agregatni upit. Kod ponovljene analize iz baze se traže samo otvoreni
+    mjesec i dijelovi mjeseci na rubovima razdoblja, a ostatak matrice artikl ×
+    mjesec slaže se iz predmemorije.
+
+    Uz svaki mjesec sprema se njegov vodeni žig iz tablice Picking (broj
+    redaka i najveći LogID, read_month_watermarks); ako naknadni import doda
+    ili obriše pikove zatvorenog mjeseca, mjesec se ponovno sažme. Promjena
+    zone lokacije u Locations ne mijenja vodeni žig; nakon nje predmemoriju
+    treba obrisati.
+
+    Datoteke sadrže sve zone i artikle; filteri se primjenjuju lokalno. Agregati
+    iz pikova i iz dnevnog agregata spremaju se odvojeno.
+    """
+
+    def __init__(self, cache_dir: str, daily_aggregate: bool = False, closed_after_days: int = 2):
+        self.cache_dir = cache_dir
+        self.daily_aggregate = daily_aggregate
+        self.closed_after_days = closed_after_days
+        self.source = 'daily' if daily_aggregate else 'picking'
+        self.stats = {'hits': 0, 'misses': 0, 'invalidated': 0, 'direct_queries': 0, 'fetched_rows': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest = read_manifest(self._manifest_path())
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.cache_dir, MANIFEST_FILE)
+
+    def _partition_path(self, month_key: str) -> str:
+        return os.path.join(self.cache_dir, f"aggregate_{self.source}_{month_key}.parquet")
+
+    def _write_partition(self, month_key: str, df: pd.DataFrame) -> None:
+        atomic_write(self._partition_path(month_key), lambda tmp_path: df.to_parquet(tmp_path, index=False))
+
+    def _is_closed(self, month: pd.Period, now: datetime) -> bool:
+        next_month_start = (month + 1).start_time.to_pydatetime()
+        return now >= next_month_start + timedelta(days=self.closed_after_days)
+
+    def _covers_month(self, month: pd.Period, start: pd.Timestamp, upper: pd.Timestamp) -> bool:
+        # Razdoblje [start, upper) iz date_range_params obuhvaća cijeli mjesec
+        return month.start_time >= start and (month + 1).start_time <= upper
+
+    def _query(self, conn, sql_query, params) -> pd.DataFrame:
+        agg = read_picking_aggregate(conn, sql_query, params)
+        self.stats['fetched_rows'] += len(agg)
+        return agg
+
+    def _is_current(self, entry: dict, month_key: str, watermark: dict) -> bool:
+        return (
+            entry is not None
+            and entry.get('watermark') == watermark
+            and os.path.exists(self._partition_path(month_key))
+        )
+
+    def _month_watermarks(self, conn, months: list) -> dict:
+        """
+        Vraća trenutne vodene žigove zadanih mjeseci (kao read_month_watermarks).
+
+        Ako su svi mjeseci već spremljeni, najprije se jednim negrupiranim upitom
+        (read_data_watermark) čita vodeni žig cijelog raspona. Kad odgovara
+        spremljenim vodenim žigovima, podaci se nisu mijenjali i vraćaju se
+        spremljeni; inače se vodeni žigovi čitaju po mjesecu.
+        """
+        lower = months[0].start_time
+        upper = (months[-1] + 1).start_time
+        entries = {str(month): self.manifest.get(f"{self.source}:{month}") for month in months}
+
+        if all(entry is not None and 'watermark' in entry for entry in entries.values()):
+            stored = {month_key: entry['watermark'] for month_key, entry in entries.items()}
+            total = read_data_watermark(
+                conn, lower.strftime('%Y-%m-%d'), (upper - timedelta(days=1)).strftime('%Y-%m-%d'),
+                daily_aggregate=self.daily_aggregate
+            )
+            combined = combine_month_watermarks(stored.values())
+            if all(
+                math.isclose(total[col] or 0.0, combined.get(col) or 0.0, rel_tol=1e-9, abs_tol=1e-6)
+                for col in total
+            ):
+                return stored
+
+        return read_month_watermarks(
+            conn, lower.strftime('%Y-%m-%d'), upper.strftime('%Y-%m-%d'), daily_aggregate=self.daily_aggregate
+        )
+
+    def read_month(self, conn, month: pd.Period, watermark: dict = None) -> pd.DataFrame:
+        """
+        Vraća agregat jednog zatvorenog mjeseca (svi artikli i zone), iz predmemorije ili iz baze.
+
+        Args:
+            conn: DBAPI konekcija na bazu
+            month: Mjesec (pd.Period s frekvencijom 'M')
+            watermark: Trenutni vodeni žig mjeseca iz read_month_watermarks (None ako nema podataka);
+                spremljeni agregat koristi se samo ako je spremljen uz isti vodeni žig
+        """
+        month_key = str(month)
+        manifest_key = f"{self.source}:{month_key}"
+        if self._is_current(self.manifest.get(manifest_key), month_key, watermark):
+            self.stats['hits'] += 1
+            return pd.read_parquet(self._partition_path(month_key))
+
+        # Sažimanje i zapis idu pod bravom kako dva posla ne bi istodobno punila isti mjesec
+        with directory_lock(self.cache_dir):
+            # Drugi posao je možda u međuvremenu spremio isti mjesec
+            self.manifest = read_manifest(self._manifest_path())
+            entry = self.manifest.get(manifest_key)
+            if self._is_current(entry, month_key, watermark):
+                self.stats['hits'] += 1
+                return pd.read_parquet(self._partition_path(month_key))
+
+            if entry is None:
+                self.stats['misses'] += 1
+            else:
+                self.stats['invalidated'] += 1
+            sql_query, params = build_aggregate_range_query(
+                month.start_time.strftime('%Y-%m-%d'),
+                (month + 1).start_time.strftime('%Y-%m-%d'),
+                daily_aggregate=self.daily_aggregate
+            )
+            agg = self._query(conn, sql_query, params)
+
+            self._write_partition(month_key, agg)
+            self.manifest[manifest_key] = {
+                'rows': len(agg),
+                'watermark': watermark,
+                'refreshed_at': datetime.now().isoformat(timespec='seconds')
+            }
+            write_manifest(self._manifest_path(), self.manifest)
+        return agg
+
+    def load_aggregate(self, conn, start_date, end_date, warehouse_zones=None, item_codes=None,
+                       now: datetime = None) -> pd.DataFrame:
+        """
+        Vraća agregat za razdoblje u obliku aggregate_item_months, s istim
+        filterima i granicama kao build_picking_aggregate_query (odnosno
+        build_daily_aggregate_query).
+
+        Cijeli zatvoreni mjeseci unutar razdoblja čitaju se iz predmemorije
+        (prvi put se sažmu u bazi i spreme), a dio razdoblja prije njih i sve
+        nakon njih (otvoreni mjesec, novi dani) traži se izravno iz baze.
+
+        Args:
+            conn: DBAPI konekcija na bazu
+            start_date: Početni datum (YYYY-MM-DD)
+            end_date: Završni datum (YYYY-MM-DD)
+            warehouse_zones: Lista zona skladišta za filtriranje
+            item_codes: Lista šifri artikala za filtriranje
+            now: Trenutak prema kojem se određuju zatvoreni mjeseci (zadano sada)
+        """
+        now = now or datetime.now()
+        start, upper = (pd.Timestamp(value) for value in date_range_params(start_date, end_date))
+
+        # Cijeli zatvoreni mjeseci čine neprekinut niz (zatvorenost ide redom kroz vrijeme)
+        cached_months = [
+            month for month in pd.period_range(start, upper, freq='M')
+            if self._covers_month(month, start, upper) and self._is_closed(month, now)
+        ]
+        build_query = build_daily_aggregate_query if self.daily_aggregate else build_picking_aggregate_query
+        if not cached_months:
+            self.stats['direct_queries'] += 1
+            sql_query, params = build_query(start_date, end_date, warehouse_zones, item_codes)
+            return self._query(conn, sql_query, params)
+
+        parts = []
+
+        # Dio prvog mjeseca prije niza zatvorenih mjeseci
+        first_start = cached_months[0].start_time
+        if start < first_start:
+            self.stats['direct_queries'] += 1
+            sql_query, params = build_aggregate_range_query(
+                start.strftime('%Y-%m-%d'), first_start.strftime('%Y-%m-%d'), warehouse_zones, item_codes,
+                daily_aggregate=self.daily_aggregate
+            )
+            parts.append(self._query(conn, sql_query, params))
+
+        # Vodeni žigovi svih zatvorenih mjeseci (provjera cijelog raspona, po potrebi po mjesecu)
+        watermarks = self._month_watermarks(conn, cached_months)
+        for month in cached_months:
+            agg = self.read_month(conn, month, watermarks.get(str(month)))
+            mask = pd.Series(True, index=agg.index)
+            if warehouse_zones:
+                mask &= agg[GROUP_COL].isin(warehouse_zones)
+            if item_codes:
+                mask &= agg[ITEM_COL].isin(item_codes)
+            parts.append(agg[mask])
+
+        # Otvoreni mjesec i novi dani nakon zadnjeg zatvorenog mjeseca
+        tail_start = (cached_months[-1] + 1).start_time
+        if tail_start < upper:
+            self.stats['direct_queries'] += 1
+            sql_query, params = build_query(
+                tail_start.strftime('%Y-%m-%d'), end_date, warehouse_zones, item_codes
+            )
+            parts.append(self._query(conn, sql_query, params))
+
+        agg = pd.concat(parts, ignore_index=True)
+        return agg[[ITEM_COL, DESC_COL, GROUP_COL, MONTH_COL] + AGGREGATE_COLUMNS]
+
+    def summary(self) -> str:
+        """
+        Kratki opis pogodaka i promašaja za zapis u log.
+        """
+        return (
+            f"Predmemorija agregata: {self.stats['hits']} mjeseci iz predmemorije, "
+            f"{self.stats['misses']} sažeto u bazi, {self.stats['invalidated']} ponovno sažeto "
+            f"zbog izmjena, {self.stats['direct_queries']} upita za "
+            f"otvoreno razdoblje ({self.stats['fetched_rows']} agregiranih redaka iz baze)"
+        )
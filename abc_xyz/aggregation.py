@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+# Nazivi kolona kako ih vraća SQL upit u ABC_XYZ.py
+ITEM_COL = "Artikl"
+DATE_COL = "Datum pikiranja"
+QTY_COL = "Količina pikiranja"
+DESC_COL = "Naziv artikla"
+GROUP_COL = "Zona"
+MONTH_COL = "MonthYear"
+MONTH_INDEX_COL = "MonthIndex"
+
+# Kolone agregata: broj redaka, broj količina (promet) i zbroj količina
+AGGREGATE_COLUMNS = ['Rows', 'Turnover', 'Qty']
+
+
+def month_index(year, month):
+    """
+    Cjelobrojni indeks mjeseca (godina * 12 + mjesec); raste kronološki.
+    """
+    return year * 12 + month
+
+
+def month_label_index(label: str) -> int:
+    """
+    Indeks mjeseca za oznaku 'mm.YYYY' (ključ za kronološko sortiranje oznaka).
+    """
+    month, year = str(label).split('.')
+    return month_index(int(year), int(month))
+
+
+def month_labels(index: pd.Series) -> pd.Series:
+    """
+    Pretvara indekse mjeseci u oznake 'mm.YYYY' bez strftime po retku.
+
+    Oznake se računaju samo za različite mjesece, a kolona je kategorijska s
+    kronološki poredanim kategorijama. Nepoznati mjeseci ostaju NaN.
+    """
+    values = index.to_numpy(dtype='float64', na_value=np.nan)
+    valid = ~np.isnan(values)
+    months = np.unique(values[valid]).astype(np.int64)
+
+    codes = np.full(len(values), -1, dtype=np.int64)
+    codes[valid] = np.searchsorted(months, values[valid])
+    categories = [f"{(m - 1) % 12 + 1:02d}.{(m - 1) // 12}" for m in months]
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories, ordered=True),
+        index=index.index
+    )
+
+
+def aggregate_item_months(
+    df: pd.DataFrame,
+    item_col: str = ITEM_COL,
+    month_col: str = MONTH_COL,
+    qty_col: str = QTY_COL,
+    desc_col: str = DESC_COL,
+    group_col: str = GROUP_COL
+) -> pd.DataFrame:
+    """
+    Sažima picking podatke u jednom groupby prolazu po (artikl, naziv, zona, mjesec).
+
+    Args:
+        df: Picking podaci s kolonom mjeseca
+        item_col: Kolona šifre artikla
+        month_col: Kolona mjeseca
+        qty_col: Kolona količine
+        desc_col: Kolona naziva artikla (preskače se ako ne postoji)
+        group_col: Kolona zone skladišta (preskače se ako ne postoji)
+
+    Returns:
+        DataFrame s ključevima grupe i kolonama 'Rows' (broj redaka), 'Turnover'
+        (broj količina, kao aggfunc='count') i 'Qty' (zbroj količina). Grupe su
+        poredane po prvoj pojavi, a nepoznati nazivi, zone i mjeseci ostaju kao NaN.
+    """
+    keys = [col for col in (item_col, desc_col, group_col, month_col) if col in df.columns]
+
+    qty = df[qty_col]
+    if qty.dtype == np.float32:
+        # Količine spremljene kao float32 zbrajaju se u float64 kako zbroj ne bi izgubio preciznost
+        qty = qty.astype(np.float64)
+
+    agg = qty.groupby([df[col] for col in keys], sort=False, dropna=False, observed=True).agg(['size', 'count', 'sum'])
+    agg.columns = AGGREGATE_COLUMNS
+    agg = agg.reset_index()
+
+    # Kategorijski ključevi (kompaktni podaci) vraćaju se kao obične kolone, agregat je malen
+    for col in keys:
+        if isinstance(agg[col].dtype, pd.CategoricalDtype):
+            agg[col] = agg[col].astype(object)
+
+    # Retci bez šifre artikla se ne analiziraju (kao kod pivot_table)
+    return agg[agg[item_col].notna()].reset_index(drop=True)
+
+
+def combine_aggregates(aggregates, keys) -> pd.DataFrame:
+    """
+    Spaja više agregata (npr. po dijelovima podataka) u jedan zbrajanjem po ključevima.
+
+    Redoslijed grupa ostaje redoslijed prve pojave, kao da su podaci sažeti odjednom.
+    """
+    combined = pd.concat(aggregates, ignore_index=True)
+    combined = combined.groupby(keys, sort=False, dropna=False, observed=True)[AGGREGATE_COLUMNS].sum()
+    return combined.reset_index()
+
+
+def _modal_values(agg: pd.DataFrame, item_col: str, value_col: str) -> pd.Series:
+    # Najčešća vrijednost po artiklu; kod izjednačenja vrijedi prva pojava (kao value_counts)
+    counts = agg[agg[value_col].notna()].groupby(
+        [item_col, value_col], sort=False, observed=True
+    )['Rows'].sum().reset_index()
+    counts = counts.sort_values('Rows', ascending=False, kind='stable')
+    counts = counts.drop_duplicates(subset=item_col, keep='first')
+    return counts.set_index(item_col)[value_col]
+
+
+def item_month_tables(
+    agg: pd.DataFrame,
+    item_col: str = ITEM_COL,
+    month_col: str = MONTH_COL,
+    desc_col: str = DESC_COL,
+    group_col: str = GROUP_COL
+):
+    """
+    Iz agregata gradi pivot tablice prometa i količine te najčešći naziv i zonu po artiklu.
+
+    Returns:
+        Tuple (turnover_pivot, qty_pivot, item_descriptions, warehouse_zones) jednak
+        rezultatu dvaju pd.pivot_table poziva i groupby/value_counts prolaza u ABC_XYZ.py,
+        ali s mjesecima (kolonama) poredanim kronološki
+    """
+    items = pd.unique(agg[item_col])
+
+    monthly = agg[agg[month_col].notna()].groupby([item_col, month_col], observed=True)[['Turnover', 'Qty']].sum()
+    turnover_pivot = monthly['Turnover'].unstack(fill_value=0)
+    qty_pivot = monthly['Qty'].unstack(fill_value=0)
+
+    # Mjeseci kronološki (leksički bi 01.2025 bio prije 12.2024)
+    months = sorted(turnover_pivot.columns, key=month_label_index)
+    turnover_pivot = turnover_pivot[months]
+    qty_pivot = qty_pivot[months]
+    turnover_pivot.columns.name = month_col
+    qty_pivot.columns.name = month_col
+
+    if desc_col in agg.columns:
+        names = _modal_values(agg, item_col, desc_col)
+        item_descriptions = {item: names.get(item, '') for item in items}
+    else:
+        item_descriptions = {item: "" for item in items}
+
+    if group_col in agg.columns:
+        zones = _modal_values(agg, item_col, group_col)
+        warehouse_zones = {item: zones.get(item, 'TBD') for item in items}
+    else:
+        warehouse_zones = {item: "TBD" for item in items}
+
+    return turnover_pivot, qty_pivot, item_descriptions, warehouse_zones
+
+
+def aggregate_picking(
+    df: pd.DataFrame,
+    item_col: str = ITEM_COL,
+    month_col: str = MONTH_COL,
+    qty_col: str = QTY_COL,
+    desc_col: str = DESC_COL,
+    group_col: str = GROUP_COL
+):
+    """
+    Jedan prolaz kroz picking podatke: pivot tablice prometa i količine te
+    najčešći naziv i zona po artiklu.
+    """
+    agg = aggregate_item_months(df, item_col, month_col, qty_col, desc_col, group_col)
+    return item_month_tables(agg, item_col, month_col, desc_col, group_col)
@@ -0,0 +1,126 @@
+import os
+
+import pandas as pd
+
+# Stupčasti rezultat analize koji se sprema uz Excel izvještaj
+RESULTS_FILE = "abc_xyz_results.parquet"
+# Isti rezultat u tekstualnim formatima za programe bez Parquet podrške
+RESULTS_CSV_FILE = "abc_xyz_results.csv"
+RESULTS_JSON_FILE = "abc_xyz_results.json"
+
+# Broj redaka koji se odjednom pretvara i zapisuje u tekstualne formate
+WRITE_BATCH_ROWS = 10000
+
+# Kolone rezultata po artiklu (prije mjesečnih kolona)
+RESULT_COLUMNS = [
+    'Item', 'Name', 'Warehouse zone', 'ABC', 'XYZ', 'Total Turnover', 'Total Qty',
+    'Percentage', 'Cumulative %', 'Rank', 'Standard Deviation', 'Coefficient Variation'
+]
+
+
+def results_table(results: dict) -> pd.DataFrame:
+    """
+    Slaže rezultate analize u jednu tablicu s jednim retkom po artiklu, redom ranga.
+
+    Tablica sadrži klasifikaciju, međurezultate ABC i XYZ analize, min/max
+    količine (ako su izračunate) te mjesečne kolone 'Turnover_<mjesec>' i 'QTY_<mjesec>'.
+
+    Args:
+        results: Rezultat abc_xyz.pipeline.analyze_aggregate
+
+    Returns:
+        DataFrame s kolonama RESULT_COLUMNS, kolonama zaliha i mjesečnim kolonama
+    """
+    final_df = results['final_df']
+    combined_df = results['combined_df']
+
+    table = combined_df[['Name', 'Warehouse zone', 'ABC', 'XYZ', 'Total Turnover', 'Total Qty',
+                         'Percentage', 'Cumulative %', 'r.n.', 'Standard Deviation', 'Coefficient Variation']]
+    table = table.rename(columns={'r.n.': 'Rank'})
+    table.index.name = 'Item'
+    table = table.reset_index()
+
+    # Kolone zaliha i mjesečne kolone iz konačne tablice (isti redoslijed artikala)
+    extra = final_df[results['inventory_columns'] + monthly_columns(final_df)].reset_index(drop=True)
+
+    return pd.concat([table, extra], axis=1)
+
+
+def _write_replacing(path: str, write) -> str:
+    # Zapis preko privremene datoteke kako čitatelj nikad ne bi vidio djelomičan zapis
+    tmp_path = path + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_results_artifact(results: dict, output_dir: str, file_name: str = RESULTS_FILE) -> str:
+    """
+    Sprema rezultate analize kao Parquet datoteku u output_dir.
+
+    Returns:
+        Putanja spremljene datoteke
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    table = results_table(results)
+    return _write_replacing(
+        os.path.join(output_dir, file_name), lambda tmp_path: table.to_parquet(tmp_path, index=False)
+    )
+
+
+def write_results_csv(results: dict, output_dir: str, file_name: str = RESULTS_CSV_FILE) -> str:
+    """
+    Sprema rezultate analize kao CSV datoteku u output_dir, po paketima redaka.
+
+    Kodiranje je UTF-8 s BOM-om kako bi Excel ispravno prikazao nazive artikala.
+
+    Returns:
+        Putanja spremljene datoteke
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    table = results_table(results)
+    return _write_replacing(
+        os.path.join(output_dir, file_name),
+        lambda tmp_path: table.to_csv(tmp_path, index=False, encoding='utf-8-sig', chunksize=WRITE_BATCH_ROWS)
+    )
+
+
+def write_results_json(results: dict, output_dir: str, file_name: str = RESULTS_JSON_FILE) -> str:
+    """
+    Sprema rezultate analize kao JSON polje zapisa (jedan objekt po artiklu) u output_dir.
+
+    Zapisi se pretvaraju i zapisuju po paketima redaka, pa se cijeli JSON
+    tekst nikad ne drži u memoriji. Prazne vrijednosti zapisuju se kao null.
+
+    Returns:
+        Putanja spremljene datoteke
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    table = results_table(results)
+
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            fh.write('[')
+            for start in range(0, len(table), WRITE_BATCH_ROWS):
+                # Svaki paket je JSON polje; zapisuju se samo zapisi bez zagrada
+                records = table.iloc[start:start + WRITE_BATCH_ROWS].to_json(orient='records', force_ascii=False)
+                if start:
+                    fh.write(',')
+                fh.write(records[1:-1])
+            fh.write(']')
+
+    return _write_replacing(os.path.join(output_dir, file_name), write)
+
+
+def read_results_artifact(path: str) -> pd.DataFrame:
+    """
+    Učitava rezultate analize spremljene s write_results_artifact.
+    """
+    return pd.read_parquet(path)
+
+
+def monthly_columns(table: pd.DataFrame) -> list:
+    """
+    Vraća mjesečne kolone tablice rezultata u parovima (Turnover i QTY) kao u Excel izvještaju.
+    """
+    return [col for col in table.columns if col.startswith(('Turnover_', 'QTY_'))]
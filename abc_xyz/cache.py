@@ -0,0 +1,218 @@
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from abc_xyz.aggregation import DATE_COL, GROUP_COL, ITEM_COL
+from abc_xyz.data import PICKING_SELECT, date_range_params
+
+# Upit za jedan mjesec picking podataka, samo redovi noviji od zadanog LogID-a
+PICKING_MONTH_QUERY = f"""
+SELECT
+    LogID,{PICKING_SELECT}FROM
+    [dbo].[v_pickingStorageSystem]
+WHERE
+    PickDateTime >= ?
+    AND PickDateTime < ?
+    AND LogID > ?
+"""
+
+MANIFEST_FILE = "manifest.json"
+
+# Nazivi kolona iz PICKING_SELECT (za prazan rezultat bez upita)
+PICKING_COLUMNS = re.findall(r"AS '([^']+)'", PICKING_SELECT)
+
+# Brave po direktoriju predmemorije: backend izvršava više analiza istodobno
+# u dretvama (ANALYSIS_WORKERS), a one mogu puniti iste mjesece
+_directory_locks = {}
+_directory_locks_guard = threading.Lock()
+
+
+def directory_lock(cache_dir: str) -> threading.Lock:
+    """
+    Vraća bravu za direktorij predmemorije (ista brava za isti direktorij u cijelom procesu).
+    """
+    key = os.path.normcase(os.path.abspath(cache_dir))
+    with _directory_locks_guard:
+        return _directory_locks.setdefault(key, threading.Lock())
+
+
+def atomic_write(path: str, write) -> None:
+    """
+    Zapisuje datoteku preko jedinstvene privremene datoteke u istom direktoriju
+    i zatim je zamjenjuje, pa prekinuti ili istodobni zapisi ne ostavljaju
+    oštećenu ili izmiješanu datoteku.
+
+    Args:
+        path: Odredišna datoteka
+        write: Funkcija koja zapisuje sadržaj u zadanu privremenu putanju
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp'
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_manifest(path: str) -> dict:
+    """
+    Čita manifest predmemorije (prazan rječnik ako ne postoji).
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(path: str, manifest: dict) -> None:
+    """
+    Atomarno zapisuje manifest predmemorije. Poziva se unutar directory_lock,
+    nakon ponovnog čitanja manifesta, kako se ne bi izgubili unosi drugih poslova.
+    """
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    atomic_write(path, write)
+
+
+class PickingCache:
+    """
+    Lokalna predmemorija picking povijesti s jednom Parquet datotekom po mjesecu.
+
+    Za svaki mjesec pamti se najveći učitani LogID (vodeni žig), pa se iz baze
+    dohvaćaju samo redovi uneseni nakon zadnjeg osvježavanja. Mjesec je zatvoren
+    kad je osvježen barem closed_after_days dana nakon svog kraja (dnevni import
+    unosi jučerašnje pikove) i nakon toga se više nikad ne traži iz baze.
+
+    Datoteke sadrže sve zone i artikle; filteri se primjenjuju lokalno.
+    """
+
+    def __init__(self, cache_dir: str, closed_after_days: int = 2):
+        self.cache_dir = cache_dir
+        self.closed_after_days = closed_after_days
+        self.stats = {'hits': 0, 'misses': 0, 'top_ups': 0, 'fetched_rows': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest = read_manifest(self._manifest_path())
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.cache_dir, MANIFEST_FILE)
+
+    def _partition_path(self, month_key: str) -> str:
+        return os.path.join(self.cache_dir, f"picking_{month_key}.parquet")
+
+    def _write_partition(self, month_key: str, df: pd.DataFrame) -> None:
+        atomic_write(self._partition_path(month_key), lambda tmp_path: df.to_parquet(tmp_path, index=False))
+
+    def _is_closed(self, month: pd.Period, refreshed_at: datetime) -> bool:
+        next_month_start = (month + 1).start_time.to_pydatetime()
+        return refreshed_at >= next_month_start + timedelta(days=self.closed_after_days)
+
+    def _fetch(self, conn, month: pd.Period, after_log_id: int) -> pd.DataFrame:
+        month_start = month.start_time.strftime('%Y-%m-%d')
+        next_month_start = (month + 1).start_time.strftime('%Y-%m-%d')
+        df = pd.read_sql(PICKING_MONTH_QUERY, conn, params=[month_start, next_month_start, after_log_id])
+        df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors='coerce')
+        self.stats['fetched_rows'] += len(df)
+        return df
+
+    def read_month(self, conn, month: pd.Period) -> pd.DataFrame:
+        """
+        Vraća sve pikove jednog mjeseca, po potrebi dopunjene iz baze.
+
+        Args:
+            conn: DBAPI konekcija na bazu
+            month: Mjesec (pd.Period s frekvencijom 'M')
+
+        Returns:
+            DataFrame s kolonom 'LogID' i kolonama iz PICKING_SELECT
+        """
+        month_key = str(month)
+        entry = self.manifest.get(month_key)
+
+        # Zatvoreni mjesec čita se samo iz predmemorije
+        if entry and entry['closed']:
+            self.stats['hits'] += 1
+            return pd.read_parquet(self._partition_path(month_key))
+
+        # Dopuna mjeseca (čitanje, dohvat novih redova, zapis) ide pod bravom, inače
+        # bi dva posla mogla spremiti dijelove i vodene žigove koji si ne odgovaraju
+        with directory_lock(self.cache_dir):
+            # Drugi posao je možda u međuvremenu osvježio isti mjesec
+            self.manifest = read_manifest(self._manifest_path())
+            entry = self.manifest.get(month_key)
+            if entry and entry['closed']:
+                self.stats['hits'] += 1
+                return pd.read_parquet(self._partition_path(month_key))
+
+            refreshed_at = datetime.now()
+            if entry:
+                # Otvoreni mjesec: dohvat samo redova novijih od vodenog žiga
+                self.stats['top_ups'] += 1
+                cached = pd.read_parquet(self._partition_path(month_key))
+                new_rows = self._fetch(conn, month, entry['max_log_id'])
+                df = pd.concat([cached, new_rows], ignore_index=True) if len(new_rows) else cached
+            else:
+                self.stats['misses'] += 1
+                new_rows = self._fetch(conn, month, 0)
+                df = new_rows
+
+            if entry is None or len(new_rows):
+                self._write_partition(month_key, df)
+
+            self.manifest[month_key] = {
+                'max_log_id': int(df['LogID'].max()) if len(df) else (entry or {}).get('max_log_id', 0),
+                'rows': len(df),
+                'refreshed_at': refreshed_at.isoformat(timespec='seconds'),
+                'closed': self._is_closed(month, refreshed_at)
+            }
+            write_manifest(self._manifest_path(), self.manifest)
+        return df
+
+    def iter_picking(self, conn, start_date, end_date, warehouse_zones=None, item_codes=None):
+        """
+        Vraća picking podatke za razdoblje mjesec po mjesec, s istim filterima
+        i granicama kao build_picking_query (date_range_params).
+        """
+        start, upper = (pd.Timestamp(value) for value in date_range_params(start_date, end_date))
+
+        for month in pd.period_range(start, upper - timedelta(days=1), freq='M'):
+            df = self.read_month(conn, month)
+
+            mask = (df[DATE_COL] >= start) & (df[DATE_COL] < upper)
+            if warehouse_zones:
+                mask &= df[GROUP_COL].isin(warehouse_zones)
+            if item_codes:
+                mask &= df[ITEM_COL].isin(item_codes)
+
+            yield df.loc[mask].drop(columns=['LogID']).reset_index(drop=True)
+
+    def load_picking(self, conn, start_date, end_date, warehouse_zones=None, item_codes=None) -> pd.DataFrame:
+        """
+        Vraća picking podatke za razdoblje kao jedan DataFrame (vidi iter_picking).
+        """
+        parts = list(self.iter_picking(conn, start_date, end_date, warehouse_zones, item_codes))
+        if not parts:
+            # Prazno razdoblje (početni datum nakon završnog)
+            return pd.DataFrame(columns=PICKING_COLUMNS).astype({DATE_COL: 'datetime64[ns]'})
+        return pd.concat(parts, ignore_index=True)
+
+    def summary(self) -> str:
+        """
+        Kratki opis pogodaka i promašaja za zapis u log.
+        """
+        return (
+            f"Predmemorija: {self.stats['hits']} pogodaka, {self.stats['misses']} promašaja, "
+            f"{self.stats['top_ups']} dopuna ({self.stats['fetched_rows']} redaka iz baze)"
+        )
@@ -0,0 +1,296 @@
+"""
+Grafovi ABC-XYZ analize za list 'Visualizations' Excel izvještaja.
+
+Za svaki graf prvo se pripreme mali ulazni podaci (brojevi po klasama,
+prorijeđena Pareto krivulja, trend top artikala), a zatim se slike crtaju
+paralelno u zasebnim procesima s Agg backendom. Sažetak (hash) ulaza svakog
+grafa sprema se uz slike, pa se nepromijenjeni grafovi ne crtaju ponovno.
+"""
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Grafovi koji se spremaju uz izvještaj, redom kojim se umeću u list 'Visualizations'
+CHART_FILES = [
+    'abc_distribution.png',
+    'xyz_distribution.png',
+    'abcxyz_matrix.png',
+    'abc_pareto.png',
+    'top_items_trend.png'
+]
+
+# Sažeci ulaza nacrtanih grafova (u direktoriju izvještaja)
+CHART_HASH_FILE = 'charts.sha256.json'
+
+# Povećati kad se promijeni izgled grafova, kako bi se sve slike ponovno nacrtale
+CHART_VERSION = 1
+
+# Najveći broj točaka Pareto krivulje i rezolucija Pareto slike
+PARETO_MAX_POINTS = 2000
+PARETO_DPI = 150
+
+# Granice ABC klasa koje se ucrtavaju na Pareto dijagram
+PARETO_THRESHOLDS = [(80, 'g', '80% threshold (A items)'), (95, 'orange', '95% threshold (B items)')]
+
+
+def _pyplot():
+    # Samo spremanje u datoteke, bez prozora: Agg backend radi i bez grafičkog sučelja
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _render_distribution(path, labels, counts, n_items, colors, title):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(labels, counts, color=colors)
+    ax.set_title(title)
+    ax.set_xlabel('Category')
+    ax.set_ylabel('Number of Items')
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height}\n({height/n_items:.1%})',
+                ha='center', va='bottom')
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def _render_matrix(path, counts, rows, columns, n_items):
+    plt = _pyplot()
+    fig = plt.figure(figsize=(12, 8))
+    cax = plt.matshow(counts, fignum=fig.number, cmap='YlGnBu')
+    plt.colorbar(cax)
+    plt.title('ABC-XYZ Matrix')
+    plt.xlabel('XYZ Classification')
+    plt.ylabel('ABC Classification')
+
+    # Dodavanje tekstualnih anotacija
+    for i in range(counts.shape[0]):
+        for j in range(counts.shape[1]):
+            plt.text(j, i, f'{counts[i, j]}\n({counts[i, j]/n_items:.1%})',
+                     ha='center', va='center')
+
+    plt.xticks(range(len(columns)), columns)
+    plt.yticks(range(len(rows)), rows)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def _render_pareto(path, edges, turnover, cumulative, crossings):
+    plt = _pyplot()
+    fig, ax1 = plt.subplots(figsize=(14, 8))
+
+    # Prva y-os za turnover (stupići kao jedna stepenasta površina; stupić prorijeđene
+    # krivulje pokriva artikle do sljedeće točke)
+    ax1.stairs(turnover, edges, fill=True, color='skyblue', alpha=0.7)
+    ax1.set_xlabel('Items ranked by turnover')
+    ax1.set_ylabel('Turnover', color='royalblue')
+    ax1.tick_params(axis='y', labelcolor='royalblue')
+
+    # Druga y-os za kumulativni postotak (linija, oznake samo na prijelazima granica)
+    ax2 = ax1.twinx()
+    ax2.plot(edges[:-1], cumulative, 'r-', linewidth=2)
+    ax2.plot(crossings[:, 0], crossings[:, 1], 'ro', markersize=5)
+    ax2.set_ylabel('Cumulative percentage (%)', color='red')
+    ax2.tick_params(axis='y', labelcolor='red')
+    ax2.set_ylim([0, 100])
+
+    # Dodavanje linija za granice 80% i 95%
+    for threshold, color, label in PARETO_THRESHOLDS:
+        ax2.axhline(y=threshold, color=color, linestyle='--', label=label)
+
+    # Dodavanje naslova i kombinirane legende za obje osi
+    ax2.set_title('ABC Analysis - Pareto Chart', fontsize=14, fontweight='bold')
+    lines1, labels1 = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax2.legend(lines1 + lines2, labels1 + labels2, loc='upper left', bbox_to_anchor=(0.01, 0.99))
+
+    ax2.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path, dpi=PARETO_DPI)
+    plt.close(fig)
+
+
+def _render_trend(path, months, series):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(15, 10))
+    for label, values in series:
+        ax.plot(months, values, marker='o', label=label)
+
+    ax.set_title('Monthly Turnover Trend for Top 10 Items')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Turnover')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def threshold_crossings(cumulative: np.ndarray) -> list:
+    """
+    Pozicije prvih artikala čiji kumulativni postotak prelazi granice iz PARETO_THRESHOLDS.
+    """
+    return [int(np.searchsorted(cumulative, threshold, side='right')) for threshold, _, _ in PARETO_THRESHOLDS]
+
+
+def pareto_points(cumulative: np.ndarray, max_points: int = PARETO_MAX_POINTS) -> np.ndarray:
+    """
+    Bira pozicije Pareto krivulje (artikli silazno po prometu) koje se crtaju.
+
+    Uz ravnomjerno raspoređene pozicije uvijek se zadržavaju prvi i zadnji
+    artikl te oba artikla oko svakog prijelaza granica 80% i 95%, pa
+    prorijeđena krivulja prelazi granice na istom mjestu kao i puna.
+
+    Args:
+        cumulative: Kumulativni postotak prometa po artiklu
+        max_points: Broj ravnomjerno raspoređenih pozicija
+
+    Returns:
+        Sortirane pozicije (najviše max_points + 2 po granici)
+    """
+    n_items = len(cumulative)
+    positions = [np.linspace(0, n_items - 1, min(max_points, n_items)).round().astype(np.int64)]
+    for crossing in threshold_crossings(cumulative):
+        positions.append(np.array([crossing - 1, crossing]))
+
+    positions = np.unique(np.concatenate(positions))
+    return positions[(positions >= 0) & (positions < n_items)]
+
+
+def chart_inputs(final_df: pd.DataFrame, turnover_pivot: pd.DataFrame, item_descriptions: dict) -> dict:
+    """
+    Priprema ulazne podatke za svaki graf iz CHART_FILES.
+
+    Ulazi su mali (brojevi po klasama, najviše PARETO_MAX_POINTS točaka
+    Pareto krivulje, trend top 10 artikala), pa se brzo prenose u procese
+    za crtanje i služe za sažetak nepromijenjenih grafova.
+
+    Returns:
+        Rječnik naziv datoteke -> (funkcija crtanja, argumenti bez putanje)
+    """
+    n_items = len(final_df)
+
+    abc_counts = final_df['ABC'].value_counts().sort_index()
+    xyz_counts = final_df['XYZ'].value_counts().sort_index()
+    abcxyz_counts = final_df.groupby(['ABC', 'XYZ']).size().unstack(fill_value=0)
+
+    # Pareto dijagram za ABC klasifikaciju
+    sorted_items = final_df['Total Turnover'].sort_values(ascending=False)
+    turnover = sorted_items.to_numpy(dtype=np.float64)
+    cumulative = 100 * np.cumsum(turnover) / turnover.sum()
+    positions = pareto_points(cumulative)
+    edges = np.append(positions, n_items)
+    crossings = np.array(
+        [(crossing, cumulative[crossing]) for crossing in threshold_crossings(cumulative) if crossing < n_items],
+        dtype=np.float64
+    ).reshape(-1, 2)
+
+    # Mjesečna analiza trenda za top 10 artikala
+    months = [col for col in turnover_pivot.columns if col != 'Total Turnover']
+    top_items = sorted_items.index[:10]
+    trend = turnover_pivot.loc[top_items, months].to_numpy(dtype=np.float64)
+    series = [
+        (f"{item} - {item_descriptions.get(item, '')[:20]}", values)
+        for item, values in zip(top_items, trend)
+    ]
+
+    return {
+        'abc_distribution.png': (_render_distribution, (
+            list(abc_counts.index), abc_counts.to_numpy(), n_items,
+            ['green', 'yellow', 'red'], 'ABC Classification Distribution'
+        )),
+        'xyz_distribution.png': (_render_distribution, (
+            list(xyz_counts.index), xyz_counts.to_numpy(), n_items,
+            ['blue', 'orange', 'purple'], 'XYZ Classification Distribution'
+        )),
+        'abcxyz_matrix.png': (_render_matrix, (
+            abcxyz_counts.to_numpy(), list(abcxyz_counts.index), list(abcxyz_counts.columns), n_items
+        )),
+        'abc_pareto.png': (_render_pareto, (
+            edges, turnover[positions], cumulative[positions], crossings
+        )),
+        'top_items_trend.png': (_render_trend, (months, series))
+    }
+
+
+def _chart_hash(render, args) -> str:
+    payload = pickle.dumps((CHART_VERSION, render.__name__, args), protocol=4)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _read_hashes(output_dir: str) -> dict:
+    try:
+        with open(os.path.join(output_dir, CHART_HASH_FILE), encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _render(render, path, args):
+    render(path, *args)
+    return path
+
+
+def write_charts(
+    final_df: pd.DataFrame,
+    turnover_pivot: pd.DataFrame,
+    item_descriptions: dict,
+    output_dir: str,
+    workers: int = None
+) -> list:
+    """
+    Sprema grafove ABC-XYZ analize kao PNG datoteke u output_dir.
+
+    Graf se crta samo ako slika ne postoji ili su se njegovi ulazni podaci
+    promijenili od zadnjeg crtanja. Više grafova crta se paralelno u
+    zasebnim procesima.
+
+    Args:
+        final_df: Konačna tablica analize (kolone 'ABC', 'XYZ', 'Total Turnover')
+        turnover_pivot: Mjesečni promet po artiklu
+        item_descriptions: Nazivi artikala za legendu trenda
+        output_dir: Direktorij za slike
+        workers: Broj procesa za crtanje (zadano broj procesora; 1 crta u ovom procesu)
+
+    Returns:
+        Lista putanja slika redom iz CHART_FILES
+    """
+    inputs = chart_inputs(final_df, turnover_pivot, item_descriptions)
+    hashes = {name: _chart_hash(*inputs[name]) for name in CHART_FILES}
+    previous = _read_hashes(output_dir)
+
+    pending = [
+        name for name in CHART_FILES
+        if previous.get(name) != hashes[name] or not os.path.exists(os.path.join(output_dir, name))
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_render, inputs[name][0], os.path.join(output_dir, name), inputs[name][1])
+                for name in pending
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for name in pending:
+            _render(inputs[name][0], os.path.join(output_dir, name), inputs[name][1])
+
+    # Sažeci se spremaju tek nakon uspješnog crtanja svih grafova
+    with open(os.path.join(output_dir, CHART_HASH_FILE), 'w', encoding='utf-8') as fh:
+        json.dump(hashes, fh, indent=2)
+
+    print(f"Grafovi: nacrtano {len(pending)}, nepromijenjeno {len(CHART_FILES) - len(pending)}.")
+    return [os.path.join(output_dir, name) for name in CHART_FILES]
@@ -0,0 +1,248 @@
+"""
+Dnevni agregat picking podataka (tablica dbo.PickingDaily).
+
+Jedan redak po danu, artiklu, nazivu i zoni s brojem pikova i zbrojem
+količina. Dnevni import (sp_Import_Picking) nakon učitavanja pokreće
+osvježavanje, a dashboard i analiza čitaju agregat umjesto da svaki put
+grupiraju sirove redove iz view-a v_pickingStorageSystem.
+
+Primjer:
+    python -m abc_xyz.daily refresh
+    python -m abc_xyz.daily backfill --start-date 2023-01-01 --end-date 2024-12-31
+"""
+import argparse
+from datetime import date, timedelta
+
+import pandas as pd
+
+from abc_xyz.aggregation import GROUP_COL
+
+DAILY_TABLE = "[dbo].[PickingDaily]"
+
+DAILY_COLUMNS = ['PickDate', 'ItemCode', 'ItemName', 'Storage_system', 'PickCount', 'QtyCount', 'QtySum']
+
+# Dnevni zbrojevi za razdoblje [početak, kraj) računaju se u bazi
+DAILY_SOURCE_QUERY = """
+SELECT
+    YEAR(PickDateTime) AS PickYear,
+    MONTH(PickDateTime) AS PickMonth,
+    DAY(PickDateTime) AS PickDay,
+    ItemCode,
+    ItemName,
+    Storage_system,
+    COUNT(*) AS PickCount,
+    COUNT(Qty) AS QtyCount,
+    SUM(Qty) AS QtySum
+FROM
+    [dbo].[v_pickingStorageSystem]
+WHERE
+    PickDateTime >= ?
+    AND PickDateTime < ?
+GROUP BY
+    YEAR(PickDateTime), MONTH(PickDateTime), DAY(PickDateTime), ItemCode, ItemName, Storage_system
+"""
+
+# Isti zbrojevi iz tablice Picking po lokaciji; zona se dodaje lokalno (abc_xyz.locations)
+DAILY_RAW_SOURCE_QUERY = """
+SELECT
+    YEAR(PickDateTime) AS PickYear,
+    MONTH(PickDateTime) AS PickMonth,
+    DAY(PickDateTime) AS PickDay,
+    ItemCode,
+    ItemName,
+    FromLocationCode,
+    COUNT(*) AS PickCount,
+    COUNT(Qty) AS QtyCount,
+    SUM(Qty) AS QtySum
+FROM
+    [dbo].[Picking]
+WHERE
+    PickDateTime >= ?
+    AND PickDateTime < ?
+GROUP BY
+    YEAR(PickDateTime), MONTH(PickDateTime), DAY(PickDateTime), ItemCode, ItemName, FromLocationCode
+"""
+
+DAILY_DELETE_QUERY = f"DELETE FROM {DAILY_TABLE} WHERE PickDate >= ? AND PickDate < ?"
+
+DAILY_INSERT_QUERY = (
+    f"INSERT INTO {DAILY_TABLE} ({', '.join(DAILY_COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * len(DAILY_COLUMNS))})"
+)
+
+DAILY_LAST_DATE_QUERY = f"SELECT MAX(PickDate) AS LastDate FROM {DAILY_TABLE}"
+
+
+def _to_date(value) -> date:
+    return pd.Timestamp(value).date()
+
+
+def read_daily_rows(conn, start_date, end_date, location_zones=None) -> pd.DataFrame:
+    """
+    Računa dnevne zbrojeve iz view-a za dane od start_date do end_date (uključivo).
+
+    Uz location_zones zbrojevi se računaju iz tablice Picking po lokaciji, a
+    lokacije se lokalno preslikavaju u zone i zbrajaju.
+
+    Returns:
+        DataFrame s kolonama DAILY_COLUMNS; PickDate je u obliku 'YYYY-MM-DD'
+    """
+    start = _to_date(start_date)
+    end = _to_date(end_date) + timedelta(days=1)
+    params = [start.isoformat(), end.isoformat()]
+
+    if location_zones is not None:
+        location_zones.refresh_if_stale(conn)
+        df = pd.read_sql(DAILY_RAW_SOURCE_QUERY, conn, params=params)
+        df = location_zones.attach(df, location_col='FromLocationCode')
+        df = df.rename(columns={GROUP_COL: 'Storage_system'}).groupby(
+            ['PickYear', 'PickMonth', 'PickDay', 'ItemCode', 'ItemName', 'Storage_system'],
+            sort=False, dropna=False, observed=True
+        )[['PickCount', 'QtyCount', 'QtySum']].sum(min_count=1).reset_index()
+        df['Storage_system'] = df['Storage_system'].astype(object)
+    else:
+        df = pd.read_sql(DAILY_SOURCE_QUERY, conn, params=params)
+
+    df['PickDate'] = pd.to_datetime(dict(
+        year=df['PickYear'], month=df['PickMonth'], day=df['PickDay']
+    )).dt.strftime('%Y-%m-%d')
+    df['PickCount'] = df['PickCount'].astype('int64')
+    df['QtyCount'] = df['QtyCount'].astype('int64')
+    df['QtySum'] = pd.to_numeric(df['QtySum'])
+
+    return df[DAILY_COLUMNS]
+
+
+def refresh_daily_range(conn, start_date, end_date, location_zones=None) -> int:
+    """
+    Zamjenjuje dnevne zbrojeve za dane od start_date do end_date (uključivo).
+
+    Dani se prvo brišu pa ponovno upisuju, pa je ponovljeno pokretanje za isti
+    dan (npr. nakon ponovljenog importa) sigurno. Promjene se potvrđuju commitom.
+
+    Args:
+        conn: DBAPI konekcija (pyodbc ili SQLite zamjena)
+        start_date: Prvi dan (YYYY-MM-DD)
+        end_date: Zadnji dan (YYYY-MM-DD)
+        location_zones: LocationZones za dodavanje zone umjesto view-a (opcionalno)
+
+    Returns:
+        Broj upisanih redaka agregata
+    """
+    rows = read_daily_rows(conn, start_date, end_date, location_zones)
+    end = _to_date(end_date) + timedelta(days=1)
+
+    cursor = conn.cursor()
+    if hasattr(cursor, 'fast_executemany'):
+        cursor.fast_executemany = True
+    try:
+        cursor.execute(DAILY_DELETE_QUERY, [_to_date(start_date).isoformat(), end.isoformat()])
+        if len(rows):
+            cursor.executemany(
+                DAILY_INSERT_QUERY,
+                rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return len(rows)
+
+
+def last_daily_date(conn):
+    """
+    Vraća zadnji dan koji postoji u dnevnom agregatu ili None ako je tablica prazna.
+    """
+    last_date = pd.read_sql(DAILY_LAST_DATE_QUERY, conn)['LastDate'].iloc[0]
+    return None if pd.isna(last_date) else _to_date(last_date)
+
+
+def refresh_daily_aggregate(conn, start_date=None, end_date=None, location_zones=None) -> dict:
+    """
+    Nadopunjuje dnevni agregat nakon dnevnog importa.
+
+    Bez zadanih datuma osvježavaju se dani od zadnjeg dana u agregatu (ponovno,
+    zbog kasno unesenih pikova) do jučer, jer import učitava jučerašnje pikove.
+
+    Returns:
+        Rječnik s prvim i zadnjim osvježenim danom i brojem upisanih redaka
+    """
+    end = _to_date(end_date) if end_date else date.today() - timedelta(days=1)
+    if start_date:
+        start = _to_date(start_date)
+    else:
+        start = min(last_daily_date(conn) or end, end)
+
+    rows = refresh_daily_range(conn, start, end, location_zones)
+    return {'start_date': start.isoformat(), 'end_date': end.isoformat(), 'rows': rows}
+
+
+def backfill_daily_aggregate(conn, start_date, end_date, location_zones=None) -> dict:
+    """
+    Puni dnevni agregat za cijelo razdoblje, mjesec po mjesec.
+
+    Svaki mjesec je zasebna transakcija, pa prekinuto punjenje može se
+    nastaviti od mjeseca na kojem je stalo.
+
+    Returns:
+        Rječnik s prvim i zadnjim danom i ukupnim brojem upisanih redaka
+    """
+    start = _to_date(start_date)
+    end = _to_date(end_date)
+    total_rows = 0
+
+    for month in pd.period_range(start, end, freq='M'):
+        month_start = max(month.start_time.date(), start)
+        month_end = min(month.end_time.date(), end)
+        rows = refresh_daily_range(conn, month_start, month_end, location_zones)
+        total_rows += rows
+        print(f"Mjesec {month.strftime('%m.%Y')}: upisano {rows} redaka.")
+
+    return {'start_date': start.isoformat(), 'end_date': end.isoformat(), 'rows': total_rows}
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Daily picking aggregate maintenance')
+    parser.add_argument('command', choices=['refresh', 'backfill'], help='refresh after the daily import or backfill a date range')
+    parser.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD)')
+    parser.add_argument('--location-lookup', action='store_true', help='Read dbo.Picking and resolve zones from an in-memory Locations lookup')
+    parser.add_argument('--sqlite', type=str, help='Path to a local SQLite stand-in database instead of SQL Server')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    if args.command == 'backfill' and not (args.start_date and args.end_date):
+        raise SystemExit("backfill zahtijeva --start-date i --end-date")
+
+    if args.sqlite:
+        from abc_xyz.standin import connect_standin
+        conn = connect_standin(args.sqlite)
+    else:
+        import pyodbc  # Za SQL Server konekciju
+        conn = pyodbc.connect(
+            "DRIVER={SQL Server};"
+            "SERVER=ft-AppServer01\\SQLEXPRESS;"
+            "DATABASE=Reports;"
+            "Trusted_Connection=yes;"
+        )
+
+    location_zones = None
+    if args.location_lookup:
+        from abc_xyz.locations import LocationZones
+        location_zones = LocationZones()
+
+    try:
+        if args.command == 'refresh':
+            stats = refresh_daily_aggregate(conn, args.start_date, args.end_date, location_zones)
+        else:
+            stats = backfill_daily_aggregate(conn, args.start_date, args.end_date, location_zones)
+        print(f"Dnevni agregat osvježen od {stats['start_date']} do {stats['end_date']}: "
+              f"upisano {stats['rows']} redaka.")
+    finally:
+        conn.close()
@@ -0,0 +1,465 @@
+import numpy as np
+import pandas as pd
+
+from abc_xyz.aggregation import (
+    AGGREGATE_COLUMNS, DATE_COL, DESC_COL, GROUP_COL, ITEM_COL, MONTH_COL, MONTH_INDEX_COL, QTY_COL,
+    aggregate_item_months, combine_aggregates, month_index, month_labels
+)
+
+# Kolone view-a v_pickingStorageSystem s nazivima koje koristi analiza
+PICKING_SELECT = """
+    OrderCode AS 'Broj naloga',
+    OrderInputDate AS 'Datum_naloga',
+    DeliveryType AS 'Vrsta isporuke',
+    TaskCode AS 'Broj taska',
+    ListCode AS 'Picking list',
+    TaskCreateTime AS 'datum taska',
+    PickDateTime AS 'Datum pikiranja',
+    FromLocationCode AS 'Lokacija',
+    Storage_system AS 'Zona',
+    ItemCode AS 'Artikl',
+    ItemName AS 'Naziv artikla',
+    Qty AS 'Količina pikiranja',
+    UserName AS 'Korisnik',
+    Customer AS 'Kupac',
+    Receiver AS 'Primatelj'
+"""
+
+# SQL upit za dohvat podataka iz view-a
+PICKING_QUERY = f"""
+SELECT{PICKING_SELECT}FROM
+    [dbo].[v_pickingStorageSystem]
+WHERE
+    PickDateTime IS NOT NULL
+    AND PickDateTime >= ? AND PickDateTime < ?
+"""
+
+# Isti podaci iz tablice Picking bez zone; zona se dodaje lokalno (abc_xyz.locations)
+RAW_PICKING_SELECT = PICKING_SELECT.replace("    Storage_system AS 'Zona',\n", "")
+
+RAW_PICKING_QUERY = f"""
+SELECT{RAW_PICKING_SELECT}FROM
+    [dbo].[Picking]
+WHERE
+    PickDateTime IS NOT NULL
+    AND PickDateTime >= ? AND PickDateTime < ?
+"""
+
+# Agregatni upit: brojanje i zbrajanje po artiklu, zoni i mjesecu radi se u bazi
+PICKING_AGGREGATE_QUERY = """
+SELECT
+    ItemCode AS 'Artikl',
+    ItemName AS 'Naziv artikla',
+    Storage_system AS 'Zona',
+    YEAR(PickDateTime) AS 'Year',
+    MONTH(PickDateTime) AS 'Month',
+    COUNT(*) AS 'Rows',
+    COUNT(Qty) AS 'Turnover',
+    SUM(Qty) AS 'Qty'
+FROM
+    [dbo].[v_pickingStorageSystem]
+WHERE
+    PickDateTime IS NOT NULL
+    AND PickDateTime >= ? AND PickDateTime < ?
+"""
+
+PICKING_AGGREGATE_GROUP_BY = """
+GROUP BY
+    ItemCode, ItemName, Storage_system, YEAR(PickDateTime), MONTH(PickDateTime)
+"""
+
+# Isti agregat iz dnevnog agregata dbo.PickingDaily (vidi abc_xyz.daily)
+DAILY_AGGREGATE_QUERY = """
+SELECT
+    ItemCode AS 'Artikl',
+    ItemName AS 'Naziv artikla',
+    Storage_system AS 'Zona',
+    YEAR(PickDate) AS 'Year',
+    MONTH(PickDate) AS 'Month',
+    SUM(PickCount) AS 'Rows',
+    SUM(QtyCount) AS 'Turnover',
+    SUM(QtySum) AS 'Qty'
+FROM
+    [dbo].[PickingDaily]
+WHERE
+    PickDate >= ? AND PickDate < ?
+"""
+
+DAILY_AGGREGATE_GROUP_BY = """
+GROUP BY
+    ItemCode, ItemName, Storage_system, YEAR(PickDate), MONTH(PickDate)
+"""
+
+# Vodeni žig podataka u razdoblju: mijenja se kad import doda, obriše ili ispravi pikove
+# (tablica Picking, bez zone; filter po zonama se ne primjenjuje)
+PICKING_WATERMARK_QUERY = """
+SELECT
+    COUNT(*) AS 'Rows',
+    MAX(LogID) AS 'MaxLogID'
+FROM
+    [dbo].[Picking]
+WHERE
+    PickDateTime IS NOT NULL
+    AND PickDateTime >= ? AND PickDateTime < ?
+"""
+
+# Isti vodeni žig za analizu iz dnevnog agregata (puni se nakon importa u Picking)
+DAILY_WATERMARK_QUERY = """
+SELECT
+    COUNT(*) AS 'Rows',
+    SUM(PickCount) AS 'Picks',
+    SUM(QtySum) AS 'Qty'
+FROM
+    [dbo].[PickingDaily]
+WHERE
+    PickDate >= ? AND PickDate < ?
+"""
+
+# Vodeni žig po mjesecu za predmemoriju agregata zatvorenih mjeseci; mijenja se kad
+# import naknadno doda ili obriše pikove u već zatvorenom mjesecu. Čita se iz tablice
+# Picking (raspon po PickDateTime), a ne iz view-a, jer je view s dodjelom zone
+# upravo ono što predmemorija izbjegava
+PICKING_MONTH_WATERMARK_QUERY = """
+SELECT
+    YEAR(PickDateTime) AS 'Year',
+    MONTH(PickDateTime) AS 'Month',
+    COUNT(*) AS 'Rows',
+    MAX(LogID) AS 'MaxLogID'
+FROM
+    [dbo].[Picking]
+WHERE
+    PickDateTime >= ? AND PickDateTime < ?
+GROUP BY
+    YEAR(PickDateTime), MONTH(PickDateTime)
+"""
+
+DAILY_MONTH_WATERMARK_QUERY = """
+SELECT
+    YEAR(PickDate) AS 'Year',
+    MONTH(PickDate) AS 'Month',
+    COUNT(*) AS 'Rows',
+    SUM(PickCount) AS 'Picks',
+    SUM(QtySum) AS 'Qty'
+FROM
+    [dbo].[PickingDaily]
+WHERE
+    PickDate >= ? AND PickDate < ?
+GROUP BY
+    YEAR(PickDate), MONTH(PickDate)
+"""
+
+# Kolone bez kojih analiza nije moguća
+REQUIRED_COLUMNS = [ITEM_COL, DATE_COL, QTY_COL, DESC_COL]
+
+# Tekstualna kolona se kodira kao kategorija ako je udio različitih vrijednosti manji od ovoga
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def date_range_params(start_date, end_date) -> list:
+    """
+    Granice razdoblja za upite kao poluotvoreni raspon [start_date, end_date + 1 dan).
+
+    Završni dan ulazi cijeli, jednako za pikove (PickDateTime), dnevni agregat
+    (PickDate) i lokalne predmemorije, pa isti zahtjev daje iste zbrojeve iz
+    svakog izvora.
+
+    Returns:
+        Lista [od, do] s datumima u obliku YYYY-MM-DD
+    """
+    lower = pd.Timestamp(start_date).normalize()
+    upper = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+    return [lower.strftime('%Y-%m-%d'), upper.strftime('%Y-%m-%d')]
+
+
+def _add_filters(sql_query, params, warehouse_zones=None, item_codes=None):
+    # Dodavanje filtera za zone skladišta
+    if warehouse_zones:
+        placeholders = ','.join(['?' for _ in warehouse_zones])
+        sql_query += f" AND Storage_system IN ({placeholders})"
+        params.extend(warehouse_zones)
+
+    # Dodavanje filtera za artikle
+    if item_codes:
+        placeholders = ','.join(['?' for _ in item_codes])
+        sql_query += f" AND ItemCode IN ({placeholders})"
+        params.extend(item_codes)
+
+    return sql_query, params
+
+
+def build_picking_query(start_date, end_date, warehouse_zones=None, item_codes=None):
+    """
+    Sastavlja upit za picking podatke s opcionalnim filterima.
+
+    Razdoblje je poluotvoreni raspon iz date_range_params (završni dan ulazi cijeli).
+
+    Args:
+        start_date: Početni datum (YYYY-MM-DD)
+        end_date: Završni datum (YYYY-MM-DD, uključivo)
+        warehouse_zones: Lista zona skladišta za filtriranje
+        item_codes: Lista šifri artikala za filtriranje
+
+    Returns:
+        Tuple (sql_query, params)
+    """
+    return _add_filters(PICKING_QUERY, date_range_params(start_date, end_date), warehouse_zones, item_codes)
+
+
+def build_raw_picking_query(start_date, end_date, item_codes=None):
+    """
+    Sastavlja upit za picking podatke iz tablice Picking, bez kolone zone.
+
+    Filter po zonama primjenjuje se lokalno nakon dodavanja zone (LocationZones.attach).
+
+    Returns:
+        Tuple (sql_query, params)
+    """
+    return _add_filters(RAW_PICKING_QUERY, date_range_params(start_date, end_date), None, item_codes)
+
+
+def build_picking_aggregate_query(start_date, end_date, warehouse_zones=None, item_codes=None):
+    """
+    Sastavlja agregatni upit koji vraća jedan redak po artiklu, nazivu, zoni i mjesecu.
+
+    Filteri su isti kao kod build_picking_query.
+
+    Returns:
+        Tuple (sql_query, params)
+    """
+    sql_query, params = _add_filters(
+        PICKING_AGGREGATE_QUERY, date_range_params(start_date, end_date), warehouse_zones, item_codes
+    )
+    return sql_query + PICKING_AGGREGATE_GROUP_BY, params
+
+
+def build_daily_aggregate_query(start_date, end_date, warehouse_zones=None, item_codes=None):
+    """
+    Sastavlja agregatni upit nad dnevnim agregatom dbo.PickingDaily.
+
+    Vraća isti oblik kao build_picking_aggregate_query; razdoblje obuhvaća
+    cijele dane od start_date do end_date.
+
+    Returns:
+        Tuple (sql_query, params)
+    """
+    sql_query, params = _add_filters(
+        DAILY_AGGREGATE_QUERY, date_range_params(start_date, end_date), warehouse_zones, item_codes
+    )
+    return sql_query + DAILY_AGGREGATE_GROUP_BY, params
+
+
+def build_aggregate_range_query(lower, upper, warehouse_zones=None, item_codes=None, daily_aggregate=False):
+    """
+    Sastavlja agregatni upit za poluotvoreni raspon [lower, upper), npr. jedan
+    cijeli mjesec, iz view-a pikova ili iz dnevnog agregata.
+
+    Vraća isti oblik kao build_picking_aggregate_query.
+
+    Returns:
+        Tuple (sql_query, params)
+    """
+    if daily_aggregate:
+        base_query, group_by = DAILY_AGGREGATE_QUERY, DAILY_AGGREGATE_GROUP_BY
+    else:
+        base_query, group_by = PICKING_AGGREGATE_QUERY, PICKING_AGGREGATE_GROUP_BY
+    sql_query, params = _add_filters(base_query, [lower, upper], warehouse_zones, item_codes)
+    return sql_query + group_by, params
+
+
+def read_data_watermark(conn, start_date, end_date, warehouse_zones=None, item_codes=None,
+                        daily_aggregate=False) -> dict:
+    """
+    Čita vodeni žig picking podataka u razdoblju (broj redaka i najveći LogID,
+    odnosno zbrojeve dnevnog agregata).
+
+    Dvije analize s istim parametrima i istim vodenim žigom daju isti rezultat.
+
+    Args:
+        conn: DBAPI konekcija
+        start_date: Početni datum (YYYY-MM-DD)
+        end_date: Završni datum (YYYY-MM-DD)
+        warehouse_zones: Lista zona (samo za dnevni agregat; tablica Picking nema zonu)
+        item_codes: Lista šifri artikala
+        daily_aggregate: Analiza čita dnevni agregat dbo.PickingDaily
+
+    Returns:
+        Rječnik s vrijednostima iz PICKING_WATERMARK_QUERY ili DAILY_WATERMARK_QUERY
+    """
+    if daily_aggregate:
+        sql_query, params = _add_filters(
+            DAILY_WATERMARK_QUERY, date_range_params(start_date, end_date), warehouse_zones, item_codes
+        )
+    else:
+        sql_query, params = _add_filters(
+            PICKING_WATERMARK_QUERY, date_range_params(start_date, end_date), None, item_codes
+        )
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql_query, params)
+        columns = [column[0] for column in cursor.description]
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    # Decimal i slične vrijednosti iz baze spremaju se kao float radi usporedbe
+    return {col: None if value is None else float(value) for col, value in zip(columns, row)}
+
+
+def read_month_watermarks(conn, lower, upper, daily_aggregate=False) -> dict:
+    """
+    Čita vodene žigove svih mjeseci u rasponu [lower, upper) jednim upitom
+    (broj redaka i najveći LogID iz tablice Picking, odnosno zbrojeve dnevnog agregata).
+
+    Args:
+        conn: DBAPI konekcija
+        lower: Početak raspona (YYYY-MM-DD)
+        upper: Kraj raspona, isključivo (YYYY-MM-DD)
+        daily_aggregate: Vodeni žigovi dnevnog agregata dbo.PickingDaily
+
+    Returns:
+        Rječnik {'YYYY-MM': {kolona: vrijednost}}; mjeseci bez podataka nisu navedeni
+    """
+    sql_query = DAILY_MONTH_WATERMARK_QUERY if daily_aggregate else PICKING_MONTH_WATERMARK_QUERY
+    watermarks = pd.read_sql(sql_query, conn, params=[lower, upper])
+
+    result = {}
+    for row in watermarks.to_dict('records'):
+        month_key = f"{int(row.pop('Year')):04d}-{int(row.pop('Month')):02d}"
+        # Zbroj količina zaokružuje se jer redoslijed zbrajanja u bazi nije zadan
+        result[month_key] = {
+            col: None if pd.isna(value) else round(float(value), 6) for col, value in row.items()
+        }
+    return result
+
+
+def combine_month_watermarks(watermarks) -> dict:
+    """
+    Spaja vodene žigove mjeseci (read_month_watermarks) u vodeni žig cijelog
+    raspona, usporediv s read_data_watermark: najveći LogID je najveći po
+    mjesecima, a ostale vrijednosti se zbrajaju.
+
+    Args:
+        watermarks: Vodeni žigovi mjeseci (None za mjesec bez podataka)
+    """
+    combined = {}
+    for watermark in watermarks:
+        for col, value in (watermark or {}).items():
+            if value is None:
+                continue
+            previous = combined.get(col)
+            if previous is None:
+                combined[col] = value
+            else:
+                combined[col] = max(previous, value) if col == 'MaxLogID' else previous + value
+    return combined
+
+
+def find_missing_columns(df: pd.DataFrame) -> list:
+    """
+    Vraća listu obaveznih kolona koje nedostaju u podacima.
+    """
+    return [col for col in REQUIRED_COLUMNS if col not in df.columns]
+
+
+def add_month_columns(df: pd.DataFrame, date_col: str = DATE_COL) -> pd.DataFrame:
+    """
+    Pretvara kolonu datuma u datetime i dodaje kolone 'Month', 'Year', 'MonthIndex' i 'MonthYear'.
+
+    MonthIndex (godina * 12 + mjesec) računa se aritmetički, a MonthYear je
+    kategorijska oznaka 'mm.YYYY' s kronološkim redoslijedom kategorija.
+    """
+    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    df['Month'] = df[date_col].dt.month
+    df['Year'] = df[date_col].dt.year
+    df[MONTH_INDEX_COL] = month_index(df['Year'], df['Month']).astype('Int32')
+    df[MONTH_COL] = month_labels(df[MONTH_INDEX_COL])
+    return df
+
+
+def compact_picking(df: pd.DataFrame, max_unique_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> pd.DataFrame:
+    """
+    Smanjuje memoriju picking podataka bez promjene vrijednosti.
+
+    Tekstualne kolone s ponovljenim vrijednostima (artikl, naziv, zona, kupac,
+    korisnik, ...) kodiraju se kao kategorije, a količina se sprema kao float32
+    ako to ne mijenja nijednu vrijednost (inače float64).
+
+    Args:
+        df: Picking podaci (mijenjaju se na mjestu)
+        max_unique_ratio: Najveći udio različitih vrijednosti za kodiranje kolone
+
+    Returns:
+        Isti DataFrame s kompaktnim tipovima kolona
+    """
+    for col in df.columns:
+        if df[col].dtype == object and df[col].nunique(dropna=True) < max_unique_ratio * len(df):
+            df[col] = df[col].astype('category')
+
+    if QTY_COL in df.columns:
+        # pyodbc vraća decimal kolone kao Decimal objekte
+        qty = pd.to_numeric(df[QTY_COL], errors='coerce').astype(np.float64)
+        qty32 = qty.astype(np.float32)
+        lossless = np.array_equal(qty32.to_numpy(np.float64), qty.to_numpy(), equal_nan=True)
+        df[QTY_COL] = qty32 if lossless else qty
+
+    return df
+
+
+def aggregate_picking_chunks(chunks, date_col: str = DATE_COL):
+    """
+    Sažima picking podatke dio po dio u tekuće zbrojeve po artiklu i mjesecu.
+
+    Nakon svakog dijela u memoriji ostaje samo agregat, pa vršna potrošnja
+    memorije ovisi o broju artikala i mjeseci, a ne o broju pikova.
+
+    Args:
+        chunks: Iterator DataFrame-ova (npr. pd.read_sql(..., chunksize=n))
+        date_col: Kolona datuma pikiranja
+
+    Returns:
+        Tuple (agg, row_count) gdje je agg rezultat aggregate_item_months nad
+        svim podacima, a row_count ukupan broj učitanih redaka
+    """
+    agg = None
+    row_count = 0
+
+    for chunk in chunks:
+        missing_columns = find_missing_columns(chunk)
+        if missing_columns:
+            raise ValueError(f"Nedostaju potrebne kolone za analizu: {', '.join(missing_columns)}")
+
+        row_count += len(chunk)
+        chunk_agg = aggregate_item_months(add_month_columns(chunk, date_col))
+        keys = [col for col in chunk_agg.columns if col not in AGGREGATE_COLUMNS]
+        agg = chunk_agg if agg is None else combine_aggregates([agg, chunk_agg], keys)
+
+    if agg is None:
+        agg = pd.DataFrame(columns=[ITEM_COL, DESC_COL, GROUP_COL, MONTH_COL] + AGGREGATE_COLUMNS)
+
+    return agg, row_count
+
+
+def read_picking_aggregate(conn, sql_query, params) -> pd.DataFrame:
+    """
+    Izvršava agregatni upit i vraća agregat u obliku aggregate_item_months.
+
+    Args:
+        conn: DBAPI konekcija (pyodbc ili SQLite zamjena)
+        sql_query: Upit iz build_picking_aggregate_query
+        params: Parametri upita
+
+    Returns:
+        DataFrame s kolonama artikla, naziva, zone, 'MonthYear', 'Rows', 'Turnover' i 'Qty'
+    """
+    agg = pd.read_sql(sql_query, conn, params=params)
+
+    # Oznaka mjeseca u istom obliku kao strftime('%m.%Y')
+    agg[MONTH_COL] = agg['Month'].map('{:02d}'.format) + '.' + agg['Year'].astype(str)
+    agg = agg.drop(columns=['Year', 'Month'])
+
+    # SUM nad samim NULL vrijednostima vraća NULL; pivot_table bi dao 0
+    agg['Qty'] = pd.to_numeric(agg['Qty']).fillna(0)
+    agg['Rows'] = agg['Rows'].astype('int64')
+    agg['Turnover'] = agg['Turnover'].astype('int64')
+
+    return agg[[ITEM_COL, DESC_COL, GROUP_COL, MONTH_COL] + AGGREGATE_COLUMNS]
@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+
+# Zadane granice klasifikacije (iste kao u AnalysisConfiguration)
+ABC_A_THRESHOLD = 80.0
+ABC_B_THRESHOLD = 95.0
+XYZ_X_THRESHOLD = 20.0
+XYZ_Y_THRESHOLD = 40.0
+
+
+def monthly_matrix(turnover_pivot: pd.DataFrame) -> np.ndarray:
+    """
+    Vraća matricu artikl × mjesec iz pivot tablice prometa.
+
+    Kolona 'Total Turnover' se izostavlja ako postoji. Matrica je C-poredana
+    kako bi se redci zbrajali istim redoslijedom kao pojedinačne Series.
+    """
+    monthly = turnover_pivot.loc[:, turnover_pivot.columns != 'Total Turnover']
+    return np.ascontiguousarray(monthly.to_numpy(dtype=np.float64))
+
+
+def classify_abc(
+    cumulative_pct,
+    a_threshold: float = ABC_A_THRESHOLD,
+    b_threshold: float = ABC_B_THRESHOLD
+) -> np.ndarray:
+    """
+    Dodjeljuje ABC kategorije prema kumulativnom postotku prometa.
+
+    Args:
+        cumulative_pct: Kumulativni postotak prometa po artiklu
+        a_threshold: Gornja granica za kategoriju A
+        b_threshold: Gornja granica za kategoriju B
+
+    Returns:
+        Polje s oznakama 'A', 'B' ili 'C'
+    """
+    cumulative_pct = np.asarray(cumulative_pct, dtype=np.float64)
+    return np.select(
+        [cumulative_pct <= a_threshold, cumulative_pct <= b_threshold],
+        ['A', 'B'],
+        default='C'
+    ).astype(object)
+
+
+def classify_xyz(
+    coef_var,
+    x_threshold: float = XYZ_X_THRESHOLD,
+    y_threshold: float = XYZ_Y_THRESHOLD
+) -> np.ndarray:
+    """
+    Dodjeljuje XYZ kategorije prema koeficijentu varijacije (u postocima).
+
+    Artikli bez koeficijenta varijacije (NaN) dobivaju kategoriju 'Z'.
+    """
+    coef_var = np.asarray(coef_var, dtype=np.float64)
+    return np.select(
+        [coef_var <= x_threshold, coef_var <= y_threshold],
+        ['X', 'Y'],
+        default='Z'
+    ).astype(object)
+
+
+def compute_abc(
+    total_turnover: pd.Series,
+    total_qty: pd.Series,
+    a_threshold: float = ABC_A_THRESHOLD,
+    b_threshold: float = ABC_B_THRESHOLD
+) -> pd.DataFrame:
+    """
+    Izvodi ABC analizu nad ukupnim prometom po artiklu.
+
+    Args:
+        total_turnover: Ukupan promet po artiklu (indeks je šifra artikla)
+        total_qty: Ukupna količina po artiklu
+        a_threshold: Gornja granica za kategoriju A
+        b_threshold: Gornja granica za kategoriju B
+
+    Returns:
+        DataFrame sortiran po prometu silazno s kolonama 'Item', 'Total Turnover',
+        'Total Qty', 'Percentage', 'Cumulative %', 'r.n.' i 'ABC'
+    """
+    abc_df = pd.DataFrame({
+        'Item': total_turnover.index,
+        'Total Turnover': total_turnover,
+        'Total Qty': total_qty
+    })
+
+    # Sortiranje po prometu silazno
+    abc_df = abc_df.sort_values('Total Turnover', ascending=False)
+
+    # Izračun kumulativnog postotka
+    abc_df['Percentage'] = 100 * abc_df['Total Turnover'] / abc_df['Total Turnover'].sum()
+    abc_df['Cumulative %'] = abc_df['Percentage'].cumsum()
+
+    # Dodavanje rednog broja
+    abc_df['r.n.'] = range(1, len(abc_df) + 1)
+
+    abc_df['ABC'] = classify_abc(abc_df['Cumulative %'], a_threshold, b_threshold)
+    return abc_df
+
+
+def compute_xyz(
+    turnover_pivot: pd.DataFrame,
+    x_threshold: float = XYZ_X_THRESHOLD,
+    y_threshold: float = XYZ_Y_THRESHOLD
+) -> pd.DataFrame:
+    """
+    Izvodi XYZ analizu nad cijelom matricom artikl × mjesec u jednom prolazu.
+
+    Standardna devijacija je uzoračka (ddof=1), kao kod pandas Series.std(),
+    pa je rezultat jednak dosadašnjoj petlji po artiklima. Artikli sa srednjom
+    vrijednošću 0 imaju koeficijent varijacije 0.
+
+    Args:
+        turnover_pivot: Pivot tablica prometa (artikli × mjeseci), s ili bez
+            kolone 'Total Turnover'
+        x_threshold: Gornja granica koeficijenta varijacije za kategoriju X
+        y_threshold: Gornja granica koeficijenta varijacije za kategoriju Y
+
+    Returns:
+        DataFrame s kolonama 'Standard Deviation', 'Coefficient Variation' i 'XYZ'
+    """
+    values = monthly_matrix(turnover_pivot)
+    n_months = values.shape[1]
+
+    if n_months > 0:
+        mean = values.sum(axis=1) / n_months
+    else:
+        mean = np.full(len(values), np.nan)
+
+    # Uzoračka varijanca; za manje od dva mjeseca nije definirana
+    if n_months > 1:
+        deviations = values - mean[:, None]
+        std_dev = np.sqrt((deviations * deviations).sum(axis=1) / (n_months - 1))
+    else:
+        std_dev = np.full(len(values), np.nan)
+
+    # Izbjegavanje dijeljenja s nulom
+    positive = mean > 0
+    coef_var = np.zeros(len(values))
+    coef_var[positive] = std_dev[positive] / mean[positive] * 100
+
+    xyz_df = pd.DataFrame({
+        'Standard Deviation': std_dev,
+        'Coefficient Variation': coef_var
+    }, index=turnover_pivot.index)
+    xyz_df['XYZ'] = classify_xyz(coef_var, x_threshold, y_threshold)
+    return xyz_df
+
+
+def compute_zone_abc(
+    final_df: pd.DataFrame,
+    zone_col: str = 'Warehouse zone',
+    a_threshold: float = ABC_A_THRESHOLD,
+    b_threshold: float = ABC_B_THRESHOLD
+) -> pd.DataFrame:
+    """
+    Izvodi ABC analizu unutar svake zone skladišta za sve zone odjednom.
+
+    Artikli se jednom sortiraju po zoni i prometu silazno, a udio, kumulativni
+    postotak i redni broj računaju se grupno (transform/cumsum/cumcount).
+    Artikli s istim prometom zadržavaju redoslijed iz final_df. Artikli bez
+    zone se izostavljaju.
+
+    Args:
+        final_df: Tablica s kolonama zone i 'Total Turnover' (indeks je šifra artikla)
+        zone_col: Kolona zone skladišta
+        a_threshold: Gornja granica za kategoriju A unutar zone
+        b_threshold: Gornja granica za kategoriju B unutar zone
+
+    Returns:
+        DataFrame s indeksom final_df, sortiran po zoni i rangu u zoni, s kolonama
+        zone_col, 'Total Turnover', 'Zone Percentage', 'Zone Cumulative %',
+        'Zone ABC' i 'Zone Rank'
+    """
+    zone_df = final_df[[zone_col, 'Total Turnover']].dropna(subset=[zone_col])
+    zone_df = zone_df.sort_values([zone_col, 'Total Turnover'], ascending=[True, False])
+
+    grouped = zone_df.groupby(zone_col, sort=False, observed=True)
+    zone_df['Zone Percentage'] = 100 * zone_df['Total Turnover'] / grouped['Total Turnover'].transform('sum')
+    zone_df['Zone Cumulative %'] = zone_df.groupby(zone_col, sort=False, observed=True)['Zone Percentage'].cumsum()
+    zone_df['Zone ABC'] = classify_abc(zone_df['Zone Cumulative %'], a_threshold, b_threshold)
+    zone_df['Zone Rank'] = grouped.cumcount() + 1
+    return zone_df
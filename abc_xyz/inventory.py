@@ -0,0 +1,254 @@
+import numpy as np
+import pandas as pd
+
+from abc_xyz.engine import ABC_A_THRESHOLD, ABC_B_THRESHOLD, XYZ_X_THRESHOLD, XYZ_Y_THRESHOLD
+
+# Zadani parametri za izračun min/max količina zaliha
+LEAD_TIME_WEEKS = 2  # Primjer: 2 tjedna vremena isporuke za nadopunu
+SAFETY_STOCK_FACTORS = {
+    'X': 1.0,  # Niži sigurnosni lager za stabilne artikle
+    'Y': 1.5,  # Srednji sigurnosni lager za umjerene varijacije
+    'Z': 2.5   # Viši sigurnosni lager za nepredvidljive artikle
+}
+# ABC faktori za izračun maksimalnih količina
+MAX_QTY_FACTORS = {
+    'A': 1.5,  # Niži plafon zaliha za važne artikle (brža nadopuna)
+    'B': 2.0,  # Srednji plafon zaliha
+    'C': 3.0   # Viši plafon zaliha za manje važne artikle (rjeđe narudžbe)
+}
+WEEKS_PER_MONTH = 4.33  # Prosječan broj tjedana po mjesecu
+MIN_SAFETY_STOCK_RATIO = 0.2  # Minimalni sigurnosni lager je 20% prosjeka
+WHOLE_UNITS_ABOVE = 5  # Iznad ovog tjednog prosjeka količine se zaokružuju na cijele jedinice
+
+INVENTORY_COLUMNS = ['Avg Weekly Qty', 'Min Qty Weekly', 'Max Qty Weekly',
+                     'Avg Monthly Qty', 'Min Qty Monthly', 'Max Qty Monthly']
+
+# Granice klasa i parametri zaliha iz tablice konfiguracija analize
+CONFIGURATION_QUERY = """
+SELECT
+    ConfigID,
+    ConfigName,
+    ABC_A_Threshold,
+    ABC_B_Threshold,
+    XYZ_X_Threshold,
+    XYZ_Y_Threshold,
+    LeadTimeWeeks,
+    SafetyStock_X_Factor,
+    SafetyStock_Y_Factor,
+    SafetyStock_Z_Factor,
+    MaxQty_A_Factor,
+    MaxQty_B_Factor,
+    MaxQty_C_Factor
+FROM
+    [dbo].[AnalysisConfigurations]
+WHERE
+    ConfigID = ?
+"""
+
+
+def _config_value(config, name: str, default: float) -> float:
+    # Nepopunjena vrijednost konfiguracije (None ili NaN iz upita) zamjenjuje se zadanom
+    config_value = getattr(config, name, None)
+    return default if config_value is None or pd.isna(config_value) else float(config_value)
+
+
+def inventory_params_from_config(config) -> dict:
+    """
+    Parametri zaliha iz konfiguracije analize (AnalysisConfiguration ili redak s istim kolonama).
+
+    Nepopunjene vrijednosti zamjenjuju se zadanima.
+
+    Returns:
+        Rječnik s ključevima 'lead_time_weeks', 'safety_stock_factors' i 'max_qty_factors'
+    """
+    return {
+        'lead_time_weeks': _config_value(config, 'LeadTimeWeeks', LEAD_TIME_WEEKS),
+        'safety_stock_factors': {
+            xyz: _config_value(config, f'SafetyStock_{xyz}_Factor', factor) for xyz, factor in SAFETY_STOCK_FACTORS.items()
+        },
+        'max_qty_factors': {
+            abc: _config_value(config, f'MaxQty_{abc}_Factor', factor) for abc, factor in MAX_QTY_FACTORS.items()
+        }
+    }
+
+
+def analysis_params_from_config(config) -> dict:
+    """
+    Granice klasa i parametri zaliha iz konfiguracije analize, kao argumenti za analyze_aggregate.
+
+    Nepopunjene granice zamjenjuju se zadanima iz abc_xyz.engine.
+
+    Returns:
+        Rječnik s ključevima 'a_threshold', 'b_threshold', 'x_threshold',
+        'y_threshold' i 'inventory_params'
+    """
+    return {
+        'a_threshold': _config_value(config, 'ABC_A_Threshold', ABC_A_THRESHOLD),
+        'b_threshold': _config_value(config, 'ABC_B_Threshold', ABC_B_THRESHOLD),
+        'x_threshold': _config_value(config, 'XYZ_X_Threshold', XYZ_X_THRESHOLD),
+        'y_threshold': _config_value(config, 'XYZ_Y_Threshold', XYZ_Y_THRESHOLD),
+        'inventory_params': inventory_params_from_config(config)
+    }
+
+
+def read_configurations(conn, config_ids: list) -> list:
+    """
+    Učitava retke tablice AnalysisConfigurations redom kao config_ids.
+
+    Raises:
+        ValueError: Ako neka konfiguracija ne postoji
+    """
+    configs = []
+    for config_id in config_ids:
+        df = pd.read_sql(CONFIGURATION_QUERY, conn, params=[config_id])
+        if df.empty:
+            raise ValueError(f"Konfiguracija s ID-om {config_id} ne postoji")
+        configs.append(df.iloc[0])
+    return configs
+
+
+def read_inventory_params(conn, config_id: int) -> dict:
+    """
+    Učitava parametre zaliha za ConfigID iz tablice AnalysisConfigurations.
+
+    Raises:
+        ValueError: Ako konfiguracija ne postoji
+    """
+    return inventory_params_from_config(read_configurations(conn, [config_id])[0])
+
+
+def _class_factors(classes: pd.Series, factors: dict, name: str) -> np.ndarray:
+    values = classes.map(factors).to_numpy(dtype=np.float64)
+    unknown = np.isnan(values) & classes.notna().to_numpy()
+    if unknown.any():
+        raise KeyError(f"Nema faktora {name} za klasu {classes[unknown].iloc[0]!r}")
+    return values
+
+
+def _round_2(values: np.ndarray) -> np.ndarray:
+    rounded = np.round(values, 2)
+    # np.round zaokružuje values * 100 pa se blizu pola stotinke može razlikovati od
+    # ugrađenog round(); te rijetke vrijednosti zaokružuju se s round() kao i dosad
+    scaled = values * 100
+    with np.errstate(invalid='ignore'):
+        near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    rounded[near_half] = [round(value, 2) for value in values[near_half].tolist()]
+    return rounded
+
+
+def _round_quantities(values: np.ndarray, whole_units: np.ndarray) -> np.ndarray:
+    # Cijele jedinice za artikle s većim prometom, inače 2 decimale
+    return np.where(whole_units, np.round(values), _round_2(values))
+
+
+def qty_statistics(monthly_qty: pd.DataFrame, coefficient_variation: pd.Series = None) -> dict:
+    """
+    Prosjeci i standardne devijacije mjesečnih količina po artiklu, neovisni o klasama i faktorima.
+
+    Args:
+        monthly_qty: Mjesečne količine (artikli × mjeseci)
+        coefficient_variation: Koeficijent varijacije po artiklu (koristi se kad postoji samo jedan mjesec)
+
+    Returns:
+        Rječnik polja 'Avg Monthly Qty', 'Avg Weekly Qty', 'Monthly Qty StdDev'
+        (samo za više od jednog mjeseca) i 'Weekly Qty StdDev'
+    """
+    n_months = monthly_qty.shape[1]
+    statistics = {}
+
+    # Prosječna mjesečna potrošnja i tjedni prosjek
+    avg_monthly = monthly_qty.mean(axis=1).to_numpy(dtype=np.float64)
+    avg_weekly = avg_monthly / WEEKS_PER_MONTH
+    statistics['Avg Monthly Qty'] = avg_monthly
+    statistics['Avg Weekly Qty'] = avg_weekly
+
+    # Standardna devijacija za sigurnosni lager (uzoračka)
+    if n_months > 1:
+        monthly_std = monthly_qty.std(axis=1).to_numpy(dtype=np.float64)
+        statistics['Monthly Qty StdDev'] = monthly_std
+        weekly_std = monthly_std / WEEKS_PER_MONTH
+    else:
+        # Ako imamo samo jedan mjesec, koristimo koeficijent varijacije iz XYZ analize
+        weekly_std = avg_weekly * coefficient_variation.reindex(monthly_qty.index).to_numpy(dtype=np.float64) / 100
+    statistics['Weekly Qty StdDev'] = weekly_std
+
+    return statistics
+
+
+def levels_from_statistics(
+    statistics: dict,
+    abc: pd.Series,
+    xyz: pd.Series,
+    lead_time_weeks: float = LEAD_TIME_WEEKS,
+    safety_stock_factors: dict = None,
+    max_qty_factors: dict = None
+) -> dict:
+    """
+    Tjedne i mjesečne min/max količine iz rezultata qty_statistics i ABC-XYZ klasa.
+
+    Returns:
+        Rječnik polja 'Safety Stock Weekly', 'Min Qty Weekly', 'Max Qty Weekly',
+        'Min Qty Monthly' i 'Max Qty Monthly'
+    """
+    safety_stock_factors = safety_stock_factors or SAFETY_STOCK_FACTORS
+    max_qty_factors = max_qty_factors or MAX_QTY_FACTORS
+
+    avg_weekly = statistics['Avg Weekly Qty']
+    levels = {}
+
+    # Tjedne min/max količine
+    safety_stock = np.maximum(
+        statistics['Weekly Qty StdDev'] * _class_factors(xyz, safety_stock_factors, 'sigurnosnog lagera'),
+        avg_weekly * MIN_SAFETY_STOCK_RATIO
+    )
+    min_weekly = avg_weekly * lead_time_weeks + safety_stock
+    max_weekly = min_weekly + avg_weekly * _class_factors(abc, max_qty_factors, 'maksimalne količine')
+    levels['Safety Stock Weekly'] = safety_stock
+
+    # Zaokruživanje tjednih i mjesečnih količina
+    whole_units = avg_weekly > WHOLE_UNITS_ABOVE
+    levels['Min Qty Weekly'] = _round_quantities(min_weekly, whole_units)
+    levels['Max Qty Weekly'] = _round_quantities(max_weekly, whole_units)
+    levels['Min Qty Monthly'] = _round_quantities(min_weekly * WEEKS_PER_MONTH, whole_units)
+    levels['Max Qty Monthly'] = _round_quantities(max_weekly * WEEKS_PER_MONTH, whole_units)
+
+    return levels
+
+
+def compute_inventory_levels(
+    monthly_qty: pd.DataFrame,
+    abc: pd.Series,
+    xyz: pd.Series,
+    coefficient_variation: pd.Series = None,
+    lead_time_weeks: float = LEAD_TIME_WEEKS,
+    safety_stock_factors: dict = None,
+    max_qty_factors: dict = None
+) -> pd.DataFrame:
+    """
+    Računa tjedne i mjesečne min/max količine zaliha za sve artikle odjednom.
+
+    Sigurnosni lager je veći od tjedne standardne devijacije pomnožene XYZ
+    faktorom i 20% tjednog prosjeka; minimum pokriva vrijeme isporuke, a
+    maksimum dodaje tjedni prosjek pomnožen ABC faktorom.
+
+    Args:
+        monthly_qty: Mjesečne količine (artikli × mjeseci)
+        abc: ABC klasa po artiklu (isti indeks)
+        xyz: XYZ klasa po artiklu (isti indeks)
+        coefficient_variation: Koeficijent varijacije po artiklu (koristi se kad postoji samo jedan mjesec)
+        lead_time_weeks: Vrijeme isporuke za nadopunu u tjednima
+        safety_stock_factors: Faktori sigurnosnog lagera po XYZ klasi
+        max_qty_factors: Faktori maksimalne količine po ABC klasi
+
+    Returns:
+        DataFrame s indeksom monthly_qty: INVENTORY_COLUMNS i međurezultati
+        ('Weekly Qty StdDev', 'Safety Stock Weekly', ...)
+    """
+    statistics = qty_statistics(monthly_qty, coefficient_variation)
+    levels = levels_from_statistics(
+        statistics, abc, xyz,
+        lead_time_weeks=lead_time_weeks,
+        safety_stock_factors=safety_stock_factors,
+        max_qty_factors=max_qty_factors
+    )
+    return pd.DataFrame({**statistics, **levels}, index=monthly_qty.index)
@@ -0,0 +1,109 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from abc_xyz.aggregation import GROUP_COL
+
+LOCATION_COL = "Lokacija"
+
+# Šifra lokacije i zona skladišta iz tablice Locations
+LOCATIONS_QUERY = """
+SELECT
+    Code,
+    Storage_system
+FROM
+    [dbo].[Locations]
+"""
+
+
+def normalize_location_codes(codes: pd.Series) -> pd.Series:
+    # Usporedba kao u view-u (COLLATE DATABASE_DEFAULT): bez razlike velikih/malih slova i završnih razmaka
+    return codes.astype('string').str.rstrip().str.upper()
+
+
+class LocationZones:
+    """
+    Preslikavanje šifre lokacije u zonu skladišta, učitano iz tablice Locations.
+
+    Zamjenjuje korelirani podupit u view-u v_pickingStorageSystem: picking
+    podaci čitaju se iz tablice Picking, a zona se dodaje lokalno kao
+    kategorijska kolona (kodovi u rječnik zona). Tablica se ponovno učitava
+    kad je starija od max_age_seconds.
+    """
+
+    def __init__(self, max_age_seconds: float = 3600):
+        self.max_age_seconds = max_age_seconds
+        self.stats = {'loads': 0, 'lookups': 0, 'unmatched': 0}
+        self.loaded_at = None
+        # (šifre lokacija, kod zone po lokaciji, zone); zamjenjuje se odjednom kako bi
+        # istodobne analize uvijek vidjele jednu verziju tablice
+        self._table = (pd.Index([], dtype='string'), np.array([], dtype=np.int32), pd.Index([], dtype=object))
+
+    def load(self, conn) -> None:
+        """
+        Učitava tablicu Locations i gradi rječnik šifra lokacije -> kod zone.
+        """
+        df = pd.read_sql(LOCATIONS_QUERY, conn)
+        df['Code'] = normalize_location_codes(df['Code'])
+        df = df.drop_duplicates(subset='Code', keep='first')
+
+        zones = pd.Categorical(df['Storage_system'])
+        self._table = (pd.Index(df['Code']), zones.codes.astype(np.int32), zones.categories)
+        self.loaded_at = time.monotonic()
+        self.stats['loads'] += 1
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.max_age_seconds
+
+    def refresh_if_stale(self, conn) -> None:
+        """
+        Ponovno učitava tablicu Locations ako nije učitana ili je prestara.
+        """
+        if self.is_stale():
+            self.load(conn)
+
+    def lookup(self, location_codes: pd.Series) -> pd.Series:
+        """
+        Vraća zonu za svaku šifru lokacije kao kategorijsku kolonu.
+
+        Lokacije kojih nema u tablici Locations (ili bez zone) dobivaju NaN,
+        kao NULL iz view-a.
+        """
+        location_index, zone_codes, zones = self._table
+        positions = location_index.get_indexer(normalize_location_codes(location_codes))
+        matched = positions >= 0
+        codes = np.full(len(positions), -1, dtype=np.int32)
+        codes[matched] = zone_codes[positions[matched]]
+
+        self.stats['lookups'] += len(codes)
+        self.stats['unmatched'] += int((~matched).sum())
+
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=zones),
+            index=location_codes.index,
+            name=GROUP_COL
+        )
+
+    def attach(self, df: pd.DataFrame, warehouse_zones=None, location_col: str = LOCATION_COL) -> pd.DataFrame:
+        """
+        Dodaje kolonu zone picking podacima i, ako je zadano, zadržava samo navedene zone.
+
+        Args:
+            df: Picking podaci s kolonom šifre lokacije
+            warehouse_zones: Lista zona skladišta za filtriranje
+            location_col: Kolona šifre lokacije
+
+        Returns:
+            DataFrame s kategorijskom kolonom zone
+        """
+        df[GROUP_COL] = self.lookup(df[location_col])
+        if warehouse_zones:
+            df = df[df[GROUP_COL].isin(warehouse_zones)].reset_index(drop=True)
+        return df
+
+    def summary(self) -> str:
+        location_index, _, zones = self._table
+        return (f"Lokacije: {len(location_index)} šifri u {len(zones)} zona, "
+                f"učitano {self.stats['loads']}x, {self.stats['lookups']} pretraga, "
+                f"{self.stats['unmatched']} bez zone")
@@ -0,0 +1,559 @@
+import pandas as pd
+
+from abc_xyz.aggregate_cache import AggregateCache
+from abc_xyz.aggregation import (
+    DATE_COL, DESC_COL, GROUP_COL, ITEM_COL, MONTH_COL, QTY_COL, aggregate_item_months, item_month_tables
+)
+from abc_xyz.cache import PickingCache
+from abc_xyz.data import (
+    add_month_columns, aggregate_picking_chunks, build_daily_aggregate_query, build_picking_aggregate_query,
+    build_picking_query, build_raw_picking_query, compact_picking, find_missing_columns, read_picking_aggregate
+)
+from abc_xyz.engine import (
+    ABC_A_THRESHOLD, ABC_B_THRESHOLD, XYZ_X_THRESHOLD, XYZ_Y_THRESHOLD, classify_abc, classify_xyz, compute_abc,
+    compute_xyz
+)
+from abc_xyz.inventory import INVENTORY_COLUMNS, LEAD_TIME_WEEKS, compute_inventory_levels, levels_from_statistics
+from abc_xyz.profiling import NO_PROFILER
+
+
+def load_picking_aggregate(
+    conn,
+    start_date,
+    end_date,
+    warehouse_zones=None,
+    item_codes=None,
+    chunk_rows=None,
+    pushdown=False,
+    cache_dir=None,
+    daily_aggregate=False,
+    location_zones=None,
+    aggregate_cache_dir=None,
+    profiler=None
+) -> pd.DataFrame:
+    """
+    Učitava picking podatke za razdoblje i sažima ih po artiklu, nazivu, zoni i mjesecu.
+
+    Konekcija se ne zatvara; o tome brine pozivatelj.
+
+    Args:
+        conn: DBAPI konekcija (pyodbc ili SQLite zamjena)
+        start_date: Početni datum (YYYY-MM-DD)
+        end_date: Završni datum (YYYY-MM-DD)
+        warehouse_zones: Lista zona skladišta za filtriranje
+        item_codes: Lista šifri artikala za filtriranje
+        chunk_rows: Ako je zadano, podaci se čitaju i sažimaju u dijelovima od toliko redaka
+        pushdown: Brojanje i zbrajanje izvodi se u bazi
+        cache_dir: Direktorij lokalne predmemorije picking povijesti (ne koristi se uz pushdown)
+        daily_aggregate: Mjesečni zbrojevi računaju se iz dnevnog agregata dbo.PickingDaily
+        location_zones: LocationZones; podaci se čitaju iz tablice Picking, a zona se
+            dodaje lokalno (ne koristi se uz pushdown i cache_dir)
+        aggregate_cache_dir: Direktorij predmemorije mjesečnih agregata zatvorenih
+            mjeseci; iz baze (pikovi ili dnevni agregat) traži se samo otvoreno razdoblje
+        profiler: StageProfiler za faze 'read', 'prepare' i 'aggregate'
+
+    Returns:
+        Agregat u obliku aggregate_item_months
+    """
+    profiler = profiler or NO_PROFILER
+
+    if aggregate_cache_dir:
+        # Inkrementalno: zatvoreni mjeseci iz predmemorije agregata, iz baze samo novi dani
+        print("Učitavanje mjesečnih zbrojeva iz predmemorije agregata i baze...")
+        aggregate_cache = AggregateCache(aggregate_cache_dir, daily_aggregate=daily_aggregate)
+        with profiler.stage('read'):
+            agg = aggregate_cache.load_aggregate(
+                conn, start_date, end_date, warehouse_zones=warehouse_zones, item_codes=item_codes
+            )
+
+        print(aggregate_cache.summary())
+        print(f"Pronađeno {agg[MONTH_COL].nunique()} jedinstvenih mjesečnih perioda.")
+        print(f"Pronađeno {agg[ITEM_COL].nunique()} jedinstvenih artikala.")
+        return agg
+
+    if pushdown or daily_aggregate:
+        # Brojanje i zbrajanje po artiklu, zoni i mjesecu izvodi se na SQL Serveru
+        print("Učitavanje mjesečnih zbrojeva po artiklu iz baze...")
+        build_query = build_daily_aggregate_query if daily_aggregate else build_picking_aggregate_query
+        agg_query, agg_params = build_query(
+            start_date, end_date, warehouse_zones=warehouse_zones, item_codes=item_codes
+        )
+        with profiler.stage('read'):
+            agg = read_picking_aggregate(conn, agg_query, agg_params)
+
+        print(f"Učitano {len(agg)} agregiranih redaka ({agg['Rows'].sum()} pikova).")
+        print(f"Pronađeno {agg[MONTH_COL].nunique()} jedinstvenih mjesečnih perioda.")
+        print(f"Pronađeno {agg[ITEM_COL].nunique()} jedinstvenih artikala.")
+        return agg
+
+    # Lokalna predmemorija picking povijesti (jedna Parquet datoteka po mjesecu)
+    picking_cache = PickingCache(cache_dir) if cache_dir else None
+    if picking_cache:
+        location_zones = None
+
+    if location_zones is not None:
+        # Zona se dodaje iz rječnika lokacija umjesto koreliranog podupita u view-u
+        with profiler.stage('locations'):
+            location_zones.refresh_if_stale(conn)
+        sql_query, params = build_raw_picking_query(start_date, end_date, item_codes=item_codes)
+    else:
+        # SQL upit za dohvat podataka iz view-a
+        sql_query, params = build_picking_query(
+            start_date, end_date, warehouse_zones=warehouse_zones, item_codes=item_codes
+        )
+
+    if chunk_rows:
+        # Učitavanje u dijelovima: svaki dio se odmah sažima u mjesečne zbrojeve po artiklu
+        if picking_cache:
+            # Iz predmemorije se čita mjesec po mjesec
+            print("Učitavanje podataka iz predmemorije po mjesecima...")
+            chunks = picking_cache.iter_picking(
+                conn, start_date, end_date, warehouse_zones=warehouse_zones, item_codes=item_codes
+            )
+        else:
+            print(f"Učitavanje podataka iz baze u dijelovima od {chunk_rows} redaka...")
+            chunks = pd.read_sql(sql_query, conn, params=params, chunksize=chunk_rows)
+            if location_zones is not None:
+                chunks = (location_zones.attach(chunk, warehouse_zones) for chunk in chunks)
+        # Čitanje i sažimanje dijelova se isprepliću, pa se mjere kao jedna faza
+        with profiler.stage('read'):
+            agg, row_count = aggregate_picking_chunks(chunks, DATE_COL)
+
+        print(f"Učitano {row_count} redaka podataka.")
+        print(f"Pronađeno {agg[MONTH_COL].nunique()} jedinstvenih mjesečnih perioda.")
+        print(f"Pronađeno {agg[ITEM_COL].nunique()} jedinstvenih artikala.")
+    else:
+        # Učitavanje podataka iz baze
+        with profiler.stage('read'):
+            if picking_cache:
+                print("Učitavanje podataka iz predmemorije...")
+                df = picking_cache.load_picking(
+                    conn, start_date, end_date, warehouse_zones=warehouse_zones, item_codes=item_codes
+                )
+            else:
+                print("Učitavanje podataka iz baze...")
+                df = pd.read_sql(sql_query, conn, params=params)
+                if location_zones is not None:
+                    df = location_zones.attach(df, warehouse_zones)
+
+        # Provjera učitanih podataka
+        print(f"Učitano {len(df)} redaka podataka.")
+        print("Dostupne kolone u podacima:")
+        print(df.columns.tolist())
+
+        # Provjera jesu li sve potrebne kolone prisutne
+        missing_columns = find_missing_columns(df)
+        for col_name in missing_columns:
+            print(f"Upozorenje: Potrebna kolona '{col_name}' nije pronađena u podacima.")
+
+        if missing_columns:
+            raise ValueError(f"Nedostaju potrebne kolone za analizu: {', '.join(missing_columns)}")
+
+        with profiler.stage('prepare'):
+            # Konverzija datuma i izvlačenje mjeseca i godine
+            print(f"Konverzija {DATE_COL} u datetime format...")
+            add_month_columns(df, DATE_COL)
+            print(f"Konverzija datuma uspješna. Primjer datuma: {df[DATE_COL].head().tolist()}")
+
+            # Kategorije umjesto tekstualnih kolona i kompaktna količina
+            memory_before = df.memory_usage(deep=True).sum()
+            compact_picking(df)
+            memory_after = df.memory_usage(deep=True).sum()
+        print(f"Memorija podataka: {memory_before / 2**20:.1f} MB -> {memory_after / 2**20:.1f} MB")
+
+        print(f"Pronađeno {df[MONTH_COL].nunique()} jedinstvenih mjesečnih perioda.")
+        print(f"Pronađeno {df[ITEM_COL].nunique()} jedinstvenih artikala.")
+
+        # Prikaz primjera podataka nakon obrade
+        print("\nPrimjer podataka nakon obrade:")
+        print(df[['Month', 'Year', MONTH_COL, ITEM_COL, QTY_COL]].head())
+
+        # Sažimanje po artiklu, nazivu, zoni i mjesecu u jednom prolazu kroz podatke
+        with profiler.stage('aggregate'):
+            agg = aggregate_item_months(
+                df,
+                item_col=ITEM_COL,
+                month_col=MONTH_COL,
+                qty_col=QTY_COL,
+                desc_col=DESC_COL,
+                group_col=GROUP_COL
+            )
+        del df
+
+    if picking_cache:
+        print(picking_cache.summary())
+    if location_zones is not None:
+        print(location_zones.summary())
+
+    return agg
+
+
+def add_inventory_levels(
+    final_df: pd.DataFrame,
+    months: list,
+    coefficient_variation: pd.Series,
+    lead_time_weeks: float = LEAD_TIME_WEEKS,
+    safety_stock_factors: dict = None,
+    max_qty_factors: dict = None
+) -> list:
+    """
+    Dodaje u final_df tjedne i mjesečne min/max količine zaliha na temelju ABC-XYZ klasifikacije.
+
+    Izračun radi compute_inventory_levels nad cijelim kolonama odjednom.
+
+    Args:
+        final_df: Konačna tablica s kolonama 'ABC', 'XYZ' i 'QTY_<mjesec>'
+        months: Oznake mjeseci analize
+        coefficient_variation: Koeficijent varijacije po artiklu (koristi se kad postoji samo jedan mjesec)
+        lead_time_weeks: Vrijeme isporuke za nadopunu u tjednima
+        safety_stock_factors: Faktori sigurnosnog lagera po XYZ klasi
+        max_qty_factors: Faktori maksimalne količine po ABC klasi
+
+    Returns:
+        Lista dodanih kolona (prazna ako nema mjeseci)
+    """
+    if len(months) == 0:
+        return []
+
+    levels = compute_inventory_levels(
+        final_df[[f'QTY_{month}' for month in months]],
+        final_df['ABC'],
+        final_df['XYZ'],
+        coefficient_variation,
+        lead_time_weeks=lead_time_weeks,
+        safety_stock_factors=safety_stock_factors,
+        max_qty_factors=max_qty_factors
+    )
+    for col in levels.columns:
+        final_df[col] = levels[col]
+
+    return list(INVENTORY_COLUMNS)
+
+
+def summarize(final_df: pd.DataFrame) -> dict:
+    """
+    Izračunava ABC, XYZ i kombinirani ABC-XYZ sažetak (broj artikala, promet i količina po klasi).
+    """
+    # Izračun sažetaka
+    abc_summary = final_df.groupby('ABC').agg({
+        'Total Turnover': 'sum',
+        'Total Qty': 'sum'
+    }).reset_index()
+
+    # Izračun postotaka direktno
+    abc_count_series = final_df.groupby('ABC').size()
+    abc_summary['Item Count'] = abc_count_series.values
+    abc_summary['% of Items'] = abc_summary['Item Count'] / len(final_df) * 100
+    abc_summary['% of Turnover'] = abc_summary['Total Turnover'] / abc_summary['Total Turnover'].sum() * 100
+    abc_summary['% of Quantity'] = abc_summary['Total Qty'] / abc_summary['Total Qty'].sum() * 100
+
+    xyz_summary = final_df.groupby('XYZ').agg({
+        'Total Turnover': 'sum',
+        'Total Qty': 'sum'
+    }).reset_index()
+
+    # Izračun postotaka direktno
+    xyz_count_series = final_df.groupby('XYZ').size()
+    xyz_summary['Item Count'] = xyz_count_series.values
+    xyz_summary['% of Items'] = xyz_summary['Item Count'] / len(final_df) * 100
+    xyz_summary['% of Turnover'] = xyz_summary['Total Turnover'] / xyz_summary['Total Turnover'].sum() * 100
+    xyz_summary['% of Quantity'] = xyz_summary['Total Qty'] / xyz_summary['Total Qty'].sum() * 100
+
+    # Izračun kombiniranog ABC-XYZ sažetka
+    combined_summary = final_df.groupby(['ABC', 'XYZ']).agg({
+        'Total Turnover': 'sum',
+        'Total Qty': 'sum'
+    }).reset_index()
+
+    # Izračun veličina grupa
+    group_sizes = final_df.groupby(['ABC', 'XYZ']).size().reset_index(name='Item Count')
+    combined_summary = combined_summary.merge(group_sizes, on=['ABC', 'XYZ'], how='left')
+
+    # Izračun postotaka nakon spajanja
+    combined_summary['% of Items'] = combined_summary['Item Count'] / len(final_df) * 100
+    combined_summary['% of Turnover'] = combined_summary['Total Turnover'] / combined_summary['Total Turnover'].sum() * 100
+    combined_summary['% of Quantity'] = combined_summary['Total Qty'] / combined_summary['Total Qty'].sum() * 100
+
+    return {'abc': abc_summary, 'xyz': xyz_summary, 'combined': combined_summary}
+
+
+def _combine_results(abc_df, xyz_df, turnover_pivot, qty_pivot, months, item_descriptions, warehouse_zones):
+    # Spajanje ABC i XYZ rezultata u konačnu mjesečnu tablicu i sažetke
+    combined_df = abc_df.set_index('Item')
+    combined_df['Standard Deviation'] = xyz_df['Standard Deviation']
+    combined_df['Coefficient Variation'] = xyz_df['Coefficient Variation']
+    combined_df['XYZ'] = xyz_df['XYZ']
+    combined_df['Name'] = combined_df.index.map(item_descriptions)
+    combined_df['Warehouse zone'] = combined_df.index.map(warehouse_zones)
+    combined_df['Active'] = 'TRUE'  # Pretpostavljamo da su svi artikli aktivni
+
+    # Kreiranje kompletne mjesečne tablice
+    print("Kreiranje konačne mjesečne tablice...")
+    final_df = combined_df.copy()
+
+    # Dodavanje mjesečnih kolona za promet i količinu
+    for month in months:
+        final_df[f'Turnover_{month}'] = turnover_pivot[month]
+        final_df[f'QTY_{month}'] = qty_pivot[month]
+
+    # Preuređivanje kolona prema traženom formatu
+    column_order = ['Name', 'Warehouse zone', 'ABC', 'XYZ', 'Total Turnover', 'Total Qty']
+
+    # Dodavanje mjesečnih kolona u parovima (Turnover i QTY)
+    for month in months:
+        column_order.extend([f'Turnover_{month}', f'QTY_{month}'])
+
+    # Osiguravanje da sve kolone postoje
+    final_columns = [col for col in column_order if col in final_df.columns]
+
+    # Preuređivanje kolona
+    final_df = final_df[final_columns].copy()
+
+    summaries = summarize(final_df)
+
+    return final_df, combined_df, final_columns, summaries
+
+
+def analyze_aggregate(
+    agg: pd.DataFrame,
+    a_threshold: float = ABC_A_THRESHOLD,
+    b_threshold: float = ABC_B_THRESHOLD,
+    x_threshold: float = XYZ_X_THRESHOLD,
+    y_threshold: float = XYZ_Y_THRESHOLD,
+    inventory_params: dict = None,
+    profiler=None
+) -> dict:
+    """
+    Izvodi ABC-XYZ analizu nad agregatom picking podataka.
+
+    Args:
+        agg: Agregat u obliku aggregate_item_months
+        a_threshold: Gornja granica kumulativnog postotka za kategoriju A
+        b_threshold: Gornja granica kumulativnog postotka za kategoriju B
+        x_threshold: Gornja granica koeficijenta varijacije za kategoriju X
+        y_threshold: Gornja granica koeficijenta varijacije za kategoriju Y
+        inventory_params: Dodatni argumenti za add_inventory_levels (vrijeme isporuke, faktori)
+        profiler: StageProfiler za faze 'pivots', 'abc', 'xyz', 'combine' i 'inventory'
+
+    Returns:
+        Rječnik s ključevima:
+            'final_df': konačna tablica po artiklu (indeks je šifra artikla) s
+                kolonama iz 'final_columns' i kolonama zaliha
+            'final_columns': kolone mjesečne tablice za izvještaj
+            'combined_df': ABC i XYZ rezultati sa svim međurezultatima
+                ('Percentage', 'Cumulative %', 'r.n.', 'Coefficient Variation', ...)
+            'turnover_pivot', 'qty_pivot': mjesečne tablice s ukupnim kolonama
+            'months': oznake mjeseci
+            'item_descriptions', 'warehouse_zones': najčešći naziv i zona po artiklu
+            'summaries': rezultat summarize
+            'inventory_columns': kolone min/max količina
+    """
+    profiler = profiler or NO_PROFILER
+
+    # Kreiranje mjesečnih tablica za promet i količinu te najčešćeg opisa i zone po artiklu
+    print("Kreiranje mjesečnih tablica...")
+    with profiler.stage('pivots'):
+        turnover_pivot, qty_pivot, item_descriptions, warehouse_zones = item_month_tables(
+            agg,
+            item_col=ITEM_COL,
+            month_col=MONTH_COL,
+            desc_col=DESC_COL,
+            group_col=GROUP_COL
+        )
+        months = list(turnover_pivot.columns)
+
+        # Izračun ukupno po artiklu
+        turnover_pivot['Total Turnover'] = turnover_pivot.sum(axis=1)
+        qty_pivot['Total Qty'] = qty_pivot.sum(axis=1)
+
+    # Izvođenje ABC analize
+    print("Izvođenje ABC analize...")
+    # Kreiranje dataframe-a s ukupnim prometom, sortiranje i dodjela kategorija
+    with profiler.stage('abc'):
+        abc_df = compute_abc(turnover_pivot['Total Turnover'], qty_pivot['Total Qty'], a_threshold, b_threshold)
+
+    # Izvođenje XYZ analize na temelju koeficijenta varijacije
+    print("Izvođenje XYZ analize...")
+    # Standardna devijacija i koeficijent varijacije za sve artikle odjednom
+    with profiler.stage('xyz'):
+        xyz_df = compute_xyz(turnover_pivot, x_threshold, y_threshold)
+
+    # Kombiniranje ABC i XYZ rezultata
+    print("Kombiniranje ABC i XYZ analiza...")
+    with profiler.stage('combine'):
+        final_df, combined_df, final_columns, summaries = _combine_results(
+            abc_df, xyz_df, turnover_pivot, qty_pivot, months, item_descriptions, warehouse_zones
+        )
+
+    # Izračun min/max količina na temelju ABC-XYZ klasifikacije
+    print("Izračun min/max količina zaliha...")
+    with profiler.stage('inventory'):
+        inventory_columns = add_inventory_levels(
+            final_df, months, combined_df['Coefficient Variation'], **(inventory_params or {})
+        )
+
+    return {
+        'final_df': final_df,
+        'final_columns': final_columns,
+        'combined_df': combined_df,
+        'turnover_pivot': turnover_pivot,
+        'qty_pivot': qty_pivot,
+        'months': months,
+        'item_descriptions': item_descriptions,
+        'warehouse_zones': warehouse_zones,
+        'summaries': summaries,
+        'inventory_columns': inventory_columns
+    }
+
+
+def reclassify_results(
+    results: dict,
+    a_threshold: float = ABC_A_THRESHOLD,
+    b_threshold: float = ABC_B_THRESHOLD,
+    x_threshold: float = XYZ_X_THRESHOLD,
+    y_threshold: float = XYZ_Y_THRESHOLD,
+    inventory_params: dict = None
+) -> dict:
+    """
+    Rezultat analyze_aggregate za iste podatke s drugim granicama i faktorima zaliha.
+
+    Kumulativni postotak, koeficijent varijacije te prosjeci i standardne
+    devijacije količina ne ovise o granicama i faktorima, pa se preuzimaju iz
+    results; ponovno se računaju samo klase, min/max količine i sažeci.
+    Rezultat je jednak pozivu analyze_aggregate s istim parametrima.
+
+    Args:
+        results: Rezultat analyze_aggregate (ne mijenja se)
+        a_threshold, b_threshold, x_threshold, y_threshold, inventory_params: Vidi analyze_aggregate
+
+    Returns:
+        Rječnik istog oblika kao analyze_aggregate
+    """
+    combined_df = results['combined_df'].copy()
+    combined_df['ABC'] = classify_abc(combined_df['Cumulative %'], a_threshold, b_threshold)
+    combined_df['XYZ'] = classify_xyz(combined_df['Coefficient Variation'], x_threshold, y_threshold)
+
+    # Konačna tablica ima iste artikle istim redom kao combined_df
+    final_df = results['final_df'].copy()
+    final_df['ABC'] = combined_df['ABC']
+    final_df['XYZ'] = combined_df['XYZ']
+
+    if results['inventory_columns']:
+        statistics = {col: final_df[col].to_numpy() for col in ('Avg Weekly Qty', 'Weekly Qty StdDev')}
+        levels = levels_from_statistics(statistics, final_df['ABC'], final_df['XYZ'], **(inventory_params or {}))
+        for col, values in levels.items():
+            final_df[col] = values
+
+    return dict(
+        results,
+        final_df=final_df,
+        combined_df=combined_df,
+        summaries=summarize(final_df)
+    )
+
+
+def analyze_aggregate_configs(agg: pd.DataFrame, configs: list, profiler=None) -> list:
+    """
+    Izvodi ABC-XYZ analizu istog agregata za više skupova granica i faktora zaliha.
+
+    Pivot tablice, rang po prometu, koeficijenti varijacije i statistike
+    količina računaju se jednom (za prvi skup), a za ostale skupove samo se
+    ponovno dodjeljuju klase i računaju min/max količine (reclassify_results).
+
+    Args:
+        agg: Agregat u obliku aggregate_item_months
+        configs: Lista rječnika s argumentima za analyze_aggregate (a_threshold, ..., inventory_params)
+        profiler: StageProfiler za faze analize i fazu 'reclassify'
+
+    Returns:
+        Lista rezultata analyze_aggregate redom kao configs
+    """
+    profiler = profiler or NO_PROFILER
+    if not configs:
+        return []
+
+    base = analyze_aggregate(agg, profiler=profiler, **configs[0])
+    batch = [base]
+    for params in configs[1:]:
+        with profiler.stage('reclassify'):
+            batch.append(reclassify_results(base, **params))
+    return batch
+
+
+def config_comparison(batch: list, labels: list) -> pd.DataFrame:
+    """
+    Usporedna tablica rezultata analyze_aggregate_configs: broj artikala po
+    ABC i XYZ klasi te zbroj mjesečnih min/max količina po skupu parametara.
+
+    Args:
+        batch: Rezultati analyze_aggregate_configs
+        labels: Oznake skupova parametara (npr. nazivi konfiguracija), redom kao batch
+    """
+    rows = []
+    for label, results in zip(labels, batch):
+        final_df = results['final_df']
+        row = {'Config': label, 'Items': len(final_df)}
+        for column, classes in (('ABC', 'ABC'), ('XYZ', 'XYZ')):
+            counts = final_df[column].value_counts()
+            row.update({f'{cls} Items': int(counts.get(cls, 0)) for cls in classes})
+        for column in ('Min Qty Monthly', 'Max Qty Monthly'):
+            if column in final_df.columns:
+                row[column] = final_df[column].sum()
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def run_analysis(
+    conn,
+    start_date,
+    end_date,
+    warehouse_zones=None,
+    item_codes=None,
+    chunk_rows=None,
+    pushdown=False,
+    cache_dir=None,
+    daily_aggregate=False,
+    location_zones=None,
+    aggregate_cache_dir=None,
+    output_dir=None,
+    outputs=None,
+    profiler=None,
+    **analysis_params
+) -> dict:
+    """
+    Izvodi cijelu ABC-XYZ analizu u procesu pozivatelja: učitavanje, analiza i
+    (ako je zadan output_dir) izvještaji.
+
+    Args:
+        conn: DBAPI konekcija; ostaje otvorena
+        start_date, end_date, warehouse_zones, item_codes, chunk_rows, pushdown,
+            cache_dir, daily_aggregate, location_zones, aggregate_cache_dir: Vidi
+            load_picking_aggregate
+        output_dir: Direktorij za Excel izvještaje i grafove; bez njega se
+            ništa ne zapisuje na disk
+        outputs: Izlazni formati za write_reports (zadano xlsx i parquet)
+        profiler: StageProfiler koji mjeri faze učitavanja, analize i izvještaja
+        **analysis_params: Pragovi i parametri zaliha za analyze_aggregate
+
+    Returns:
+        Rezultat analyze_aggregate
+    """
+    agg = load_picking_aggregate(
+        conn, start_date, end_date,
+        warehouse_zones=warehouse_zones,
+        item_codes=item_codes,
+        chunk_rows=chunk_rows,
+        pushdown=pushdown,
+        cache_dir=cache_dir,
+        daily_aggregate=daily_aggregate,
+        location_zones=location_zones,
+        aggregate_cache_dir=aggregate_cache_dir,
+        profiler=profiler
+    )
+    results = analyze_aggregate(agg, profiler=profiler, **analysis_params)
+
+    if output_dir:
+        from abc_xyz.report import write_reports
+        write_reports(results, output_dir, outputs, profiler=profiler)
+
+    return results
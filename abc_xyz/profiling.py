@@ -0,0 +1,161 @@
+"""
+Mjerenje trajanja i memorije po fazama ABC-XYZ analize (--profile).
+
+Za svaku imenovanu fazu bilježi se vrijeme izvođenja (wall), procesorsko
+vrijeme (CPU, uključujući završene podprocese poput crtanja grafova) i
+vršna memorija koju prati tracemalloc. Ugniježđena faza (npr. 'charts'
+unutar 'xlsx') oduzima se od vremena vanjske faze, pa zbroj faza odgovara
+ukupnom trajanju; vršna memorija vanjske faze uključuje i ugniježđene.
+"""
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Datoteka profila u direktoriju izvještaja
+PROFILE_FILE = 'profile.json'
+
+
+def _cpu_seconds(per_thread: bool) -> float:
+    if per_thread:
+        return time.thread_time()
+    # Procesorsko vrijeme procesa i podprocesa koji su završili (procesi za grafove)
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+class StageProfiler:
+    """
+    Bilježi trajanje, procesorsko vrijeme i vršnu memoriju po fazama.
+
+    Isključen profiler (enabled=False) ne mjeri ništa, pa se može
+    proslijediti kroz cijelu analizu bez provjera kod pozivatelja.
+
+    Args:
+        enabled: Mjeri li se uopće
+        memory: Prati li se vršna memorija (tracemalloc znatno usporava
+            pisanje Excela, pa se u backendu zadano ne prati)
+        per_thread: Procesorsko vrijeme samo trenutne dretve (backend izvodi
+            više analiza istodobno u dretvama)
+    """
+
+    def __init__(self, enabled: bool = True, memory: bool = True, per_thread: bool = False):
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.per_thread = per_thread
+        self.stages = {}
+        self._stack = []
+        self._started_tracing = False
+
+    def _traced_peak(self) -> int:
+        return tracemalloc.get_traced_memory()[1] if self.memory else 0
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Mjeri blok koda kao fazu name; ponovljena faza zbraja se s prethodnom.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        if self._stack:
+            # Dosadašnji vrh vanjske faze prije nego što ga ugniježđena poništi
+            parent = self._stack[-1]
+            parent['peak'] = max(parent['peak'], self._traced_peak())
+        if self.memory:
+            tracemalloc.reset_peak()
+
+        current = {'peak': 0, 'child_wall': 0.0, 'child_cpu': 0.0}
+        self._stack.append(current)
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds(self.per_thread)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = _cpu_seconds(self.per_thread) - cpu_start
+            peak = max(current['peak'], self._traced_peak())
+            self._stack.pop()
+
+            if self._stack:
+                parent = self._stack[-1]
+                parent['child_wall'] += wall
+                parent['child_cpu'] += cpu
+                parent['peak'] = max(parent['peak'], peak)
+
+            record = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_memory_mb': None})
+            record['wall_seconds'] += wall - current['child_wall']
+            record['cpu_seconds'] += cpu - current['child_cpu']
+            if self.memory:
+                record['peak_memory_mb'] = max(record['peak_memory_mb'] or 0.0, peak / 2**20)
+
+    def stop(self) -> None:
+        """
+        Zaustavlja tracemalloc ako ga je pokrenuo ovaj profiler.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def as_records(self) -> list:
+        """
+        Faze redom izvođenja kao lista rječnika
+        ('stage', 'wall_seconds', 'cpu_seconds', 'peak_memory_mb').
+        """
+        return [
+            {
+                'stage': name,
+                'wall_seconds': round(record['wall_seconds'], 4),
+                'cpu_seconds': round(record['cpu_seconds'], 4),
+                'peak_memory_mb': None if record['peak_memory_mb'] is None else round(record['peak_memory_mb'], 2)
+            }
+            for name, record in self.stages.items()
+        ]
+
+    def as_dict(self) -> dict:
+        """
+        Profil s fazama i ukupnim vremenima (oblik datoteke PROFILE_FILE).
+        """
+        records = self.as_records()
+        return {
+            'stages': records,
+            'total_wall_seconds': round(sum(record['wall_seconds'] for record in records), 4),
+            'total_cpu_seconds': round(sum(record['cpu_seconds'] for record in records), 4)
+        }
+
+    def summary_line(self) -> str:
+        """
+        Sažetak u jednom retku: faza vrijeme/CPU[/vršna memorija] za sve faze.
+        """
+        def stage_text(record):
+            text = f"{record['stage']} {record['wall_seconds']:.2f}/{record['cpu_seconds']:.2f}s"
+            if record['peak_memory_mb'] is not None:
+                text += f" {record['peak_memory_mb']:.0f}MB"
+            return text
+
+        profile = self.as_dict()
+        stages = ' | '.join(stage_text(record) for record in profile['stages'])
+        return (f"Profil (vrijeme/CPU, vršna memorija): {stages} | "
+                f"ukupno {profile['total_wall_seconds']:.2f}/{profile['total_cpu_seconds']:.2f}s")
+
+    def write_json(self, output_dir: str, file_name: str = PROFILE_FILE) -> str:
+        """
+        Sprema profil kao JSON u output_dir.
+
+        Returns:
+            Putanja spremljene datoteke
+        """
+        path = os.path.join(output_dir, file_name)
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.as_dict(), fh, indent=2)
+        return path
+
+
+# Zamjena za nezadani profiler: faze se ne mjere
+NO_PROFILER = StageProfiler(enabled=False)
@@ -0,0 +1,438 @@
+import os
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from abc_xyz.artifact import write_results_artifact, write_results_csv, write_results_json
+from abc_xyz.charts import CHART_FILES, write_charts
+from abc_xyz.engine import compute_zone_abc
+from abc_xyz.profiling import NO_PROFILER
+
+# Izlazni formati: formatirani Excel izvještaji s grafovima i rezultat za programsko čitanje
+OUTPUT_FORMATS = ['xlsx', 'parquet', 'csv', 'json']
+DEFAULT_OUTPUTS = ['xlsx', 'parquet']
+
+# Broj redaka koji se odjednom pretvara za upis u Excel
+WRITE_BATCH_ROWS = 2000
+
+# Predložena lokacija A artikala na temelju XYZ klase
+PICK_FACE_SUGGESTIONS = {
+    'X': 'Primary pick face, ground level',
+    'Y': 'Primary pick face, middle level'
+}
+
+
+def _report_formats(workbook) -> dict:
+    # Formati se kreiraju jednom po radnoj knjizi i dijele među listovima
+    return {
+        'header': workbook.add_format({
+            'bold': True,
+            'text_wrap': True,
+            'valign': 'top',
+            'bg_color': '#D9E1F2',
+            'border': 1
+        }),
+        'title': workbook.add_format({'bold': True, 'font_size': 14}),
+        'bold': workbook.add_format({'bold': True}),
+        # Formatiranje boja za ABC kategorije
+        'A': workbook.add_format({'bg_color': '#90EE90'}),  # Svijetlo zelena
+        'B': workbook.add_format({'bg_color': '#FFFFE0'}),  # Svijetlo žuta
+        'C': workbook.add_format({'bg_color': '#FFC0CB'})   # Svijetlo ružičasta
+    }
+
+
+def _abc_conditional_format(worksheet, first_row, last_row, col, formats: dict) -> None:
+    # Boja ćelije prema ABC kategoriji
+    for category in 'ABC':
+        worksheet.conditional_format(first_row, col, last_row, col,
+                                     {'type': 'cell',
+                                      'criteria': '==',
+                                      'value': f'"{category}"',
+                                      'format': formats[category]})
+
+
+def write_frame_rows(
+    worksheet,
+    first_row: int,
+    frame: pd.DataFrame,
+    columns: list = None,
+    index: bool = False,
+    positions: np.ndarray = None,
+    batch_rows: int = WRITE_BATCH_ROWS
+) -> int:
+    """
+    Upisuje retke DataFrame-a u radni list redom, po paketima redaka.
+
+    Svaki paket pretvara se u NumPy polje objekata i upisuje s write_row, pa
+    odgovara constant_memory načinu rada xlsxwritera (reci strogo rastućim
+    redom) i u memoriji nikad nema više od jednog paketa. Prazne vrijednosti
+    ostaju prazne ćelije, kao kod to_excel.
+
+    Args:
+        worksheet: xlsxwriter radni list
+        first_row: Redak prvog upisanog retka podataka
+        frame: Podaci
+        columns: Kolone za upis (zadano sve)
+        index: Upisati indeks kao prvu kolonu
+        positions: Redoslijed redaka kao pozicije u frame (zadano postojeći)
+        batch_rows: Broj redaka po paketu
+
+    Returns:
+        Broj upisanih redaka
+    """
+    columns = list(frame.columns) if columns is None else columns
+    n_rows = len(frame) if positions is None else len(positions)
+
+    for start in range(0, n_rows, batch_rows):
+        rows = slice(start, start + batch_rows) if positions is None else positions[start:start + batch_rows]
+        part = frame.iloc[rows][columns]
+        values = part.to_numpy(dtype=object)
+        if index:
+            values = np.column_stack([part.index.to_numpy(dtype=object), values])
+        values[pd.isna(values)] = None
+
+        for offset, row in enumerate(values.tolist()):
+            worksheet.write_row(first_row + start + offset, 0, row)
+
+    return n_rows
+
+
+def write_excel_report(results: dict, output_dir: str, profiler=None) -> str:
+    """
+    Sprema glavni Excel izvještaj abc_xyz_monthly_breakdown.xlsx s mjesečnom tablicom,
+    grafovima, preporukama i planom zaliha.
+
+    Radna knjiga piše se u constant_memory načinu: svaki list upisuje se redak po
+    redak i odmah sprema na disk, pa potrošnja memorije ne raste s brojem artikala.
+
+    Args:
+        results: Rezultat abc_xyz.pipeline.analyze_aggregate
+        output_dir: Direktorij za izvještaj i grafove
+        profiler: StageProfiler za fazu 'charts'
+
+    Returns:
+        Putanja spremljene Excel datoteke
+    """
+    profiler = profiler or NO_PROFILER
+    final_df = results['final_df']
+    final_columns = results['final_columns']
+    turnover_pivot = results['turnover_pivot']
+
+    final_file = os.path.join(output_dir, 'abc_xyz_monthly_breakdown.xlsx')
+    
+    # Radna knjiga s upisom redak po redak
+    workbook = xlsxwriter.Workbook(final_file, {'constant_memory': True, 'nan_inf_to_errors': True})
+    formats = _report_formats(workbook)
+    
+    # Pisanje zaglavlja i podataka u Excel
+    worksheet = workbook.add_worksheet('Monthly Breakdown')
+    worksheet.write(0, 0, 'Item', formats['header'])
+    worksheet.write_row(0, 1, final_columns, formats['header'])
+    write_frame_rows(worksheet, 1, final_df, final_columns, index=True)
+    
+    # Primjena uvjetnog formatiranja za ABC kolonu
+    _abc_conditional_format(worksheet, 1, len(final_df) + 1, final_columns.index('ABC') + 1, formats)
+
+    # Kreiranje vizualizacijskih listova
+    with profiler.stage('charts'):
+        image_files = write_charts(final_df, turnover_pivot, results['item_descriptions'], output_dir)
+
+    # Dodavanje slika u Excel radnu knjigu
+    worksheet = workbook.add_worksheet('Visualizations')
+
+    # Dodavanje slika u radni list
+    for i, image_file in enumerate(image_files):
+        worksheet.insert_image(i*25, 1, image_file, {'x_scale': 0.7, 'y_scale': 0.7})
+        worksheet.write(i*25 + 22, 1, f"Figure {i+1}: {os.path.basename(image_file).replace('.png', '')}")
+
+    # Kreiranje dodatnog radnog lista s uvidima
+    worksheet = workbook.add_worksheet('Analiza & Preporuka')
+
+    # Pisanje zaglavlja sekcija i preporuka
+    worksheet.write(0, 0, 'ABC-XYZ analiza: uvid u podatke i preporuke', formats['title'])
+
+    # Preporuke za artikle kategorije A
+    worksheet.write(2, 0, 'Artikli kategorije A', formats['bold'])
+    worksheet.write(3, 0, 'Ovi artikli čine približno 80% vašeg prometa. Preporuke:')
+    worksheet.write(4, 0, '1. Osigurajte visoku dostupnost i minimizirajte nestašice zaliha')
+    worksheet.write(5, 0, '2. Postavite ih na komisione lokacije za slaganje (u visini očiju, blizu izlaznih zona)')
+    worksheet.write(6, 0, '3. Razmislite o posebnim zonama za komisioniranje ovih artikala')
+    worksheet.write(7, 0, '4. Provodite redovne inventure i redovite provjere zalihe')
+
+    # Preporuke za artikle kategorije B
+    worksheet.write(9, 0, 'Artikli kategorije B', formats['bold'])
+    worksheet.write(10, 0, 'Ovi artikli čine približno 15% vašeg prometa. Preporuke:')
+    worksheet.write(11, 0, '1. Održavajte umjerene razine zaliha')
+    worksheet.write(12, 0, '2. Postavite ih na sekundarne lokacije s razumnim pristupom')
+    worksheet.write(13, 0, '3. Primjenjujte standardne postupke kontrole zaliha')
+
+    # Preporuke za artikle kategorije C
+    worksheet.write(15, 0, 'Artikli kategorije C', formats['bold'])
+    worksheet.write(16, 0, 'Ovi artikli čine približno 5% vašeg prometa. Preporuke:')
+    worksheet.write(17, 0, '1. Smanjite ulaganje u zalihe')
+    worksheet.write(18, 0, '2. Razmotrite rjeđe narudžbe s većim količinama')
+    worksheet.write(19, 0, '3. Skladištite ih na udaljenim lokacijama')
+    worksheet.write(20, 0, '4. Procijenite spore artikle za moguće uklanjanje')
+
+    # Preporuke za XYZ klasifikaciju
+    worksheet.write(22, 0, 'Preporuke za XYZ klasifikaciju', formats['bold'])
+    worksheet.write(23, 0, 'X artikli: Linearna izlaznost - Pogodni za automatizirane sustave nadopune')
+    worksheet.write(24, 0, 'Y artikli: Umjerene fluktuacije - Potreban sigurnosni lager i pažljivo planiranje')
+    worksheet.write(25, 0, 'Z artikli: Neredovita izlaznost - Razmotriti posebnu obradu, ručni pregled narudžbi')
+
+    # Kombinirana ABC-XYZ strategija
+    worksheet.write(27, 0, 'Kombinirana ABC-XYZ strategija', formats['bold'])
+    worksheet.write(28, 0, 'AX: Visoka vrijednost, stabilna potražnja - Fokus na efikasnost, JIT isporuka, premium lokacije')
+    worksheet.write(29, 0, 'AY/AZ: Visoka vrijednost, promjenjiva potražnja - Blisko praćenje, sigurnosni lager, redoviti pregledi')
+    worksheet.write(30, 0, 'BX: Srednja vrijednost, stabilna potražnja - Standardni procesi, umjerene razine zaliha')
+    worksheet.write(31, 0, 'CZ: Niska vrijednost, neredovita potražnja - Minimalna pažnja, razmotriti vanjsko skladištenje ili nabavu na veliko')
+
+    # Kreiranje prilagođenih skladišnih izvještaja
+    worksheet = workbook.add_worksheet('Warehouse Optimization')
+    worksheet.write(0, 0, 'Warehouse Optimization Suggestions', formats['title'])
+
+    # A artikli u skladištu
+    worksheet.write(2, 0, 'Top A Items for Prime Locations', formats['bold'])
+    worksheet.write_row(3, 0, ['Item', 'Description', 'Total Turnover', 'XYZ Class', 'Suggested Location'])
+
+    # Predložena lokacija na temelju XYZ klase
+    top_a_items = final_df.loc[final_df['ABC'] == 'A', ['Name', 'Total Turnover', 'XYZ']].sort_values(
+        'Total Turnover', ascending=False
+    ).head(20)
+    top_a_items['Suggested Location'] = top_a_items['XYZ'].map(PICK_FACE_SUGGESTIONS).fillna(
+        'Primary pick face, with buffer stock'
+    )
+    write_frame_rows(worksheet, 4, top_a_items, index=True)
+
+    # Dodatni izvještaji za uvide
+    # Mjesečni obrasci prodaje
+    worksheet.write(30, 0, 'Monthly Sales Patterns (A Items)', formats['bold'])
+    month_columns = [col for col in turnover_pivot.columns if col != 'Total Turnover']
+    worksheet.write(31, 0, 'Month')
+    worksheet.write_row(31, 1, month_columns)
+    worksheet.write(32, 0, 'Total Turnover')
+    worksheet.write_row(32, 1, turnover_pivot[month_columns].sum().tolist())
+
+    if results['inventory_columns']:
+        # Kreiranje zasebnog radnog lista za upravljanje zalihama
+        inventory_worksheet = workbook.add_worksheet('Inventory Management')
+        inventory_worksheet.write(0, 0, 'Inventory Planning Based on ABC-XYZ Analysis', formats['title'])
+    
+        # Pisanje zaglavlja
+        headers = ['Item', 'Description', 'ABC', 'XYZ', 'Avg Weekly Qty', 
+                   'Min Qty Weekly', 'Max Qty Weekly', 'Avg Monthly Qty', 
+                   'Min Qty Monthly', 'Max Qty Monthly']
+        inventory_worksheet.write_row(2, 0, headers, formats['header'])
+    
+        # Sortiranje artikala po ABC, zatim XYZ (sortiraju se samo pozicije redaka)
+        order = final_df[['ABC', 'XYZ']].reset_index(drop=True).sort_values(['ABC', 'XYZ']).index.to_numpy()
+    
+        # Pisanje podataka
+        n_rows = write_frame_rows(
+            inventory_worksheet, 3, final_df, ['Name'] + headers[2:], index=True, positions=order
+        )
+    
+        # Zamrzavanje retka zaglavlja
+        inventory_worksheet.freeze_panes(3, 0)
+    
+        # Dodavanje uvjetnog formatiranja
+        for col in range(2, 4):  # ABC i XYZ kolone
+            _abc_conditional_format(inventory_worksheet, 3, 2 + n_rows, col, formats)
+
+    # Spremanje Excel datoteke
+    workbook.close()
+
+    return final_file
+
+
+def write_attention_report(final_df: pd.DataFrame, output_dir: str):
+    """
+    Sprema zasebni izvještaj za artikle koji trebaju pažnju (AZ kategorija).
+
+    Returns:
+        Putanja spremljene datoteke ili None ako takvih artikala nema
+    """
+    attention_items = final_df[(final_df['ABC'] == 'A') & (final_df['XYZ'] == 'Z')]
+    if attention_items.empty:
+        return None
+
+    attention_file = os.path.join(output_dir, 'items_needing_attention.xlsx')
+    attention_items.to_excel(attention_file, index=True)
+    return attention_file
+
+
+def zone_report_tables(final_df: pd.DataFrame, min_items: int = 5) -> tuple:
+    """
+    Tablice izvještaja ABC po zonama iz jednog izračuna compute_zone_abc.
+
+    Args:
+        final_df: Konačna tablica analize
+        min_items: Najmanji broj artikala zone za zaseban list i usporedbu
+
+    Returns:
+        (sažetak zona sortiran po prometu, ABC po zonama za zone s barem
+        min_items artikala, usporedba globalne i zonske ABC kategorije)
+    """
+    zone_col = 'Warehouse zone'
+    zone_abc = compute_zone_abc(final_df, zone_col)
+    zone_abc = zone_abc.join(final_df[['Name', 'ABC', 'XYZ', 'Total Qty']])
+    zone_abc.index.name = 'Item'
+
+    # Sažetak svih zona: broj artikala i udio po ABC kategoriji te ukupni promet
+    grouped = zone_abc.groupby(zone_col, observed=True)
+    zone_sizes = grouped.size()
+    abc_counts = pd.crosstab(zone_abc[zone_col], zone_abc['ABC']).reindex(
+        index=zone_sizes.index, columns=['A', 'B', 'C'], fill_value=0
+    )
+
+    zone_summary_df = pd.DataFrame({'Zone': zone_sizes.index, 'Item Count': zone_sizes.to_numpy()})
+    for abc_cat in ['A', 'B', 'C']:
+        zone_summary_df[f'{abc_cat} Items'] = abc_counts[abc_cat].to_numpy()
+        zone_summary_df[f'{abc_cat} %'] = zone_summary_df[f'{abc_cat} Items'] / zone_summary_df['Item Count'] * 100
+    zone_summary_df['Total Turnover'] = grouped['Total Turnover'].sum().to_numpy()
+
+    # Sortiranje po ukupnom prometu
+    zone_summary_df = zone_summary_df.sort_values('Total Turnover', ascending=False)
+
+    # Zone s premalo artikala nemaju zaseban list ni usporedbu
+    zone_abc = zone_abc[zone_abc[zone_col].map(zone_sizes).to_numpy() >= min_items]
+
+    # Usporedba globalne ABC kategorije i ABC kategorije po zoni
+    comparison_df = zone_abc.groupby([zone_col, 'ABC', 'Zone ABC'], observed=True).size().reset_index(name='Item Count')
+    comparison_df = comparison_df.rename(columns={zone_col: 'Zone', 'ABC': 'Global ABC'})
+    comparison_df['Percentage'] = comparison_df['Item Count'] / comparison_df['Zone'].map(zone_sizes).to_numpy() * 100
+
+    return zone_summary_df, zone_abc, comparison_df
+
+
+def write_zone_report(final_df: pd.DataFrame, output_dir: str) -> str:
+    """
+    Sprema izvještaj abc_by_zone.xlsx s ABC analizom unutar svake zone skladišta.
+
+    Sažetak zona, listovi po zonama i usporedba globalne i zonske ABC
+    kategorije izvode se iz jednog izračuna (zone_report_tables).
+
+    Returns:
+        Putanja spremljene Excel datoteke
+    """
+    # Dodatna analiza - ABC po zonama skladišta
+    print("Izvođenje ABC analize po zonama skladišta...")
+    zone_summary_df, zone_abc, comparison_df = zone_report_tables(final_df)
+    print(f"Pronađeno {len(zone_summary_df)} jedinstvenih zona skladišta.")
+
+    small_zones = zone_summary_df[zone_summary_df['Item Count'] < 5]
+    for zone, item_count in zip(small_zones['Zone'], small_zones['Item Count']):
+        print(f"Preskačem zonu {zone} jer ima samo {item_count} artikala.")
+
+    # Kreiranje novog Excel izvještaja za ABC po zonama
+    zones_file = os.path.join(output_dir, 'abc_by_zone.xlsx')
+    zones_writer = pd.ExcelWriter(zones_file, engine='xlsxwriter')
+    zone_summary_df.to_excel(zones_writer, sheet_name='Zone Summary', index=False)
+
+    # Dobivanje workbook objekta i formata
+    formats = _report_formats(zones_writer.book)
+
+    # Odabir kolona za listove po zonama
+    zone_columns = ['Item', 'Name', 'ABC', 'Zone ABC', 'XYZ', 'Total Turnover', 'Total Qty',
+                    'Zone Percentage', 'Zone Cumulative %', 'Zone Rank']
+    abc_col = zone_columns.index('ABC')
+    zone_abc_col = zone_columns.index('Zone ABC')
+
+    for zone, zone_df in zone_abc.groupby('Warehouse zone', sort=False, observed=True):
+        print(f"Analiziram zonu: {zone} ({len(zone_df)} artikala)")
+
+        # Spremanje u Excel
+        sheet_name = f'Zone_{zone[:30]}'
+        zone_df.reset_index()[zone_columns].to_excel(zones_writer, sheet_name=sheet_name, index=False)
+        worksheet = zones_writer.sheets[sheet_name]
+
+        # Primjena formatiranja zaglavlja i uvjetnog formatiranja za ABC i Zone ABC kolone
+        worksheet.write_row(0, 0, zone_columns, formats['header'])
+        _abc_conditional_format(worksheet, 1, len(zone_df) + 1, abc_col, formats)
+        _abc_conditional_format(worksheet, 1, len(zone_df) + 1, zone_abc_col, formats)
+
+    # Spremanje u Excel
+    if not comparison_df.empty:
+        comparison_df.to_excel(zones_writer, sheet_name='ABC Comparison', index=False)
+
+    # Spremanje Excel datoteke
+    zones_writer.close()
+
+    return zones_file
+
+
+def parse_outputs(value) -> list:
+    """
+    Pretvara popis izlaznih formata odvojenih zarezom (npr. 'parquet,json') u listu.
+
+    Raises:
+        ValueError: Ako je popis prazan ili sadrži nepoznati format
+    """
+    outputs = [name.strip().lower() for name in value.split(',') if name.strip()]
+    unknown = [name for name in outputs if name not in OUTPUT_FORMATS]
+    if unknown:
+        raise ValueError(f"Nepoznati izlazni format: {', '.join(unknown)} (dostupni: {', '.join(OUTPUT_FORMATS)})")
+    if not outputs:
+        raise ValueError(f"Nije zadan nijedan izlazni format (dostupni: {', '.join(OUTPUT_FORMATS)})")
+    return list(dict.fromkeys(outputs))
+
+
+def write_reports(results: dict, output_dir: str, outputs: list = None, profiler=None) -> None:
+    """
+    Sprema izvještaje analize u output_dir u odabranim formatima.
+
+    'xlsx' su glavni izvještaj s grafovima, AZ artikli i ABC po zonama;
+    'parquet', 'csv' i 'json' su ista tablica rezultata po artiklu za druge
+    programe. Bez 'xlsx' se ne crtaju grafovi ni ne pišu Excel datoteke.
+
+    Greška pri izradi izvještaja po zonama ispisuje se i ne prekida ostale izvještaje.
+
+    Args:
+        results: Rezultat abc_xyz.pipeline.analyze_aggregate
+        output_dir: Direktorij za izvještaje
+        outputs: Izlazni formati iz OUTPUT_FORMATS (zadano DEFAULT_OUTPUTS)
+        profiler: StageProfiler; svaki format i izvještaj mjeri se kao zasebna faza
+    """
+    outputs = DEFAULT_OUTPUTS if outputs is None else outputs
+    profiler = profiler or NO_PROFILER
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Spremanje rezultata
+    print("Spremanje rezultata...")
+    if 'xlsx' in outputs:
+        with profiler.stage('xlsx'):
+            final_file = write_excel_report(results, output_dir, profiler)
+
+        print(f"Analiza završena! Rezultati spremljeni u {final_file}")
+        print("Dodatne analize koje bi mogle biti korisne:")
+        print("1. Sezonska analiza za identifikaciju vršnih perioda")
+        print("2. Analiza performansi dobavljača za optimizaciju naručivanja")
+        print("3. Analiza korelacije artikala za optimizaciju rasporeda skladišta")
+        print("4. Analiza točnosti predviđanja za poboljšanje planiranja zaliha")
+
+    # Rezultat za programsko čitanje (bez parsiranja Excela)
+    writers = {'parquet': write_results_artifact, 'csv': write_results_csv, 'json': write_results_json}
+    for name, writer in writers.items():
+        if name in outputs:
+            with profiler.stage(name):
+                results_file = writer(results, output_dir)
+            print(f"Rezultati za programsko čitanje spremljeni u {results_file}")
+
+    if 'xlsx' not in outputs:
+        return
+
+    # Kreiranje zasebnog izvještaja za artikle koji trebaju pažnju
+    with profiler.stage('attention'):
+        attention_file = write_attention_report(results['final_df'], output_dir)
+    if attention_file:
+        print(f"Artikli koji trebaju posebnu pažnju (AZ kategorija) spremljeni u {attention_file}")
+
+    try:
+        with profiler.stage('zones'):
+            zones_file = write_zone_report(results['final_df'], output_dir)
+        print(f"ABC analiza po zonama spremljena u {zones_file}")
+    except Exception as e:
+        print(f"Greška pri kreiranju ABC analize po zonama: {str(e)}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,164 @@
+import sqlite3
+
+import pandas as pd
+
+from abc_xyz.aggregation import DATE_COL, DESC_COL, GROUP_COL, ITEM_COL, QTY_COL
+
+# Kolone view-a v_pickingStorageSystem i odgovarajući nazivi iz ABC_XYZ.py upita
+PICKING_VIEW_COLUMNS = {
+    'OrderCode': 'Broj naloga',
+    'OrderInputDate': 'Datum_naloga',
+    'DeliveryType': 'Vrsta isporuke',
+    'TaskCode': 'Broj taska',
+    'ListCode': 'Picking list',
+    'TaskCreateTime': 'datum taska',
+    'PickDateTime': DATE_COL,
+    'FromLocationCode': 'Lokacija',
+    'Storage_system': GROUP_COL,
+    'ItemCode': ITEM_COL,
+    'ItemName': DESC_COL,
+    'Qty': QTY_COL,
+    'UserName': 'Korisnik',
+    'Customer': 'Kupac',
+    'Receiver': 'Primatelj',
+    'LogID': 'LogID'
+}
+
+
+def _year(value):
+    return None if value is None else int(str(value)[0:4])
+
+
+def _month(value):
+    return None if value is None else int(str(value)[5:7])
+
+
+def _day(value):
+    return None if value is None else int(str(value)[8:10])
+
+
+def connect_standin(path: str = ':memory:') -> sqlite3.Connection:
+    """
+    Otvara SQLite bazu koja glumi Reports bazu na SQL Serveru za lokalno testiranje.
+
+    Baza je priključena pod imenom 'dbo' pa upiti s [dbo].[...] rade bez izmjena,
+    a registrirane su i funkcije YEAR(), MONTH() i DAY() iz T-SQL-a.
+    """
+    conn = sqlite3.connect(':memory:')
+    conn.execute("ATTACH DATABASE ? AS dbo", (path,))
+    conn.create_function('YEAR', 1, _year, deterministic=True)
+    conn.create_function('MONTH', 1, _month, deterministic=True)
+    conn.create_function('DAY', 1, _day, deterministic=True)
+    return conn
+
+
+def load_picking_view(conn: sqlite3.Connection, picks: pd.DataFrame) -> None:
+    """
+    Puni tablicu dbo.v_pickingStorageSystem picking podacima.
+
+    Ako podaci nemaju kolonu 'LogID', redovi dobivaju rastuće LogID vrijednosti
+    nastavno na najveću postojeću, kao identity kolona u tablici Picking.
+
+    Tablica Picking je ovdje view nad istim recima bez kolone zone, pa upiti
+    nad tablicom (vodeni žigovi) rade i bez load_picking_tables.
+
+    Args:
+        conn: Konekcija iz connect_standin
+        picks: Picking podaci s nazivima kolona iz ABC_XYZ.py upita ('Artikl', 'Zona', ...)
+    """
+    view = pd.DataFrame({
+        source: picks[alias] if alias in picks.columns else None
+        for source, alias in PICKING_VIEW_COLUMNS.items()
+    })
+    view['PickDateTime'] = pd.to_datetime(view['PickDateTime']).dt.strftime('%Y-%m-%d %H:%M:%S')
+    # Ostali datumi (nalog, task) spremaju se kao tekst, kao i vrijeme pika
+    for col in view.columns[[pd.api.types.is_datetime64_any_dtype(dtype) for dtype in view.dtypes]]:
+        view[col] = view[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    # pandas.to_sql ne podržava shemu na sqlite3 konekciji pa se tablica puni izravno
+    columns = ', '.join(PICKING_VIEW_COLUMNS)
+    placeholders = ', '.join(['?'] * len(PICKING_VIEW_COLUMNS))
+    conn.execute(f"CREATE TABLE IF NOT EXISTS dbo.v_pickingStorageSystem ({columns})")
+    picking_columns = ', '.join(source for source in PICKING_VIEW_COLUMNS if source != 'Storage_system')
+    conn.execute(
+        f"CREATE VIEW IF NOT EXISTS dbo.Picking AS SELECT {picking_columns} FROM v_pickingStorageSystem"
+    )
+
+    if 'LogID' not in picks.columns:
+        last_log_id = conn.execute("SELECT COALESCE(MAX(LogID), 0) FROM dbo.v_pickingStorageSystem").fetchone()[0]
+        view['LogID'] = range(last_log_id + 1, last_log_id + 1 + len(view))
+
+    conn.executemany(
+        f"INSERT INTO dbo.v_pickingStorageSystem ({columns}) VALUES ({placeholders})",
+        view.astype(object).where(view.notna(), None).itertuples(index=False, name=None)
+    )
+    conn.commit()
+
+
+def create_picking_daily_table(conn: sqlite3.Connection) -> None:
+    """
+    Kreira tablicu dbo.PickingDaily (dnevni agregat) kao u create_picking_daily.sql.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dbo.PickingDaily (
+            PickDate DATE NOT NULL,
+            ItemCode TEXT NOT NULL,
+            ItemName TEXT,
+            Storage_system TEXT,
+            PickCount INTEGER NOT NULL,
+            QtyCount INTEGER NOT NULL,
+            QtySum REAL
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS dbo.IX_PickingDaily_Date_Item_Zone "
+        "ON PickingDaily (PickDate, ItemCode, Storage_system)"
+    )
+    conn.commit()
+
+
+def load_picking_tables(conn: sqlite3.Connection, picks: pd.DataFrame, locations: pd.DataFrame) -> None:
+    """
+    Puni tablice dbo.Picking i dbo.Locations i kreira view dbo.v_pickingStorageSystem.
+
+    View dohvaća zonu koreliranim podupitom po retku s usporedbom bez razlike
+    velikih i malih slova, kao COLLATE DATABASE_DEFAULT u view-u na SQL Serveru
+    (spoj s v_SystemStorage preko linked servera ovdje se ne oponaša).
+
+    Args:
+        conn: Konekcija iz connect_standin
+        picks: Picking podaci s nazivima kolona iz ABC_XYZ.py upita ('Artikl', 'Lokacija', ...)
+        locations: Tablica lokacija s kolonama 'Code' i 'Storage_system'
+    """
+    picking_columns = {source: alias for source, alias in PICKING_VIEW_COLUMNS.items() if source != 'Storage_system'}
+    picking = pd.DataFrame({
+        source: picks[alias] if alias in picks.columns else None
+        for source, alias in picking_columns.items()
+    })
+    picking['PickDateTime'] = pd.to_datetime(picking['PickDateTime']).dt.strftime('%Y-%m-%d %H:%M:%S')
+    if 'LogID' not in picks.columns:
+        picking['LogID'] = range(1, len(picking) + 1)
+
+    columns = ', '.join(picking_columns)
+    conn.execute(f"CREATE TABLE dbo.Picking (ID INTEGER PRIMARY KEY, {columns})")
+    conn.execute("CREATE TABLE dbo.Locations (Code TEXT PRIMARY KEY, Storage_system TEXT)")
+    conn.executemany(
+        f"INSERT INTO dbo.Picking ({columns}) VALUES ({', '.join(['?'] * len(picking_columns))})",
+        picking.astype(object).where(picking.notna(), None).itertuples(index=False, name=None)
+    )
+    conn.executemany(
+        "INSERT INTO dbo.Locations (Code, Storage_system) VALUES (?, ?)",
+        locations[['Code', 'Storage_system']].astype(object).itertuples(index=False, name=None)
+    )
+
+    view_columns = ', '.join(f"p.{source}" for source in picking_columns)
+    conn.execute(f"""
+        CREATE VIEW dbo.v_pickingStorageSystem AS
+        SELECT
+            {view_columns},
+            (SELECT Storage_system FROM Locations
+             WHERE Code COLLATE NOCASE = p.FromLocationCode
+             LIMIT 1) AS Storage_system
+        FROM Picking p
+    """)
+    conn.commit()
@@ -0,0 +1,183 @@
+"""
+"Što ako" reklasifikacija spremljenog rezultata analize.
+
+ABC klasa ovisi samo o kumulativnom postotku prometa, a XYZ klasa samo o
+koeficijentu varijacije, pa se za nove granice ne moraju ponovno čitati
+pikovi ni računati pivot tablice. Statistike količina za min/max (prosjeci i
+standardne devijacije) računaju se jednom po rezultatu, a svaka nova
+kombinacija granica i faktora zatim je samo nekoliko vektorskih operacija.
+"""
+import numpy as np
+import pandas as pd
+
+from abc_xyz.artifact import monthly_columns
+from abc_xyz.engine import ABC_A_THRESHOLD, ABC_B_THRESHOLD, XYZ_X_THRESHOLD, XYZ_Y_THRESHOLD, classify_abc, classify_xyz
+from abc_xyz.inventory import levels_from_statistics, qty_statistics
+
+# Kolone tablice rezultata potrebne za reklasifikaciju (uz mjesečne kolone 'QTY_<mjesec>')
+WHATIF_COLUMNS = ['Item', 'ABC', 'XYZ', 'Total Turnover', 'Cumulative %', 'Coefficient Variation']
+
+
+def _class_counts(classes: np.ndarray, labels: list) -> dict:
+    counts = pd.Series(classes).value_counts()
+    return {label: int(counts.get(label, 0)) for label in labels}
+
+
+class Reclassifier:
+    """
+    Ponovna ABC-XYZ klasifikacija i min/max količine za nove granice i faktore
+    nad tablicom rezultata (abc_xyz.artifact.results_table ili ista tablica iz baze).
+
+    Rezultat je jednak ponovnoj analizi istih podataka s novim parametrima,
+    jer se kumulativni postotak i koeficijent varijacije ne mijenjaju.
+
+    Args:
+        table: Tablica rezultata s kolonama WHATIF_COLUMNS, 'QTY_<mjesec>' i,
+            ako postoje, spremljenim 'Min Qty Monthly' i 'Max Qty Monthly'
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        self.items = table['Item'].to_numpy()
+        self.abc = table['ABC'].to_numpy(dtype=object)
+        self.xyz = table['XYZ'].to_numpy(dtype=object)
+        self.total_turnover = table['Total Turnover'].to_numpy(dtype=np.float64)
+        self.cumulative = table['Cumulative %'].to_numpy(dtype=np.float64)
+        self.coef_var = table['Coefficient Variation'].to_numpy(dtype=np.float64)
+
+        # Statistike količina ne ovise o klasama, pa se računaju samo jednom
+        qty_columns = [col for col in monthly_columns(table) if col.startswith('QTY_')]
+        self.has_inventory = len(qty_columns) > 0
+        self.statistics = qty_statistics(
+            table[qty_columns].fillna(0).reset_index(drop=True),
+            pd.Series(self.coef_var)
+        ) if self.has_inventory else {}
+
+        def stored(col):
+            if col in table.columns:
+                return table[col].to_numpy(dtype=np.float64)
+            return np.full(len(table), np.nan)
+
+        self.min_qty = stored('Min Qty Monthly')
+        self.max_qty = stored('Max Qty Monthly')
+        self.abc_counts = _class_counts(self.abc, ['A', 'B', 'C'])
+        self.xyz_counts = _class_counts(self.xyz, ['X', 'Y', 'Z'])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def reclassify(
+        self,
+        a_threshold: float = ABC_A_THRESHOLD,
+        b_threshold: float = ABC_B_THRESHOLD,
+        x_threshold: float = XYZ_X_THRESHOLD,
+        y_threshold: float = XYZ_Y_THRESHOLD,
+        inventory_params: dict = None
+    ) -> dict:
+        """
+        Klase i mjesečne min/max količine za nove granice i faktore.
+
+        Args:
+            a_threshold: Gornja granica kumulativnog postotka za kategoriju A
+            b_threshold: Gornja granica kumulativnog postotka za kategoriju B
+            x_threshold: Gornja granica koeficijenta varijacije za kategoriju X
+            y_threshold: Gornja granica koeficijenta varijacije za kategoriju Y
+            inventory_params: Vrijeme isporuke i faktori (kao za add_inventory_levels)
+
+        Returns:
+            Rječnik polja 'abc', 'xyz', 'min_qty' i 'max_qty' redom artikala iz tablice
+
+        Raises:
+            ValueError: Ako je granica A veća od granice B ili granica X veća od granice Y
+        """
+        if a_threshold > b_threshold:
+            raise ValueError(f"Granica A ({a_threshold}) ne smije biti veća od granice B ({b_threshold})")
+        if x_threshold > y_threshold:
+            raise ValueError(f"Granica X ({x_threshold}) ne smije biti veća od granice Y ({y_threshold})")
+
+        abc = classify_abc(self.cumulative, a_threshold, b_threshold)
+        xyz = classify_xyz(self.coef_var, x_threshold, y_threshold)
+
+        if self.has_inventory:
+            levels = levels_from_statistics(
+                self.statistics, pd.Series(abc), pd.Series(xyz), **(inventory_params or {})
+            )
+            min_qty, max_qty = levels['Min Qty Monthly'], levels['Max Qty Monthly']
+        else:
+            min_qty = max_qty = np.full(len(self), np.nan)
+
+        return {'abc': abc, 'xyz': xyz, 'min_qty': min_qty, 'max_qty': max_qty}
+
+    def reproduces(self, reclassified: dict) -> bool:
+        """
+        Provjerava daje li reklasifikacija sa zadanim parametrima spremljene klase
+        i min/max količine, tj. jesu li spremljene metrike i parametri analize
+        dosljedni (rezultati bez metrika ili s kasnije izmijenjenim parametrima nisu).
+
+        Args:
+            reclassified: Rezultat reclassify s parametrima s kojima je analiza izvedena
+        """
+        same_classes = (reclassified['abc'] == self.abc).all() and (reclassified['xyz'] == self.xyz).all()
+        same_levels = all(
+            np.allclose(reclassified[key], stored, rtol=1e-9, atol=1e-6, equal_nan=True)
+            for key, stored in (('min_qty', self.min_qty), ('max_qty', self.max_qty))
+        )
+        return bool(same_classes and same_levels)
+
+    def compare(self, reclassified: dict, changed_items_limit: int = 100) -> dict:
+        """
+        Usporedba spremljene i nove klasifikacije: broj artikala po klasi,
+        prelasci između ABC-XYZ klasa i promjene min/max količina.
+
+        Args:
+            reclassified: Rezultat reclassify
+            changed_items_limit: Najveći broj izmijenjenih artikala u popisu (po prometu silazno)
+
+        Returns:
+            Rječnik s ključevima 'abc_counts', 'xyz_counts' ({'before', 'after'}),
+            'migrations', 'min_max' i 'changed_items'
+        """
+        abc, xyz = reclassified['abc'], reclassified['xyz']
+
+        # Prelasci između kombiniranih klasa (npr. AX -> BX), samo za promijenjene artikle
+        class_changed = (abc != self.abc) | (xyz != self.xyz)
+        old_classes = self.abc[class_changed] + self.xyz[class_changed]
+        new_classes = abc[class_changed] + xyz[class_changed]
+        migrations = (
+            pd.DataFrame({'from_class': old_classes, 'to_class': new_classes})
+            .value_counts()
+            .reset_index(name='item_count')
+        )
+
+        # Promjene min/max količina (NaN se smatra jednakim NaN)
+        min_changed = ~np.isclose(reclassified['min_qty'], self.min_qty, rtol=0, atol=1e-9, equal_nan=True)
+        max_changed = ~np.isclose(reclassified['max_qty'], self.max_qty, rtol=0, atol=1e-9, equal_nan=True)
+        changed = class_changed | min_changed | max_changed
+
+        # Artikli s najvećim prometom među izmijenjenima (tablica je poredana po rangu)
+        positions = np.flatnonzero(changed)[:changed_items_limit]
+        changed_items = pd.DataFrame({
+            'item_code': self.items[positions],
+            'total_turnover': self.total_turnover[positions],
+            'abc_before': self.abc[positions],
+            'abc_after': abc[positions],
+            'xyz_before': self.xyz[positions],
+            'xyz_after': xyz[positions],
+            'min_qty_before': self.min_qty[positions],
+            'min_qty_after': reclassified['min_qty'][positions],
+            'max_qty_before': self.max_qty[positions],
+            'max_qty_after': reclassified['max_qty'][positions]
+        })
+
+        return {
+            'abc_counts': {'before': self.abc_counts, 'after': _class_counts(abc, ['A', 'B', 'C'])},
+            'xyz_counts': {'before': self.xyz_counts, 'after': _class_counts(xyz, ['X', 'Y', 'Z'])},
+            'migrations': migrations.to_dict('records'),
+            'min_max': {
+                'items_changed': int((min_changed | max_changed).sum()),
+                'min_qty_before': float(np.nansum(self.min_qty)),
+                'min_qty_after': float(np.nansum(reclassified['min_qty'])),
+                'max_qty_before': float(np.nansum(self.max_qty)),
+                'max_qty_after': float(np.nansum(reclassified['max_qty']))
+            },
+            'changed_items': changed_items.astype(object).where(changed_items.notna(), None).to_dict('records')
+        }
@@ -0,0 +1,18 @@
+USE [Reports]
+GO
+
+-- Sažetak parametara analize i vodenog žiga picking podataka (SHA-256, hex).
+-- Backend po njemu vraća postojeći ResultID za istu analizu nad istim podacima
+-- umjesto ponovnog izračuna (vidi analysis_service.analysis_fingerprint).
+IF COL_LENGTH(N'[dbo].[AnalysisResults]', N'Fingerprint') IS NULL
+BEGIN
+    ALTER TABLE [dbo].[AnalysisResults] ADD [Fingerprint] NVARCHAR(64) NULL
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_AnalysisResults_Fingerprint')
+BEGIN
+    CREATE INDEX [IX_AnalysisResults_Fingerprint]
+        ON [dbo].[AnalysisResults] ([Fingerprint], [ResultID])
+END
+GO
@@ -0,0 +1,11 @@
+USE [Reports]
+GO
+
+-- Granice klasa i faktori zaliha s kojima je analiza izvedena (JSON s nazivima
+-- kolona AnalysisConfigurations). "Što ako" reklasifikacija kreće od njih, a ne
+-- od trenutne konfiguracije koja se u međuvremenu mogla izmijeniti.
+IF COL_LENGTH(N'[dbo].[AnalysisResults]', N'AnalysisParams') IS NULL
+BEGIN
+    ALTER TABLE [dbo].[AnalysisResults] ADD [AnalysisParams] NVARCHAR(MAX) NULL
+END
+GO
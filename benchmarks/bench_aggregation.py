@@ -0,0 +1,75 @@
+"""
+Usporedba dosadašnjih pivot_table + groupby/value_counts prolaza iz ABC_XYZ.py
+i jednog prolaza abc_xyz.aggregation.aggregate_picking (vrijeme i vršna memorija).
+
+Primjer:
+    python benchmarks/bench_aggregation.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import DESC_COL, GROUP_COL, ITEM_COL, MONTH_COL, QTY_COL, aggregate_picking, month_label_index
+from synthetic import synthetic_picking
+
+
+def legacy_aggregate(df):
+    # Kod preuzet iz ABC_XYZ.py prije objedinjavanja
+    turnover_pivot = pd.pivot_table(df, values=QTY_COL, index=ITEM_COL, columns=[MONTH_COL],
+                                    aggfunc='count', fill_value=0)
+    qty_pivot = pd.pivot_table(df, values=QTY_COL, index=ITEM_COL, columns=[MONTH_COL],
+                               aggfunc='sum', fill_value=0)
+    item_descriptions = df.groupby(ITEM_COL)[DESC_COL].agg(
+        lambda x: x.value_counts().index[0] if len(x.value_counts()) > 0 else ''
+    ).to_dict()
+    warehouse_zones = df.groupby(ITEM_COL)[GROUP_COL].agg(
+        lambda x: x.value_counts().index[0] if len(x.value_counts()) > 0 else 'TBD'
+    ).to_dict()
+    return turnover_pivot, qty_pivot, item_descriptions, warehouse_zones
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark agregacije artikl × mjesec')
+    parser.add_argument('--rows', type=int, default=10_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=30000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    args = parser.parse_args()
+
+    print(f"Generiranje {args.rows} redaka ({args.items} artikala, {args.months} mjeseci)...")
+    df = synthetic_picking(args.rows, args.items, args.months)
+
+    new_time, new_peak, new_result = measure(lambda: aggregate_picking(df))
+    old_time, old_peak, old_result = measure(lambda: legacy_aggregate(df))
+
+    print(f"{'':20}{'vrijeme (s)':>14}{'vršna memorija (MB)':>22}")
+    print(f"{'stari kod':20}{old_time:14.2f}{old_peak / 2**20:22.1f}")
+    print(f"{'aggregate_picking':20}{new_time:14.2f}{new_peak / 2**20:22.1f}")
+    print(f"ubrzanje: {old_time / new_time:.1f}x")
+
+    # Stari pivot slaže mjesece abecedno, a aggregate_picking kronološki
+    for new_pivot, old_pivot in zip(new_result[:2], old_result[:2]):
+        old_pivot = old_pivot[sorted(old_pivot.columns, key=month_label_index)]
+        pd.testing.assert_frame_equal(new_pivot, old_pivot)
+    assert new_result[2] == old_result[2]
+    assert new_result[3] == old_result[3]
+    print("Rezultati su identični.")
+
+
+if __name__ == "__main__":
+    main()
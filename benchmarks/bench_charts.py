@@ -0,0 +1,197 @@
+"""
+Usporedba crtanja grafova izvještaja: dosadašnje crtanje jednog po jednog
+grafa (Pareto sa svim artiklima, oznakom na svakoj točki i dpi=300) i
+write_charts s prorijeđenom Pareto krivuljom, paralelnim procesima i
+preskakanjem grafova čiji se ulazni podaci nisu promijenili.
+
+Primjer:
+    python benchmarks/bench_charts.py --rows 2000000 --items 30000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz import charts
+from abc_xyz.aggregation import aggregate_item_months
+from abc_xyz.pipeline import analyze_aggregate
+from synthetic import synthetic_picking
+
+
+def legacy_charts(final_df, turnover_pivot, item_descriptions, output_dir):
+    # Kod preuzet iz write_charts prije paralelnog crtanja
+    # Kreiranje vizualizacijskih listova
+    # ABC histogram
+    plt.figure(figsize=(10, 6))
+    abc_counts = final_df['ABC'].value_counts().sort_index()
+    bars = plt.bar(abc_counts.index, abc_counts.values, color=['green', 'yellow', 'red'])
+    plt.title('ABC Classification Distribution')
+    plt.xlabel('Category')
+    plt.ylabel('Number of Items')
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height}\n({height/len(final_df):.1%})',
+                ha='center', va='bottom')
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'abc_distribution.png'))
+    plt.close()
+
+    # XYZ histogram
+    plt.figure(figsize=(10, 6))
+    xyz_counts = final_df['XYZ'].value_counts().sort_index()
+    bars = plt.bar(xyz_counts.index, xyz_counts.values, color=['blue', 'orange', 'purple'])
+    plt.title('XYZ Classification Distribution')
+    plt.xlabel('Category')
+    plt.ylabel('Number of Items')
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height}\n({height/len(final_df):.1%})',
+                ha='center', va='bottom')
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'xyz_distribution.png'))
+    plt.close()
+
+    # ABC-XYZ matrica
+    plt.figure(figsize=(12, 8))
+    abcxyz_counts = final_df.groupby(['ABC', 'XYZ']).size().unstack(fill_value=0)
+    cax = plt.matshow(abcxyz_counts, fignum=1, cmap='YlGnBu')
+    plt.colorbar(cax)
+    plt.title('ABC-XYZ Matrix')
+    plt.xlabel('XYZ Classification')
+    plt.ylabel('ABC Classification')
+
+    # Dodavanje tekstualnih anotacija
+    for i in range(abcxyz_counts.shape[0]):
+        for j in range(abcxyz_counts.shape[1]):
+            plt.text(j, i, f'{abcxyz_counts.iloc[i, j]}\n({abcxyz_counts.iloc[i, j]/len(final_df):.1%})', 
+                     ha='center', va='center')
+
+    plt.xticks(range(len(abcxyz_counts.columns)), abcxyz_counts.columns)
+    plt.yticks(range(len(abcxyz_counts.index)), abcxyz_counts.index)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'abcxyz_matrix.png'))
+    plt.close()
+
+        # Pareto dijagram za ABC klasifikaciju
+    plt.figure(figsize=(14, 8))
+    sorted_items = final_df.sort_values('Total Turnover', ascending=False).reset_index()
+    # Izračun kumulativnog postotka direktno u sorted_items DataFrame-u
+    sorted_items['Percentage'] = 100 * sorted_items['Total Turnover'] / sorted_items['Total Turnover'].sum()
+    sorted_items['Cumulative %'] = sorted_items['Percentage'].cumsum()
+    
+    # Kreiranje figure s dva y-osi
+    fig, ax1 = plt.subplots(figsize=(14, 8))
+    
+    # Prva y-os za turnover (stupići)
+    ax1.bar(range(len(sorted_items)), sorted_items['Total Turnover'], color='skyblue', alpha=0.7)
+    ax1.set_xlabel('Items ranked by turnover')
+    ax1.set_ylabel('Turnover', color='royalblue')
+    ax1.tick_params(axis='y', labelcolor='royalblue')
+    
+    # Druga y-os za kumulativni postotak (linija)
+    ax2 = ax1.twinx()
+    ax2.plot(range(len(sorted_items)), sorted_items['Cumulative %'], 'r-', marker='o', markersize=3, linewidth=2)
+    ax2.set_ylabel('Cumulative percentage (%)', color='red')
+    ax2.tick_params(axis='y', labelcolor='red')
+    
+    # Postavljanje granice za y2 os od 0 do 100%
+    ax2.set_ylim([0, 100])
+    
+    # Dodavanje linija za granice 80% i 95%
+    ax2.axhline(y=80, color='g', linestyle='--', label='80% threshold (A items)')
+    ax2.axhline(y=95, color='orange', linestyle='--', label='95% threshold (B items)')
+    
+    # Dodavanje naslova i legende
+    plt.title('ABC Analysis - Pareto Chart', fontsize=14, fontweight='bold')
+    
+    # Kreiranje kombinirane legende za obje osi
+    lines1, labels1 = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax2.legend(lines1 + lines2, labels1 + labels2, loc='upper left', bbox_to_anchor=(0.01, 0.99))
+    
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'abc_pareto.png'), dpi=300)
+    plt.close()
+
+
+    # Mjesečna analiza trenda za top 10 artikala
+    plt.figure(figsize=(15, 10))
+    top_items = sorted_items['Item'].head(10)
+    for item in top_items:
+        # Dobivanje mjesečnih podataka o prometu (isključujući ukupno)
+        monthly_data = [turnover_pivot.loc[item, col] for col in turnover_pivot.columns if col != 'Total Turnover']
+        months = [col for col in turnover_pivot.columns if col != 'Total Turnover']
+        plt.plot(months, monthly_data, marker='o', label=f"{item} - {item_descriptions.get(item, '')[:20]}")
+
+    plt.title('Monthly Turnover Trend for Top 10 Items')
+    plt.xlabel('Month')
+    plt.ylabel('Turnover')
+    plt.xticks(rotation=45)
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'top_items_trend.png'))
+    plt.close()
+
+    return [os.path.join(output_dir, name) for name in charts.CHART_FILES]
+
+
+def timed(func):
+    start = time.perf_counter()
+    with redirect_stdout(open(os.devnull, 'w')):
+        result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark crtanja grafova izvještaja')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=30000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--workers', type=int, help='Broj procesa za crtanje (zadano broj procesora)')
+    args = parser.parse_args()
+
+    print(f"Analiza {args.rows} sintetičkih redaka...")
+    with redirect_stdout(open(os.devnull, 'w')):
+        results = analyze_aggregate(aggregate_item_months(synthetic_picking(args.rows, args.items, args.months)))
+    chart_args = (results['final_df'], results['turnover_pivot'], results['item_descriptions'])
+    print(f"Artikala: {len(results['final_df'])}")
+
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as output_dir:
+        legacy_time, _ = timed(lambda: legacy_charts(*chart_args, legacy_dir))
+        single_time, _ = timed(lambda: charts.write_charts(*chart_args, legacy_dir, workers=1))
+        cold_time, _ = timed(lambda: charts.write_charts(*chart_args, output_dir, workers=args.workers))
+        warm_time, _ = timed(lambda: charts.write_charts(*chart_args, output_dir, workers=args.workers))
+
+    print(f"{'':30}{'vrijeme (s)':>12}")
+    print(f"{'jedan po jedan, svi artikli':30}{legacy_time:12.2f}")
+    print(f"{'prorijeđeno, jedan proces':30}{single_time:12.2f}")
+    print(f"{'prorijeđeno, paralelno':30}{cold_time:12.2f}")
+    print(f"{'nepromijenjeni ulazi':30}{warm_time:12.2f}")
+    print(f"ubrzanje: {legacy_time / cold_time:.1f}x, ponovno pokretanje: {legacy_time / warm_time:.0f}x")
+
+    # Prorijeđena krivulja prelazi granice 80% i 95% na istim artiklima kao puna
+    turnover = results['final_df']['Total Turnover'].sort_values(ascending=False).to_numpy()
+    cumulative = 100 * np.cumsum(turnover) / turnover.sum()
+    positions = charts.pareto_points(cumulative)
+    for threshold, crossing in zip([80, 95], charts.threshold_crossings(cumulative)):
+        sampled = positions[np.searchsorted(cumulative[positions], threshold, side='right')]
+        assert sampled == crossing, (threshold, sampled, crossing)
+        print(f"Granica {threshold}%: prijelaz na artiklu {crossing} (rang {crossing + 1}) u obje krivulje")
+    print(f"Točaka Pareto krivulje: {len(positions)} od {len(cumulative)}")
+
+
+if __name__ == "__main__":
+    main()
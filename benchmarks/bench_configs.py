@@ -0,0 +1,84 @@
+"""
+Usporedba više konfiguracija analize: zasebno učitavanje i analiza za svaku
+konfiguraciju naspram jednog učitavanja i analyze_aggregate_configs (klase i
+min/max količine po konfiguraciji nad zajedničkim međurezultatima).
+
+Primjer:
+    python benchmarks/bench_configs.py --rows 1000000 --items 20000 --configs 5
+"""
+import argparse
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.pipeline import analyze_aggregate, analyze_aggregate_configs, load_picking_aggregate
+from abc_xyz.standin import connect_standin, load_picking_view
+from synthetic import synthetic_picking
+
+
+def config_params(n_configs):
+    # Konfiguracije s postupno strožim granicama i većim faktorima
+    return [
+        {
+            'a_threshold': 70.0 + 3 * i,
+            'b_threshold': 90.0 + i,
+            'x_threshold': 15.0 + 3 * i,
+            'y_threshold': 35.0 + 4 * i,
+            'inventory_params': {
+                'lead_time_weeks': 1.0 + i,
+                'safety_stock_factors': {'X': 1.0, 'Y': 1.5 + 0.1 * i, 'Z': 2.5 + 0.2 * i},
+                'max_qty_factors': {'A': 1.5, 'B': 2.0 + 0.1 * i, 'C': 3.0}
+            }
+        }
+        for i in range(n_configs)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analize više konfiguracija')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=20000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--configs', type=int, default=5, help='Broj konfiguracija')
+    args = parser.parse_args()
+
+    print(f"Punjenje SQLite zamjene s {args.rows} pikova...")
+    conn = connect_standin()
+    load_picking_view(conn, synthetic_picking(args.rows, args.items, args.months, with_dates=True))
+    configs = config_params(args.configs)
+
+    with redirect_stdout(open(os.devnull, 'w')):
+        start = time.perf_counter()
+        separate = [
+            analyze_aggregate(load_picking_aggregate(conn, '2000-01-01', '2099-12-31', pushdown=True), **params)
+            for params in configs
+        ]
+        separate_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analyze_aggregate(load_picking_aggregate(conn, '2000-01-01', '2099-12-31', pushdown=True), **configs[0])
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        agg = load_picking_aggregate(conn, '2000-01-01', '2099-12-31', pushdown=True)
+        batch = analyze_aggregate_configs(agg, configs)
+        batch_time = time.perf_counter() - start
+
+    print(f"{'':34}{'ukupno (s)':>12}")
+    print(f"{'jedna konfiguracija':34}{single_time:12.2f}")
+    print(f"{f'{args.configs} konfiguracija zasebno':34}{separate_time:12.2f}")
+    print(f"{f'{args.configs} konfiguracija, jedan prolaz':34}{batch_time:12.2f}")
+    print(f"omjer prema jednoj konfiguraciji: {batch_time / single_time:.2f}x")
+
+    for expected, results in zip(separate, batch):
+        pd.testing.assert_frame_equal(expected['final_df'], results['final_df'])
+    print("Rezultati su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
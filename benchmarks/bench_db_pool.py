@@ -0,0 +1,70 @@
+"""
+Usporedba trajanja upita kroz execute_query: nova konekcija za svaki upit
+(dosadašnji pyodbc.connect) i posudba konekcije iz poola engine-a.
+
+Bez --url koristi se lokalna SQLite baza; za stvarni trošak spajanja na
+SQL Server zadati npr. --url "mssql+pyodbc:///?odbc_connect=...".
+
+Primjer:
+    python benchmarks/bench_db_pool.py --queries 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'abc-xyz-app', 'backend'))
+
+from app.database import execute_query, get_pool_stats
+
+QUERY = "SELECT 1 AS Value"
+
+
+def run_queries(engine, queries, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: execute_query(QUERY, bind=engine), range(queries)))
+    return (time.perf_counter() - start) / queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark poola konekcija')
+    parser.add_argument('--url', type=str, help='SQLAlchemy URL baze (zadano: lokalna SQLite datoteka)')
+    parser.add_argument('--queries', type=int, default=2000, help='Broj upita')
+    parser.add_argument('--threads', type=int, default=8, help='Broj istodobnih klijenata')
+    parser.add_argument('--pool-size', type=int, default=5, help='Veličina poola')
+    parser.add_argument('--max-overflow', type=int, default=0, help='Dopušteni preljev poola')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        url = args.url or f"sqlite:///{os.path.join(db_dir, 'reports.db')}"
+
+        # Nova DBAPI konekcija za svaki upit, kao dosadašnji pyodbc.connect u execute_query
+        unpooled = create_engine(url, poolclass=NullPool)
+        pooled = create_engine(
+            url, pool_size=args.pool_size, max_overflow=args.max_overflow, pool_pre_ping=True
+        )
+
+        old_latency = run_queries(unpooled, args.queries, args.threads)
+        new_latency = run_queries(pooled, args.queries, args.threads)
+        stats = get_pool_stats(pooled)
+
+        unpooled.dispose()
+        pooled.dispose()
+
+    print(f"{'':18}{'ms po upitu':>14}")
+    print(f"{'nova konekcija':18}{old_latency * 1000:14.3f}")
+    print(f"{'pool':18}{new_latency * 1000:14.3f}")
+    print(f"ubrzanje: {old_latency / new_latency:.1f}x")
+    print(f"Pool: veličina {stats['pool_size']}, posuđeno {stats['checked_out']}, "
+          f"preuzimanja {stats['checkouts']}, čekanja {stats['waits']} ({stats['wait_seconds']:.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
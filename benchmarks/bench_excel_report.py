@@ -0,0 +1,199 @@
+"""
+Usporedba pisanja glavnog Excel izvještaja: dosadašnji to_excel s cijelom
+radnom knjigom u memoriji i worksheet.write po ćeliji unutar iterrows() te
+write_excel_report u constant_memory načinu s upisom po paketima redaka.
+
+Mjeri se vrijeme i vršna memorija (tracemalloc) za više veličina izvještaja;
+kod novog načina vršna memorija ne raste s brojem redaka. Grafovi se u oba
+slučaja zamjenjuju malim slikama jer se ovdje mjeri samo upis u Excel.
+
+Primjer:
+    python benchmarks/bench_excel_report.py --report-rows 10000 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz import report
+from abc_xyz.aggregation import aggregate_item_months
+from abc_xyz.pipeline import analyze_aggregate
+from synthetic import synthetic_picking
+
+SHEETS = ['Monthly Breakdown', 'Warehouse Optimization', 'Inventory Management']
+
+
+def placeholder_charts(final_df, turnover_pivot, item_descriptions, output_dir):
+    for name in report.CHART_FILES:
+        path = os.path.join(output_dir, name)
+        if not os.path.exists(path):
+            plt.figure(figsize=(1, 1))
+            plt.savefig(path)
+            plt.close()
+    return [os.path.join(output_dir, name) for name in report.CHART_FILES]
+
+
+def legacy_excel_report(results, output_dir):
+    # Kod preuzet iz write_excel_report prije constant_memory načina (bez lista s preporukama)
+    final_df = results['final_df']
+    final_columns = results['final_columns']
+    turnover_pivot = results['turnover_pivot']
+
+    final_file = os.path.join(output_dir, 'legacy.xlsx')
+    writer = pd.ExcelWriter(final_file, engine='xlsxwriter')
+    final_df[final_columns].to_excel(writer, sheet_name='Monthly Breakdown', index=True)
+    workbook = writer.book
+    worksheet = writer.sheets['Monthly Breakdown']
+
+    header_format = workbook.add_format({
+        'bold': True, 'text_wrap': True, 'valign': 'top', 'bg_color': '#D9E1F2', 'border': 1
+    })
+    formats = [workbook.add_format({'bg_color': color}) for color in ['#90EE90', '#FFFFE0', '#FFC0CB']]
+    for col_num, value in enumerate(final_columns):
+        worksheet.write(0, col_num + 1, value, header_format)
+    worksheet.write(0, 0, 'Item', header_format)
+    abc_col = final_columns.index('ABC') + 1
+    for category, category_format in zip('ABC', formats):
+        worksheet.conditional_format(1, abc_col, len(final_df) + 1, abc_col,
+                                     {'type': 'cell', 'criteria': '==', 'value': f'"{category}"',
+                                      'format': category_format})
+
+    image_files = placeholder_charts(final_df, turnover_pivot, results['item_descriptions'], output_dir)
+    worksheet = workbook.add_worksheet('Visualizations')
+    for i, image_file in enumerate(image_files):
+        worksheet.insert_image(i*25, 1, image_file, {'x_scale': 0.7, 'y_scale': 0.7})
+        worksheet.write(i*25 + 22, 1, f"Figure {i+1}: {os.path.basename(image_file).replace('.png', '')}")
+
+    worksheet = workbook.add_worksheet('Warehouse Optimization')
+    worksheet.write(0, 0, 'Warehouse Optimization Suggestions', workbook.add_format({'bold': True, 'font_size': 14}))
+    a_items_df = final_df[final_df['ABC'] == 'A'].sort_values('Total Turnover', ascending=False)
+    worksheet.write(2, 0, 'Top A Items for Prime Locations', workbook.add_format({'bold': True}))
+    for i, header in enumerate(['Item', 'Description', 'Total Turnover', 'XYZ Class', 'Suggested Location']):
+        worksheet.write(3, i, header)
+    for i, (idx, row) in enumerate(a_items_df.head(20).iterrows()):
+        worksheet.write(i+4, 0, idx)
+        worksheet.write(i+4, 1, row['Name'])
+        worksheet.write(i+4, 2, row['Total Turnover'])
+        worksheet.write(i+4, 3, row['XYZ'])
+        if row['XYZ'] == 'X':
+            suggestion = 'Primary pick face, ground level'
+        elif row['XYZ'] == 'Y':
+            suggestion = 'Primary pick face, middle level'
+        else:
+            suggestion = 'Primary pick face, with buffer stock'
+        worksheet.write(i+4, 4, suggestion)
+    worksheet.write(30, 0, 'Monthly Sales Patterns (A Items)', workbook.add_format({'bold': True}))
+    worksheet.write(31, 0, 'Month')
+    month_columns = [col for col in turnover_pivot.columns if col != 'Total Turnover']
+    for i, month in enumerate(month_columns):
+        worksheet.write(31, i+1, month)
+    worksheet.write(32, 0, 'Total Turnover')
+    for i, month in enumerate(month_columns):
+        worksheet.write(32, i+1, turnover_pivot[month].sum())
+
+    inventory_worksheet = workbook.add_worksheet('Inventory Management')
+    inventory_worksheet.write(0, 0, 'Inventory Planning Based on ABC-XYZ Analysis',
+                              workbook.add_format({'bold': True, 'font_size': 14}))
+    headers = ['Item', 'Description', 'ABC', 'XYZ', 'Avg Weekly Qty', 'Min Qty Weekly', 'Max Qty Weekly',
+               'Avg Monthly Qty', 'Min Qty Monthly', 'Max Qty Monthly']
+    for i, header in enumerate(headers):
+        inventory_worksheet.write(2, i, header, header_format)
+    sorted_inventory = final_df.reset_index().sort_values(['ABC', 'XYZ'])
+    columns = ['Item', 'Name'] + headers[2:]
+    for row_idx, (_, row) in enumerate(sorted_inventory.iterrows(), start=3):
+        for col_idx, col in enumerate(columns):
+            inventory_worksheet.write(row_idx, col_idx, row[col])
+    inventory_worksheet.freeze_panes(3, 0)
+    for col in range(2, 4):
+        for category, category_format in zip('ABC', formats):
+            inventory_worksheet.conditional_format(3, col, row_idx, col,
+                                                   {'type': 'cell', 'criteria': '==',
+                                                    'value': f'"{category}"', 'format': category_format})
+
+    writer.close()
+    return final_file
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def peak_memory(func):
+    # Vršna memorija mjeri se zasebnim pokretanjem jer tracemalloc usporava upis
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def report_results(results, n_rows):
+    # Prvih n_rows artikala (ponavljaju se ako ih je u analizi manje)
+    final_df = results['final_df']
+    positions = np.arange(n_rows) % len(final_df)
+    sliced = final_df.iloc[positions].copy()
+    if n_rows > len(final_df):
+        sliced.index = [f"{item}-{row // len(final_df)}" for row, item in enumerate(sliced.index)]
+        sliced.index.name = final_df.index.name
+    return dict(results, final_df=sliced)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pisanja Excel izvještaja')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=30000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--report-rows', type=int, nargs='+', default=[10000, 100000],
+                        help='Broj redaka izvještaja za koje se mjeri upis')
+    parser.add_argument('--legacy-max-rows', type=int, default=20000,
+                        help='Najveći izvještaj za koji se mjeri i dosadašnji način (sporo)')
+    parser.add_argument('--ceiling-mb', type=float, default=16,
+                        help='Gornja granica vršne memorije za constant_memory upis')
+    args = parser.parse_args()
+
+    print(f"Analiza {args.rows} sintetičkih redaka...")
+    with redirect_stdout(open(os.devnull, 'w')):
+        results = analyze_aggregate(aggregate_item_months(synthetic_picking(args.rows, args.items, args.months)))
+    report.write_charts = placeholder_charts
+
+    print(f"{'':30}{'vrijeme (s)':>12}{'vršna memorija (MB)':>21}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for i, n_rows in enumerate(sorted(args.report_rows)):
+            sized = report_results(results, n_rows)
+
+            if n_rows <= args.legacy_max_rows:
+                legacy_time, legacy_file = timed(lambda: legacy_excel_report(sized, output_dir))
+                legacy_peak = peak_memory(lambda: legacy_excel_report(sized, output_dir))
+                print(f"{f'to_excel, {n_rows} redaka':30}{legacy_time:12.2f}{legacy_peak / 2**20:21.1f}")
+
+            new_time, new_file = timed(lambda: report.write_excel_report(sized, output_dir))
+            new_peak = peak_memory(lambda: report.write_excel_report(sized, output_dir))
+            print(f"{f'constant_memory, {n_rows} redaka':30}{new_time:12.2f}{new_peak / 2**20:21.1f}")
+            assert new_peak <= args.ceiling_mb * 2**20, f"vršna memorija iznad {args.ceiling_mb} MB"
+
+            # Isti sadržaj listova s podacima (provjerava se najmanja veličina)
+            if i == 0 and n_rows <= args.legacy_max_rows:
+                for sheet in SHEETS:
+                    pd.testing.assert_frame_equal(
+                        pd.read_excel(legacy_file, sheet_name=sheet, header=None),
+                        pd.read_excel(new_file, sheet_name=sheet, header=None)
+                    )
+                print(f"Listovi {', '.join(SHEETS)} su jednaki.")
+
+    print(f"constant_memory upis ostaje ispod {args.ceiling_mb:.0f} MB za sve veličine.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Ponovljena analiza zadnjih 24 mjeseca nakon dnevnog importa: agregatni upit
+nad cijelim razdobljem (pushdown) naspram predmemorije agregata zatvorenih
+mjeseci (AggregateCache), gdje se iz baze traže samo otvoreni mjeseci.
+
+Datumi sintetičkih pikova pomaknuti su tako da zadnji mjesec bude tekući,
+a "dnevni import" dodaje pikove s današnjim datumom.
+
+Primjer:
+    python benchmarks/bench_incremental.py --rows 1000000 --items 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import DATE_COL
+from abc_xyz.pipeline import analyze_aggregate, load_picking_aggregate
+from abc_xyz.standin import connect_standin, load_picking_view
+from synthetic import FIRST_YEAR, synthetic_picking
+
+
+def current_picks(n_rows, n_items, n_months, now, seed=42):
+    # Zadnji od n_months mjeseci je tekući mjesec; budući pikovi se odbacuju
+    picks = synthetic_picking(n_rows, n_items, n_months, seed=seed, with_dates=True)
+    shift = (now.year * 12 + now.month) - (FIRST_YEAR * 12 + n_months)
+    picks[DATE_COL] = picks[DATE_COL] + pd.DateOffset(months=shift)
+    return picks[picks[DATE_COL] < now].reset_index(drop=True)
+
+
+def timed_analysis(conn, start_date, end_date, **kwargs):
+    start = time.perf_counter()
+    with redirect_stdout(open(os.devnull, 'w')):
+        agg = load_picking_aggregate(conn, start_date, end_date, **kwargs)
+        load_time = time.perf_counter() - start
+        results = analyze_aggregate(agg)
+    return load_time, time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark inkrementalne analize')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=20000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--import-rows', type=int, default=5000, help='Broj pikova u dnevnom importu')
+    args = parser.parse_args()
+
+    now = datetime.now()
+    first_month = pd.Period(now, freq='M') - (args.months - 1)
+    start_date = first_month.start_time.strftime('%Y-%m-%d')
+    end_date = (now + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+    print(f"Punjenje SQLite zamjene s {args.rows} pikova...")
+    conn = connect_standin()
+    load_picking_view(conn, current_picks(args.rows, args.items, args.months, now))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        _, cold_time, _ = timed_analysis(conn, start_date, end_date, aggregate_cache_dir=cache_dir)
+
+        # Dnevni import: novi pikovi s današnjim datumom
+        new_picks = current_picks(args.import_rows, args.items, 1, now, seed=7)
+        new_picks[DATE_COL] = now.replace(hour=8, minute=0, second=0, microsecond=0)
+        load_picking_view(conn, new_picks)
+
+        full_load, full_time, full_results = timed_analysis(conn, start_date, end_date, pushdown=True)
+        warm_load, warm_time, warm_results = timed_analysis(conn, start_date, end_date, aggregate_cache_dir=cache_dir)
+
+    print(f"{'':34}{'učitavanje (s)':>16}{'ukupno (s)':>12}")
+    print(f"{'pushdown, cijelo razdoblje':34}{full_load:16.2f}{full_time:12.2f}")
+    print(f"{'predmemorija agregata, prvi put':34}{'':16}{cold_time:12.2f}")
+    print(f"{'predmemorija agregata, nakon importa':34}{warm_load:16.2f}{warm_time:12.2f}")
+    print(f"ubrzanje učitavanja: {full_load / warm_load:.1f}x")
+
+    # Naziv i zona su najčešće vrijednosti po artiklu; kod izjednačenja odlučuje
+    # redoslijed grupa, koji ni agregatni upit u bazi ne određuje
+    tie_columns = ['Name', 'Warehouse zone']
+    pd.testing.assert_frame_equal(
+        full_results['final_df'].drop(columns=tie_columns), warm_results['final_df'].drop(columns=tie_columns)
+    )
+    print("Rezultati analize su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
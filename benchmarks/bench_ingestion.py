@@ -0,0 +1,82 @@
+"""
+Usporedba pripreme picking podataka: dosadašnje tekstualne kolone i oznaka
+mjeseca preko strftime po retku te kompaktni tipovi (kategorije, float32
+količina, cjelobrojni indeks mjeseca) iz add_month_columns i compact_picking.
+
+Primjer:
+    python benchmarks/bench_ingestion.py --rows 2000000 --items 30000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import DATE_COL, ITEM_COL, MONTH_COL, aggregate_item_months, item_month_tables
+from abc_xyz.data import add_month_columns, compact_picking
+from synthetic import synthetic_picking
+
+
+def legacy_month_columns(df):
+    # Kod preuzet iz add_month_columns prije kompaktnih tipova
+    df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors='coerce')
+    df['Month'] = df[DATE_COL].dt.month
+    df['Year'] = df[DATE_COL].dt.year
+    df[MONTH_COL] = df[DATE_COL].dt.strftime('%m.%Y')
+    return df
+
+
+def picking_frame(args):
+    df = synthetic_picking(args.rows, args.items, args.months, with_dates=True)
+    rng = np.random.default_rng(7)
+    # Ostale tekstualne kolone upita kakve dolaze iz baze
+    df['Kupac'] = np.array([f"Kupac {i}" for i in range(500)], dtype=object)[rng.integers(0, 500, len(df))]
+    df['Korisnik'] = np.array([f"korisnik{i}" for i in range(60)], dtype=object)[rng.integers(0, 60, len(df))]
+    df[DATE_COL] = df[DATE_COL].dt.strftime('%Y-%m-%d %H:%M:%S')
+    return df
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark kompaktnih tipova picking podataka')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=30000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    args = parser.parse_args()
+
+    print(f"Generiranje {args.rows} sintetičkih redaka...")
+    old_df = picking_frame(args)
+    new_df = old_df.copy()
+
+    old_prepare, _ = timed(lambda: legacy_month_columns(old_df))
+    new_prepare, _ = timed(lambda: compact_picking(add_month_columns(new_df)))
+    old_memory = old_df.memory_usage(deep=True).sum()
+    new_memory = new_df.memory_usage(deep=True).sum()
+
+    old_aggregate, old_agg = timed(lambda: aggregate_item_months(old_df))
+    new_aggregate, new_agg = timed(lambda: aggregate_item_months(new_df))
+
+    print(f"{'':12}{'priprema (s)':>14}{'sažimanje (s)':>15}{'memorija (MB)':>15}")
+    print(f"{'tekst':12}{old_prepare:14.2f}{old_aggregate:15.2f}{old_memory / 2**20:15.1f}")
+    print(f"{'kompaktno':12}{new_prepare:14.2f}{new_aggregate:15.2f}{new_memory / 2**20:15.1f}")
+    print(f"manje memorije: {old_memory / new_memory:.1f}x, brža priprema: {old_prepare / new_prepare:.1f}x")
+
+    # Isti agregat; mjeseci su kod kompaktnih tipova poredani kronološki
+    old_turnover = item_month_tables(old_agg)[0]
+    new_turnover = item_month_tables(new_agg)[0]
+    pd.testing.assert_frame_equal(old_turnover[new_turnover.columns], new_turnover)
+    print(f"Pivot tablice su jednake; mjeseci: {new_turnover.columns[0]} ... {new_turnover.columns[-1]}")
+    print(f"Artikala: {new_agg[ITEM_COL].nunique()}")
+
+
+if __name__ == "__main__":
+    main()
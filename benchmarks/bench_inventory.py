@@ -0,0 +1,105 @@
+"""
+Usporedba izračuna min/max količina zaliha: dosadašnji DataFrame.apply po
+retku i compute_inventory_levels nad cijelim kolonama.
+
+Primjer:
+    python benchmarks/bench_inventory.py --items 100000 --months 24
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.inventory import (
+    INVENTORY_COLUMNS, LEAD_TIME_WEEKS, MAX_QTY_FACTORS, SAFETY_STOCK_FACTORS, WEEKS_PER_MONTH,
+    compute_inventory_levels
+)
+
+
+def legacy_inventory_levels(final_df, months, coefficient_variation):
+    # Kod preuzet iz add_inventory_levels prije vektorskog izračuna
+    safety_stock_factors = SAFETY_STOCK_FACTORS
+    max_qty_factors = MAX_QTY_FACTORS
+    lead_time_weeks = LEAD_TIME_WEEKS
+    weeks_per_month = WEEKS_PER_MONTH
+
+    final_df['Avg Monthly Qty'] = final_df[[f'QTY_{month}' for month in months]].mean(axis=1)
+    final_df['Avg Weekly Qty'] = final_df['Avg Monthly Qty'] / weeks_per_month
+
+    if len(months) > 1:
+        final_df['Monthly Qty StdDev'] = final_df[[f'QTY_{month}' for month in months]].std(axis=1)
+        final_df['Weekly Qty StdDev'] = final_df['Monthly Qty StdDev'] / weeks_per_month
+    else:
+        final_df['Weekly Qty StdDev'] = final_df['Avg Weekly Qty'] * coefficient_variation / 100
+
+    final_df['Safety Stock Weekly'] = final_df.apply(
+        lambda row: max(row['Weekly Qty StdDev'] * safety_stock_factors[row['XYZ']],
+                        row['Avg Weekly Qty'] * 0.2),
+        axis=1
+    )
+    final_df['Min Qty Weekly'] = final_df['Avg Weekly Qty'] * lead_time_weeks + final_df['Safety Stock Weekly']
+    final_df['Max Qty Weekly'] = final_df.apply(
+        lambda row: row['Min Qty Weekly'] + row['Avg Weekly Qty'] * max_qty_factors[row['ABC']],
+        axis=1
+    )
+    final_df['Min Qty Monthly'] = final_df['Min Qty Weekly'] * weeks_per_month
+    final_df['Max Qty Monthly'] = final_df['Max Qty Weekly'] * weeks_per_month
+
+    for col in ['Min Qty Weekly', 'Max Qty Weekly', 'Min Qty Monthly', 'Max Qty Monthly']:
+        final_df[col] = final_df.apply(
+            lambda row: round(row[col]) if row['Avg Weekly Qty'] > 5 else round(row[col], 2),
+            axis=1
+        )
+    return final_df
+
+
+def synthetic_final_df(n_items, n_months, seed=42):
+    rng = np.random.default_rng(seed)
+    months = [f"{(m % 12) + 1:02d}.{2023 + m // 12}" for m in range(n_months)]
+    # Mješavina sporih i brzih artikala, oko granice zaokruživanja na cijele jedinice
+    scale = rng.lognormal(mean=2.5, sigma=1.5, size=(n_items, 1))
+    qty = np.round(rng.poisson(scale, size=(n_items, n_months)) * rng.uniform(0.5, 1.5, size=(n_items, 1)), 2)
+
+    final_df = pd.DataFrame(qty, columns=[f'QTY_{month}' for month in months],
+                            index=pd.Index([f"ART{i:06d}" for i in range(n_items)], name='Item'))
+    final_df['ABC'] = rng.choice(list('ABC'), size=n_items, p=[0.2, 0.3, 0.5])
+    final_df['XYZ'] = rng.choice(list('XYZ'), size=n_items, p=[0.3, 0.3, 0.4])
+    return final_df, months
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark izračuna min/max količina zaliha')
+    parser.add_argument('--items', type=int, default=100000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    args = parser.parse_args()
+
+    final_df, months = synthetic_final_df(args.items, args.months)
+    coefficient_variation = pd.Series(0.0, index=final_df.index)
+
+    start = time.perf_counter()
+    legacy = legacy_inventory_levels(final_df.copy(), months, coefficient_variation)
+    legacy_time = time.perf_counter() - start
+
+    # Isti raspored memorije kao kopija u legacy_inventory_levels, pa se prosjek zbraja istim redom
+    monthly_qty = final_df.copy()[[f'QTY_{month}' for month in months]]
+
+    start = time.perf_counter()
+    levels = compute_inventory_levels(monthly_qty, final_df['ABC'], final_df['XYZ'], coefficient_variation)
+    vector_time = time.perf_counter() - start
+
+    print(f"{'':14}{'vrijeme (s)':>12}")
+    print(f"{'apply po retku':14}{legacy_time:12.3f}")
+    print(f"{'vektorski':14}{vector_time:12.3f}")
+    print(f"ubrzanje: {legacy_time / vector_time:.0f}x za {args.items} artikala i {args.months} mjeseci")
+
+    pd.testing.assert_frame_equal(legacy[INVENTORY_COLUMNS], levels[INVENTORY_COLUMNS])
+    print("Min/max količine su jednake.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Usporedba učitavanja picking podataka: view v_pickingStorageSystem koji zonu
+traži koreliranim podupitom po retku i tablica Picking sa zonom iz rječnika
+lokacija u memoriji (LocationZones), na lokalnoj SQLite bazi.
+
+Primjer:
+    python benchmarks/bench_location_zones.py --rows 200000 --locations 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from abc_xyz.aggregation import GROUP_COL
+from abc_xyz.locations import LOCATION_COL, LocationZones
+from abc_xyz.pipeline import load_picking_aggregate
+from abc_xyz.standin import connect_standin, load_picking_tables
+from synthetic import synthetic_picking
+
+KEYS = ['Artikl', 'Naziv artikla', GROUP_COL, 'MonthYear']
+
+
+def synthetic_locations(picks, n_locations, seed=42):
+    # Svaka zona dobiva svoje lokacije; pik uzima nasumičnu lokaciju svoje zone
+    rng = np.random.default_rng(seed)
+    zones = sorted(picks[GROUP_COL].unique())
+    codes = np.array([f"LOK{i % len(zones)}-{i:06d}" for i in range(n_locations)], dtype=object)
+    location_zone = np.array([zones[i % len(zones)] for i in range(n_locations)], dtype=object)
+
+    pick_locations = np.empty(len(picks), dtype=object)
+    for zone in zones:
+        mask = (picks[GROUP_COL] == zone).to_numpy()
+        pick_locations[mask] = rng.choice(codes[location_zone == zone], size=mask.sum())
+
+    # Mali dio šifri u picking podacima pisan je malim slovima
+    lowercase = rng.random(len(picks)) < 0.01
+    pick_locations[lowercase] = [code.lower() for code in pick_locations[lowercase]]
+
+    picks[LOCATION_COL] = pick_locations
+    return pd.DataFrame({'Code': codes, 'Storage_system': location_zone})
+
+
+def timed_load(conn, **kwargs):
+    start = time.perf_counter()
+    with redirect_stdout(open(os.devnull, 'w')):
+        agg = load_picking_aggregate(conn, '2023-01-01', '2025-12-31', **kwargs)
+    return time.perf_counter() - start, agg
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dodjele zone po lokaciji')
+    parser.add_argument('--rows', type=int, default=200000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=5000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=12, help='Broj mjeseci')
+    parser.add_argument('--locations', type=int, default=5000, help='Broj lokacija')
+    args = parser.parse_args()
+
+    picks = synthetic_picking(args.rows, args.items, args.months, with_dates=True)
+    locations = synthetic_locations(picks, args.locations)
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        conn = connect_standin(os.path.join(db_dir, 'reports.db'))
+        print(f"Punjenje SQLite baze s {args.rows} pikova i {args.locations} lokacija...")
+        load_picking_tables(conn, picks, locations)
+
+        view_time, view_agg = timed_load(conn)
+        location_zones = LocationZones()
+        lookup_time, lookup_agg = timed_load(conn, location_zones=location_zones)
+        zone_filter_time, _ = timed_load(conn, location_zones=location_zones, warehouse_zones=['POLICE'])
+        conn.close()
+
+    print(f"{'':26}{'vrijeme (s)':>12}")
+    print(f"{'view (podupit)':26}{view_time:12.2f}")
+    print(f"{'Picking + rječnik':26}{lookup_time:12.2f}")
+    print(f"{'Picking + rječnik, zona':26}{zone_filter_time:12.2f}")
+    print(f"ubrzanje: {view_time / lookup_time:.1f}x")
+    print(location_zones.summary())
+
+    zone_column = location_zones.lookup(picks[LOCATION_COL])
+    print(f"Kolona zone: object {picks[GROUP_COL].memory_usage(deep=True) / 2**20:.1f} MB, "
+          f"kategorijska {zone_column.memory_usage(deep=True) / 2**20:.1f} MB")
+
+    # Oba puta daju isti agregat
+    view_agg = view_agg.sort_values(KEYS).reset_index(drop=True)
+    lookup_agg = lookup_agg.astype({GROUP_COL: object}).sort_values(KEYS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(view_agg, lookup_agg)
+    print("Agregati su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Vrijeme spremanja rezultata analize po izlaznom formatu (write_reports s
+--outputs): Excel izvještaji s grafovima naspram Parquet, CSV i JSON tablice
+rezultata za programsko čitanje.
+
+Primjer:
+    python benchmarks/bench_outputs.py --rows 2000000 --items 30000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import aggregate_item_months
+from abc_xyz.artifact import RESULTS_CSV_FILE, RESULTS_FILE, RESULTS_JSON_FILE
+from abc_xyz.pipeline import analyze_aggregate
+from abc_xyz.report import OUTPUT_FORMATS, write_reports
+from synthetic import synthetic_picking
+
+
+def timed_outputs(results, outputs):
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        with redirect_stdout(open(os.devnull, 'w')):
+            write_reports(results, output_dir, outputs)
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir))
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark izlaznih formata analize')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=30000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    args = parser.parse_args()
+
+    print(f"Analiza {args.rows} sintetičkih redaka...")
+    with redirect_stdout(open(os.devnull, 'w')):
+        results = analyze_aggregate(aggregate_item_months(synthetic_picking(args.rows, args.items, args.months)))
+    print(f"Artikala: {len(results['final_df'])}")
+
+    print(f"{'--outputs':20}{'vrijeme (s)':>12}{'veličina (MB)':>15}")
+    for outputs in [[name] for name in OUTPUT_FORMATS] + [['xlsx', 'parquet'], ['parquet', 'json']]:
+        elapsed, size = timed_outputs(results, outputs)
+        print(f"{','.join(outputs):20}{elapsed:12.2f}{size / 2**20:15.1f}")
+
+    # Parquet, CSV i JSON sadrže istu tablicu rezultata
+    with tempfile.TemporaryDirectory() as output_dir:
+        with redirect_stdout(open(os.devnull, 'w')):
+            write_reports(results, output_dir, ['parquet', 'csv', 'json'])
+        table = pd.read_parquet(os.path.join(output_dir, RESULTS_FILE))
+        csv_table = pd.read_csv(os.path.join(output_dir, RESULTS_CSV_FILE), encoding='utf-8-sig')
+        with open(os.path.join(output_dir, RESULTS_JSON_FILE), encoding='utf-8') as fh:
+            json_table = pd.DataFrame(json.load(fh))
+
+    pd.testing.assert_frame_equal(table, csv_table, check_dtype=False)
+    pd.testing.assert_frame_equal(table, json_table, check_dtype=False)
+    print("Parquet, CSV i JSON tablice su jednake.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Usporedba spremanja detalja i mjesečnih podataka analize: dosadašnji add/flush i
+SELECT po retku te skupni upis save_result_details, na lokalnoj SQLite bazi.
+
+Primjer:
+    python benchmarks/bench_persistence.py --items 20000 --months 24
+"""
+import argparse
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'abc-xyz-app', 'backend'))
+
+from abc_xyz.aggregation import aggregate_item_months
+from abc_xyz.artifact import monthly_columns, results_table
+from abc_xyz.pipeline import analyze_aggregate
+from app.database import Base
+from app.models.analysis import AnalysisResult, AnalysisResultDetail, AnalysisResultMonthly
+from app.models.configuration import AnalysisConfiguration
+from app.services.analysis_service import save_result_details
+from synthetic import synthetic_picking
+
+
+def legacy_save(db, result_id, table):
+    # Kod preuzet iz run_abc_xyz_script prije skupnog upisa
+    for index, row in table.iterrows():
+        detail = AnalysisResultDetail(
+            ResultID=result_id,
+            ItemCode=row['Item'],
+            ItemName=row['Name'],
+            ABC_Class=row['ABC'],
+            XYZ_Class=row['XYZ'],
+            WarehouseZone=row['Warehouse zone'],
+            TotalTurnover=row['Total Turnover'],
+            TotalQuantity=row['Total Qty'],
+            Rank=index + 1
+        )
+        db.add(detail)
+        db.flush()
+
+        for col in monthly_columns(table):
+            month_str = col.split('_', 1)[1]
+            is_turnover = col.startswith('Turnover_')
+
+            existing = db.query(AnalysisResultMonthly).filter(
+                AnalysisResultMonthly.DetailID == detail.DetailID,
+                AnalysisResultMonthly.YearMonth == month_str
+            ).first()
+
+            if existing:
+                if is_turnover:
+                    existing.Turnover = row[col]
+                else:
+                    existing.Quantity = row[col]
+            else:
+                db.add(AnalysisResultMonthly(
+                    DetailID=detail.DetailID,
+                    YearMonth=month_str,
+                    Turnover=row[col] if is_turnover else 0,
+                    Quantity=0 if is_turnover else row[col]
+                ))
+
+
+def run(save, table):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(AnalysisConfiguration(ConfigID=1, ConfigName='Default'))
+    result = AnalysisResult(ConfigID=1, AnalysisName='benchmark')
+    db.add(result)
+    db.commit()
+
+    start = time.perf_counter()
+    save(db, result.ResultID, table)
+    db.commit()
+    elapsed = time.perf_counter() - start
+
+    monthly = pd.read_sql(
+        "SELECT d.ItemCode, m.YearMonth, m.Turnover, m.Quantity FROM AnalysisResultMonthly m "
+        "JOIN AnalysisResultDetails d ON d.DetailID = m.DetailID ORDER BY d.ItemCode, m.YearMonth",
+        engine
+    )
+    rows = db.query(AnalysisResultDetail).count() + len(monthly)
+    db.close()
+    return elapsed, rows, monthly
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark spremanja rezultata analize')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=20000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--skip-legacy', action='store_true', help='Ne mjeri dosadašnji način (traje dugo)')
+    args = parser.parse_args()
+
+    print(f"Analiza {args.rows} sintetičkih redaka...")
+    with redirect_stdout(open(os.devnull, 'w')):
+        results = analyze_aggregate(aggregate_item_months(synthetic_picking(args.rows, args.items, args.months)))
+    table = results_table(results)
+
+    new_time, new_rows, new_monthly = run(save_result_details, table)
+    print(f"{'':14}{'redaka':>10}{'vrijeme (s)':>14}{'redaka/s':>12}")
+    print(f"{'skupni upis':14}{new_rows:10}{new_time:14.2f}{new_rows / new_time:12.0f}")
+
+    if not args.skip_legacy:
+        old_time, old_rows, old_monthly = run(legacy_save, table)
+        print(f"{'po retku':14}{old_rows:10}{old_time:14.2f}{old_rows / old_time:12.0f}")
+        print(f"ubrzanje: {old_time / new_time:.1f}x")
+
+        pd.testing.assert_frame_equal(old_monthly, new_monthly)
+        print("Mjesečni podaci su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Trajanje faza cijelog ABC-XYZ pipelinea (učitavanje iz baze, pivot tablice,
+ABC, XYZ, zalihe, grafovi, Excel i Parquet) na sintetičkim podacima malih,
+srednjih i velikih veličina, na SQLite zamjeni baze.
+
+Faze mjeri StageProfiler (kao ABC_XYZ.py --profile), a rezultat se sprema
+u JSON s oznakom commita; s --compare se ispisuje omjer prema ranijem JSON-u.
+
+Primjer:
+    python benchmarks/bench_pipeline.py --sizes small medium --db-dir /tmp/abc-bench
+    python benchmarks/bench_pipeline.py --sizes small --compare bench_pipeline_1a2b3c4.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from abc_xyz.pipeline import analyze_aggregate, load_picking_aggregate
+from abc_xyz.profiling import StageProfiler
+from abc_xyz.report import DEFAULT_OUTPUTS, parse_outputs, write_reports
+from abc_xyz.standin import connect_standin
+from synthetic import write_standin
+
+# Broj pikova, artikala i mjeseci po veličini; velika se čita u dijelovima
+SIZES = {
+    'small': {'rows': 200_000, 'items': 5_000, 'months': 12, 'chunk_rows': None},
+    'medium': {'rows': 2_000_000, 'items': 30_000, 'months': 24, 'chunk_rows': None},
+    'large': {'rows': 20_000_000, 'items': 100_000, 'months': 36, 'chunk_rows': 1_000_000}
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def standin_path(db_dir, size, seed):
+    # Baza se ponovno koristi ako već postoji za iste parametre
+    return os.path.join(db_dir, f"picking_{size['rows']}_{size['items']}_{size['months']}_{seed}.db")
+
+
+def run_size(name, size, db_dir, outputs, memory, seed):
+    path = standin_path(db_dir, size, seed)
+    setup_seconds = 0.0
+    if not os.path.exists(path):
+        print(f"[{name}] Punjenje SQLite baze s {size['rows']} pikova...")
+        start = time.perf_counter()
+        write_standin(path, size['rows'], n_items=size['items'], n_months=size['months'], seed=seed).close()
+        setup_seconds = time.perf_counter() - start
+
+    print(f"[{name}] Izvođenje pipelinea...")
+    profiler = StageProfiler(memory=memory)
+    conn = connect_standin(path)
+    with tempfile.TemporaryDirectory() as output_dir, redirect_stdout(open(os.devnull, 'w')):
+        agg = load_picking_aggregate(
+            conn, '2000-01-01', '2099-12-31', chunk_rows=size['chunk_rows'], profiler=profiler
+        )
+        results = analyze_aggregate(agg, profiler=profiler)
+        write_reports(results, output_dir, outputs, profiler=profiler)
+    conn.close()
+    profiler.stop()
+
+    print(f"[{name}] {profiler.summary_line()}")
+    return dict(size, items_analyzed=len(results['final_df']), setup_seconds=round(setup_seconds, 2),
+                **profiler.as_dict())
+
+
+def print_comparison(previous, current):
+    print(f"\nUsporedba s commitom {previous.get('commit')}:")
+    print(f"{'veličina':10}{'faza':14}{'prije (s)':>11}{'sada (s)':>11}{'omjer':>8}")
+    for name, run in current['sizes'].items():
+        before = {stage['stage']: stage['wall_seconds'] for stage in previous['sizes'].get(name, {}).get('stages', [])}
+        rows = [(stage['stage'], before.get(stage['stage']), stage['wall_seconds']) for stage in run['stages']]
+        rows.append(('ukupno', previous['sizes'].get(name, {}).get('total_wall_seconds'), run['total_wall_seconds']))
+        for stage, old, new in rows:
+            if old is None:
+                print(f"{name:10}{stage:14}{'-':>11}{new:11.2f}{'-':>8}")
+            else:
+                print(f"{name:10}{stage:14}{old:11.2f}{new:11.2f}{new / old if old else float('nan'):8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark faza ABC-XYZ pipelinea')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'],
+                        help='Veličine podataka')
+    parser.add_argument('--db-dir', type=str, help='Direktorij za SQLite baze (zadano privremeni)')
+    parser.add_argument('--outputs', type=str, default=','.join(DEFAULT_OUTPUTS), help='Izlazni formati')
+    parser.add_argument('--memory', action='store_true', help='Prati i vršnu memoriju (sporije)')
+    parser.add_argument('--seed', type=int, default=42, help='Sjeme generatora')
+    parser.add_argument('--output', type=str, help='JSON s rezultatima (zadano bench_pipeline_<commit>.json)')
+    parser.add_argument('--compare', type=str, help='Raniji JSON za usporedbu')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'sizes': {}
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_dir = args.db_dir or tmp_dir
+        os.makedirs(db_dir, exist_ok=True)
+        for name in args.sizes:
+            report['sizes'][name] = run_size(
+                name, SIZES[name], db_dir, parse_outputs(args.outputs), args.memory, args.seed
+            )
+
+    output = args.output or f"bench_pipeline_{commit or 'local'}.json"
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Rezultati spremljeni u {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            print_comparison(json.load(fh), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Usporedba učitavanja pojedinačnih pikova i agregatnog upita (pushdown) na SQLite zamjeni baze.
+
+Primjer:
+    python benchmarks/bench_pushdown.py --rows 2000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import aggregate_item_months, item_month_tables
+from abc_xyz.data import add_month_columns, build_picking_aggregate_query, build_picking_query, read_picking_aggregate
+from abc_xyz.engine import compute_xyz
+from abc_xyz.standin import connect_standin, load_picking_view
+from synthetic import synthetic_picking
+
+
+def raw_path(conn, start_date, end_date):
+    sql_query, params = build_picking_query(start_date, end_date)
+    df = pd.read_sql(sql_query, conn, params=params)
+    transferred = len(df)
+    agg = aggregate_item_months(add_month_columns(df))
+    return item_month_tables(agg), transferred
+
+
+def pushdown_path(conn, start_date, end_date):
+    sql_query, params = build_picking_aggregate_query(start_date, end_date)
+    agg = read_picking_aggregate(conn, sql_query, params)
+    return item_month_tables(agg), len(agg)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pushdown agregacije')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=20000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=12, help='Broj mjeseci')
+    args = parser.parse_args()
+
+    print(f"Punjenje SQLite zamjene s {args.rows} redaka...")
+    conn = connect_standin()
+    load_picking_view(conn, synthetic_picking(args.rows, args.items, args.months, with_dates=True))
+    start_date, end_date = '2023-01-01', '2099-12-31'
+
+    start = time.perf_counter()
+    raw_tables, raw_rows = raw_path(conn, start_date, end_date)
+    raw_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pushdown_tables, pushdown_rows = pushdown_path(conn, start_date, end_date)
+    pushdown_time = time.perf_counter() - start
+
+    print(f"{'':12}{'preneseno redaka':>18}{'vrijeme (s)':>14}")
+    print(f"{'pikovi':12}{raw_rows:18}{raw_time:14.2f}")
+    print(f"{'pushdown':12}{pushdown_rows:18}{pushdown_time:14.2f}")
+    print(f"manje prenesenih redaka: {raw_rows / max(pushdown_rows, 1):.1f}x")
+
+    # Pivot tablice i XYZ klasifikacija moraju biti jednaki
+    for raw_pivot, pushdown_pivot in zip(raw_tables[:2], pushdown_tables[:2]):
+        pd.testing.assert_frame_equal(raw_pivot, pushdown_pivot, check_dtype=False)
+    pd.testing.assert_frame_equal(compute_xyz(raw_tables[0]), compute_xyz(pushdown_tables[0]))
+
+    # Najčešći naziv i zona mogu se razlikovati samo kod izjednačenja
+    name_diff = sum(raw_tables[2][item] != pushdown_tables[2].get(item) for item in raw_tables[2])
+    zone_diff = sum(raw_tables[3][item] != pushdown_tables[3].get(item) for item in raw_tables[3])
+    print(f"Rezultati su jednaki (razlika kod izjednačenja: {name_diff} naziva, {zone_diff} zona).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Usporedba čitanja rezultata analize iz Excel izvještaja (pd.read_excel) i iz
+stupčastog rezultata abc_xyz_results.parquet.
+
+Primjer:
+    python benchmarks/bench_results_artifact.py --rows 2000000 --items 30000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import aggregate_item_months
+from abc_xyz.artifact import read_results_artifact, write_results_artifact
+from abc_xyz.pipeline import analyze_aggregate
+from synthetic import synthetic_picking
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark čitanja rezultata analize')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=30000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    args = parser.parse_args()
+
+    print(f"Analiza {args.rows} sintetičkih redaka...")
+    with redirect_stdout(open(os.devnull, 'w')):
+        results = analyze_aggregate(aggregate_item_months(synthetic_picking(args.rows, args.items, args.months)))
+    breakdown = results['final_df'][results['final_columns']]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        excel_file = os.path.join(output_dir, 'abc_xyz_monthly_breakdown.xlsx')
+        excel_write, _ = timed(lambda: breakdown.to_excel(excel_file, sheet_name='Monthly Breakdown'))
+        parquet_write, parquet_file = timed(lambda: write_results_artifact(results, output_dir))
+
+        excel_read, excel_df = timed(lambda: pd.read_excel(excel_file, sheet_name='Monthly Breakdown'))
+        parquet_read, table = timed(lambda: read_results_artifact(parquet_file))
+
+        excel_size = os.path.getsize(excel_file)
+        parquet_size = os.path.getsize(parquet_file)
+
+    print(f"{'':10}{'zapis (s)':>12}{'čitanje (s)':>14}{'veličina (MB)':>16}")
+    print(f"{'xlsx':10}{excel_write:12.2f}{excel_read:14.2f}{excel_size / 2**20:16.1f}")
+    print(f"{'parquet':10}{parquet_write:12.2f}{parquet_read:14.2f}{parquet_size / 2**20:16.1f}")
+    print(f"brže čitanje: {excel_read / parquet_read:.1f}x")
+
+    # Parquet sadrži sve kolone mjesečne tablice s istim vrijednostima
+    excel_df = excel_df.rename(columns={excel_df.columns[0]: 'Item'})
+    pd.testing.assert_frame_equal(table[list(excel_df.columns)], excel_df, check_dtype=False)
+    print("Rezultati su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Usporedba vremena od zahtjeva do odgovora: pokretanje ABC_XYZ.py kao zasebnog procesa
+s čitanjem Excel izvještaja (dosadašnji run_abc_xyz_script) i poziv abc_xyz.pipeline.run_analysis
+u istom procesu. Oba puta čitaju podatke iz iste SQLite zamjene baze.
+
+Primjer:
+    python benchmarks/bench_run_latency.py --rows 500000 --repeat 3
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from abc_xyz.pipeline import run_analysis
+from abc_xyz.standin import connect_standin, load_picking_view
+from synthetic import synthetic_picking
+
+# Pokretač skripte u zasebnom procesu: pyodbc.connect vraća SQLite zamjenu
+SCRIPT_LAUNCHER = """
+import runpy, sys, types
+sys.path.insert(0, {repo_root!r})
+from abc_xyz.standin import connect_standin
+sys.modules['pyodbc'] = types.SimpleNamespace(connect=lambda *args, **kwargs: connect_standin({db_path!r}))
+sys.argv = ['ABC_XYZ.py'] + {script_args!r}
+runpy.run_path({script!r}, run_name='__main__')
+"""
+
+
+def subprocess_request(db_path, start_date, end_date):
+    # Kao dosadašnji run_abc_xyz_script: proces, Excel izvještaj, pd.read_excel
+    with tempfile.TemporaryDirectory() as temp_dir:
+        launcher = SCRIPT_LAUNCHER.format(
+            repo_root=REPO_ROOT,
+            db_path=db_path,
+            script=os.path.join(REPO_ROOT, 'ABC_XYZ.py'),
+            script_args=['--output-dir', temp_dir, '--start-date', start_date, '--end-date', end_date]
+        )
+        subprocess.run(
+            [sys.executable, '-c', launcher],
+            capture_output=True, text=True, check=True, env={**os.environ, 'MPLBACKEND': 'Agg'}
+        )
+        return pd.read_excel(os.path.join(temp_dir, 'abc_xyz_monthly_breakdown.xlsx'), sheet_name='Monthly Breakdown')
+
+
+def in_process_request(db_path, start_date, end_date):
+    conn = connect_standin(db_path)
+    try:
+        with redirect_stdout(open(os.devnull, 'w')):
+            results = run_analysis(conn, start_date, end_date)
+    finally:
+        conn.close()
+    return results['final_df'][results['final_columns']].reset_index()
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark latencije pokretanja analize')
+    parser.add_argument('--rows', type=int, default=500_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=5000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=12, help='Broj mjeseci')
+    parser.add_argument('--repeat', type=int, default=3, help='Broj ponavljanja (uzima se najbolje vrijeme)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_path = os.path.join(db_dir, 'reports.db')
+        print(f"Punjenje SQLite zamjene s {args.rows} redaka...")
+        conn = connect_standin(db_path)
+        load_picking_view(conn, synthetic_picking(args.rows, args.items, args.months, with_dates=True))
+        conn.close()
+        start_date, end_date = '2023-01-01', '2099-12-31'
+
+        old_time, old_df = measure(lambda: subprocess_request(db_path, start_date, end_date), args.repeat)
+        new_time, new_df = measure(lambda: in_process_request(db_path, start_date, end_date), args.repeat)
+
+    print(f"{'':22}{'vrijeme (s)':>14}")
+    print(f"{'proces + Excel':22}{old_time:14.2f}")
+    print(f"{'u procesu':22}{new_time:14.2f}")
+    print(f"ubrzanje: {old_time / new_time:.1f}x")
+
+    # Tablica za bazu mora biti ista kao ona pročitana iz Excela
+    pd.testing.assert_frame_equal(old_df, new_df, check_dtype=False, check_names=False)
+    print("Rezultati su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+"Što ako" reklasifikacija spremljenog rezultata (Reclassifier nad tablicom
+rezultata) naspram ponovne analize agregata s novim granicama i faktorima.
+
+Primjer:
+    python benchmarks/bench_whatif.py --rows 3000000 --items 50000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import aggregate_item_months
+from abc_xyz.artifact import results_table
+from abc_xyz.pipeline import analyze_aggregate
+from abc_xyz.whatif import Reclassifier
+from synthetic import synthetic_picking
+
+# Izmijenjene granice i faktori koje planer isprobava
+WHATIF_PARAMS = {
+    'a_threshold': 70.0,
+    'b_threshold': 90.0,
+    'x_threshold': 25.0,
+    'y_threshold': 50.0,
+    'inventory_params': {
+        'lead_time_weeks': 3.0,
+        'safety_stock_factors': {'X': 1.2, 'Y': 1.8, 'Z': 3.0},
+        'max_qty_factors': {'A': 1.5, 'B': 2.5, 'C': 3.0}
+    }
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark "što ako" reklasifikacije')
+    parser.add_argument('--rows', type=int, default=3_000_000, help='Broj picking redaka')
+    parser.add_argument('--items', type=int, default=50000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--repeat', type=int, default=20, help='Broj ponavljanja reklasifikacije')
+    args = parser.parse_args()
+
+    print(f"Analiza {args.rows} sintetičkih redaka...")
+    agg = aggregate_item_months(synthetic_picking(args.rows, args.items, args.months))
+    with redirect_stdout(open(os.devnull, 'w')):
+        table = results_table(analyze_aggregate(agg))
+
+        start = time.perf_counter()
+        expected = results_table(analyze_aggregate(agg, **WHATIF_PARAMS))
+        rerun_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reclassifier = Reclassifier(table)
+    prepare_time = time.perf_counter() - start
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        reclassified = reclassifier.reclassify(**WHATIF_PARAMS)
+        comparison = reclassifier.compare(reclassified)
+        timings.append(time.perf_counter() - start)
+    whatif_time = statistics.median(timings)
+
+    print(f"ponovna analiza agregata: {rerun_time * 1000:10.1f} ms")
+    print(f"priprema (jednom po rezultatu): {prepare_time * 1000:4.1f} ms")
+    print(f"reklasifikacija i usporedba: {whatif_time * 1000:7.1f} ms (medijan od {args.repeat})")
+    print(f"ubrzanje: {rerun_time / whatif_time:.0f}x")
+    print(f"promjene min/max: {comparison['min_max']['items_changed']} artikala, "
+          f"prelazaka klasa: {sum(row['item_count'] for row in comparison['migrations'])}")
+
+    # Iste klase i min/max količine kao ponovna analiza s novim parametrima
+    assert (reclassified['abc'] == expected['ABC'].to_numpy()).all()
+    assert (reclassified['xyz'] == expected['XYZ'].to_numpy()).all()
+    np.testing.assert_array_equal(reclassified['min_qty'], expected['Min Qty Monthly'].to_numpy())
+    np.testing.assert_array_equal(reclassified['max_qty'], expected['Max Qty Monthly'].to_numpy())
+    print("Rezultati su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Usporedba dosadašnje XYZ petlje iz ABC_XYZ.py i vektoriziranog abc_xyz.engine.compute_xyz.
+
+Primjer:
+    python benchmarks/bench_xyz.py --items 30000 --months 24
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.engine import compute_xyz
+
+
+def legacy_xyz(turnover_pivot):
+    # Petlja preuzeta iz ABC_XYZ.py prije vektorizacije
+    xyz_df = pd.DataFrame(index=turnover_pivot.index)
+    for item in turnover_pivot.index:
+        monthly_values = turnover_pivot.loc[item, turnover_pivot.columns != 'Total Turnover']
+        std_dev = monthly_values.std()
+        mean = monthly_values.mean()
+        if mean > 0:
+            coef_var = (std_dev / mean) * 100
+        else:
+            coef_var = 0
+        xyz_df.loc[item, 'Standard Deviation'] = std_dev
+        xyz_df.loc[item, 'Coefficient Variation'] = coef_var
+
+    xyz_df['XYZ'] = 'Z'
+    xyz_df.loc[xyz_df['Coefficient Variation'] <= 20, 'XYZ'] = 'X'
+    xyz_df.loc[(xyz_df['Coefficient Variation'] > 20) & (xyz_df['Coefficient Variation'] <= 40), 'XYZ'] = 'Y'
+    return xyz_df
+
+
+def synthetic_turnover_pivot(n_items, n_months, seed=42):
+    # Broj pikova po artiklu i mjesecu: Poissonova razdioba s različitim intenzitetom po artiklu
+    rng = np.random.default_rng(seed)
+    rates = rng.pareto(1.2, size=n_items) * 5
+    counts = rng.poisson(rates[:, None], size=(n_items, n_months))
+    # Dio artikala bez ijednog pika (srednja vrijednost 0)
+    counts[rng.random(n_items) < 0.02] = 0
+    months = [f"{m % 12 + 1:02d}.{2023 + m // 12}" for m in range(n_months)]
+    pivot = pd.DataFrame(counts, index=[f"ART{i:06d}" for i in range(n_items)], columns=sorted(months))
+    pivot['Total Turnover'] = pivot.sum(axis=1)
+    return pivot
+
+
+def best_of(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='XYZ benchmark')
+    parser.add_argument('--items', type=int, default=5000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--repeat', type=int, default=3, help='Broj ponavljanja (uzima se najbolje vrijeme)')
+    parser.add_argument('--skip-legacy', action='store_true', help='Ne pokretati staru petlju')
+    args = parser.parse_args()
+
+    pivot = synthetic_turnover_pivot(args.items, args.months)
+    print(f"Podaci: {args.items} artikala × {args.months} mjeseci")
+
+    engine_time, engine_df = best_of(lambda: compute_xyz(pivot), args.repeat)
+    print(f"compute_xyz:  {engine_time * 1000:10.1f} ms")
+
+    if args.skip_legacy:
+        return
+
+    # Stara petlja je spora pa se pokreće samo jednom
+    legacy_time, legacy_df = best_of(lambda: legacy_xyz(pivot), 1)
+    print(f"stara petlja: {legacy_time * 1000:10.1f} ms")
+    print(f"ubrzanje:     {legacy_time / engine_time:10.1f}x")
+
+    pd.testing.assert_frame_equal(engine_df, legacy_df, check_exact=True)
+    print("Rezultati su identični.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Usporedba ABC analize po zonama skladišta: dosadašnje filtriranje
+final_df po svakoj zoni (u listama za sažetak i ponovno za usporedbu) i
+jedan sortirani groupby izračun (compute_zone_abc / zone_report_tables).
+
+Primjer:
+    python benchmarks/bench_zone_abc.py --items 100000 --zones 300
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.engine import compute_abc
+from abc_xyz.report import zone_report_tables
+
+
+def legacy_zone_tables(final_df):
+    # Kod preuzet iz write_zone_report prije groupby izračuna (bez pisanja u Excel)
+    unique_zones = sorted(final_df['Warehouse zone'].unique())
+    zone_summary_df = pd.DataFrame({
+        'Zone': unique_zones,
+        'Item Count': [len(final_df[final_df['Warehouse zone'] == zone]) for zone in unique_zones]
+    })
+    for abc_cat in ['A', 'B', 'C']:
+        zone_summary_df[f'{abc_cat} Items'] = [
+            len(final_df[(final_df['Warehouse zone'] == zone) & (final_df['ABC'] == abc_cat)])
+            for zone in unique_zones
+        ]
+        zone_summary_df[f'{abc_cat} %'] = zone_summary_df[f'{abc_cat} Items'] / zone_summary_df['Item Count'] * 100
+    zone_summary_df['Total Turnover'] = [
+        final_df[final_df['Warehouse zone'] == zone]['Total Turnover'].sum()
+        for zone in unique_zones
+    ]
+    zone_summary_df = zone_summary_df.sort_values('Total Turnover', ascending=False)
+
+    def zone_abc(zone):
+        zone_df = final_df[final_df['Warehouse zone'] == zone].copy()
+        zone_df = zone_df.reset_index()
+        zone_df = zone_df.sort_values('Total Turnover', ascending=False)
+        zone_df['Zone Percentage'] = 100 * zone_df['Total Turnover'] / zone_df['Total Turnover'].sum()
+        zone_df['Zone Cumulative %'] = zone_df['Zone Percentage'].cumsum()
+        zone_df['Zone ABC'] = 'C'
+        zone_df.loc[zone_df['Zone Cumulative %'] <= 80, 'Zone ABC'] = 'A'
+        zone_df.loc[(zone_df['Zone Cumulative %'] > 80) & (zone_df['Zone Cumulative %'] <= 95), 'Zone ABC'] = 'B'
+        zone_df['Zone Rank'] = range(1, len(zone_df) + 1)
+        return zone_df
+
+    zone_sheets = {}
+    for zone in unique_zones:
+        if len(final_df[final_df['Warehouse zone'] == zone]) < 5:
+            continue
+        zone_sheets[zone] = zone_abc(zone)
+
+    comparison_data = []
+    for zone in unique_zones:
+        zone_df = final_df[final_df['Warehouse zone'] == zone].copy()
+        if len(zone_df) < 5:
+            continue
+        zone_df = zone_abc(zone)
+        for abc_global in ['A', 'B', 'C']:
+            for abc_zone in ['A', 'B', 'C']:
+                count = len(zone_df[(zone_df['ABC'] == abc_global) & (zone_df['Zone ABC'] == abc_zone)])
+                if count > 0:
+                    comparison_data.append({
+                        'Zone': zone, 'Global ABC': abc_global, 'Zone ABC': abc_zone,
+                        'Item Count': count, 'Percentage': count / len(zone_df) * 100
+                    })
+
+    return zone_summary_df, zone_sheets, pd.DataFrame(comparison_data)
+
+
+def synthetic_final_df(n_items, n_zones, seed=42):
+    rng = np.random.default_rng(seed)
+    items = pd.Index([f"ART{i:06d}" for i in range(n_items)], name='Item')
+    turnover = pd.Series(np.round(rng.lognormal(5, 2, n_items), 2), index=items)
+    final_df = compute_abc(turnover, turnover / 10).set_index('Item')
+    final_df['Name'] = [f"Artikl broj {i}" for i in range(n_items)]
+    final_df['XYZ'] = rng.choice(list('XYZ'), size=n_items)
+    # Zone različitih veličina, uključujući zone s manje od 5 artikala
+    weights = 1.0 / np.arange(1, n_zones + 1) ** 1.5
+    final_df['Warehouse zone'] = np.array([f"ZONA{z:03d}" for z in range(n_zones)], dtype=object)[
+        rng.choice(n_zones, size=n_items, p=weights / weights.sum())
+    ]
+    return final_df
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ABC analize po zonama')
+    parser.add_argument('--items', type=int, default=100000, help='Broj artikala')
+    parser.add_argument('--zones', type=int, default=300, help='Broj zona skladišta')
+    args = parser.parse_args()
+
+    final_df = synthetic_final_df(args.items, args.zones)
+
+    legacy_time, (legacy_summary, legacy_sheets, legacy_comparison) = timed(lambda: legacy_zone_tables(final_df))
+    new_time, (summary, zone_abc, comparison) = timed(lambda: zone_report_tables(final_df))
+
+    print(f"{'':22}{'vrijeme (s)':>12}")
+    print(f"{'filtriranje po zoni':22}{legacy_time:12.2f}")
+    print(f"{'groupby':22}{new_time:12.3f}")
+    print(f"ubrzanje: {legacy_time / new_time:.0f}x za {args.items} artikala i {args.zones} zona")
+
+    # Isti sažetak, listovi po zonama i usporedba
+    pd.testing.assert_frame_equal(legacy_summary, summary, check_index_type=False, check_dtype=False)
+    columns = ['Item', 'Name', 'ABC', 'Zone ABC', 'XYZ', 'Total Turnover', 'Total Qty',
+               'Zone Percentage', 'Zone Cumulative %', 'Zone Rank']
+    assert list(legacy_sheets) == list(zone_abc['Warehouse zone'].unique())
+    for zone, zone_df in zone_abc.groupby('Warehouse zone', sort=False):
+        pd.testing.assert_frame_equal(
+            legacy_sheets[zone][columns].reset_index(drop=True),
+            zone_df.reset_index()[columns].reset_index(drop=True),
+            check_dtype=False
+        )
+    pd.testing.assert_frame_equal(legacy_comparison, comparison, check_dtype=False)
+    print(f"Sažetak, {len(legacy_sheets)} listova po zonama i usporedba su jednaki.")
+
+
+if __name__ == "__main__":
+    main()
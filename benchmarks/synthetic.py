@@ -0,0 +1,275 @@
+"""
+Sintetički picking podaci u obliku koji vraća SQL upit iz ABC_XYZ.py.
+
+synthetic_picking daje male tablice u memoriji za pojedinačne benchmarke;
+synthetic_view_chunks daje sve kolone view-a v_pickingStorageSystem u
+dijelovima, pa se može generirati i do 50M redaka bez držanja svega u memoriji.
+
+Primjer (SQLite zamjena baze s 10M pikova za ABC_XYZ pipeline):
+    python benchmarks/synthetic.py --rows 10000000 --items 60000 --sqlite reports.db
+"""
+import argparse
+import calendar
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc_xyz.aggregation import DATE_COL, DESC_COL, GROUP_COL, ITEM_COL, MONTH_COL, QTY_COL
+
+ZONES = ['PALETNO', 'POLICE', 'VIŠEKATNO', 'HLADNJAČA', 'RUČNO', 'BLOK']
+
+# Udio zona u asortimanu (police i paletno skladište nose većinu artikala)
+ZONE_SHARES = [0.25, 0.35, 0.15, 0.05, 0.12, 0.08]
+
+DELIVERY_TYPES = ['Standardna', 'Hitna', 'Osobno preuzimanje', 'Dostava kupcu']
+
+# Broj sezonskih profila (vrh u svakom mjesecu) i udio artikala bez sezonalnosti
+SEASONAL_PROFILES = 12
+NON_SEASONAL_SHARE = 0.5
+
+FIRST_YEAR = 2023
+
+
+def synthetic_picking(n_rows, n_items=30000, n_months=24, seed=42, with_dates=False):
+    """
+    Generira n_rows picking redaka s približno Zipfovom popularnošću artikala.
+
+    Svaki artikl ima glavni naziv i zonu, a mali dio redaka nosi drugi naziv
+    ili drugu zonu kako bi odabir najčešće vrijednosti imao smisla.
+    """
+    rng = np.random.default_rng(seed)
+
+    weights = 1.0 / np.arange(1, n_items + 1) ** 1.1
+    item_idx = rng.choice(n_items, size=n_rows, p=weights / weights.sum())
+
+    item_codes = np.array([f"ART{i:06d}" for i in range(n_items)], dtype=object)
+    item_names = np.array([f"Artikl broj {i}" for i in range(n_items)], dtype=object)
+    alt_names = np.array([f"Artikl broj {i} (stari naziv)" for i in range(n_items)], dtype=object)
+    zones = np.array(ZONES, dtype=object)
+    item_zone = rng.integers(0, len(ZONES), size=n_items)
+
+    names = item_names[item_idx]
+    renamed = rng.random(n_rows) < 0.02
+    names[renamed] = alt_names[item_idx[renamed]]
+
+    zone_idx = item_zone[item_idx]
+    moved = rng.random(n_rows) < 0.05
+    zone_idx[moved] = rng.integers(0, len(ZONES), size=moved.sum())
+
+    month_idx = rng.integers(0, n_months, size=n_rows)
+    month_labels = np.array(
+        [f"{(m % 12) + 1:02d}.{2023 + m // 12}" for m in range(n_months)], dtype=object
+    )
+
+    df = pd.DataFrame({
+        ITEM_COL: item_codes[item_idx],
+        DESC_COL: names,
+        GROUP_COL: zones[zone_idx],
+        QTY_COL: rng.integers(1, 25, size=n_rows).astype(np.float64),
+        MONTH_COL: month_labels[month_idx]
+    })
+
+    if with_dates:
+        month_starts = pd.to_datetime([f"{2023 + m // 12}-{(m % 12) + 1:02d}-01" for m in range(n_months)])
+        seconds = rng.integers(0, 28 * 24 * 3600, size=n_rows)
+        df[DATE_COL] = month_starts.values[month_idx] + seconds.astype('timedelta64[s]')
+
+    return df
+
+
+class _Catalog:
+    # Svojstva artikala, lokacija, kupaca i sezonskih profila, zajednička svim dijelovima
+
+    def __init__(self, n_items, n_months, zipf_exponent, seasonality, n_customers, n_pickers, seed):
+        rng = np.random.default_rng([seed, 0])
+        self.n_items = n_items
+        self.n_months = n_months
+
+        # Zipfova popularnost artikala; redoslijed popularnosti ne prati šifre
+        weights = 1.0 / np.arange(1, n_items + 1) ** zipf_exponent
+        self.item_p = rng.permutation(weights / weights.sum())
+
+        self.item_codes = np.array([f"ART{i:06d}" for i in range(n_items)], dtype=object)
+        self.item_names = np.array([f"Artikl broj {i}" for i in range(n_items)], dtype=object)
+        self.alt_names = np.array([f"Artikl broj {i} (stari naziv)" for i in range(n_items)], dtype=object)
+
+        # Svaki artikl ima svoju lokaciju u svojoj zoni; lokacija je šifra zone i artikla
+        self.item_zone = rng.choice(len(ZONES), size=n_items, p=ZONE_SHARES)
+        self.location_codes = np.array(
+            [f"{ZONES[zone][:3]}-{i // 40:04d}-{i % 40:02d}" for i, zone in enumerate(self.item_zone)],
+            dtype=object
+        )
+        self.zones = np.array(ZONES, dtype=object)
+
+        # Tipična količina po piku (paletna roba u većim količinama)
+        self.item_qty = np.maximum(1.0, rng.lognormal(mean=1.0, sigma=0.8, size=n_items))
+        self.item_qty[self.item_zone == ZONES.index('PALETNO')] *= 4
+
+        # Sezonski profil artikla: 0 je bez sezonalnosti, 1..12 ima vrh u tom mjesecu
+        seasonal = rng.random(n_items) >= NON_SEASONAL_SHARE
+        self.item_profile = np.where(seasonal, rng.integers(1, SEASONAL_PROFILES + 1, size=n_items), 0)
+        calendar_month = np.arange(n_months) % 12
+        growth = 1 + 0.1 * np.arange(n_months) / 12  # Blagi rast prometa iz godine u godinu
+        self.profile_month_p = []
+        for profile in range(SEASONAL_PROFILES + 1):
+            month_weights = growth.copy()
+            if profile:
+                month_weights *= 1 + seasonality * np.cos(2 * np.pi * (calendar_month - (profile - 1)) / 12)
+            self.profile_month_p.append(month_weights / month_weights.sum())
+
+        self.month_starts = np.array(
+            [np.datetime64(f"{FIRST_YEAR + m // 12}-{(m % 12) + 1:02d}-01", 's') for m in range(n_months)]
+        )
+        self.month_seconds = np.array(
+            [calendar.monthrange(FIRST_YEAR + m // 12, (m % 12) + 1)[1] * 24 * 3600 for m in range(n_months)]
+        )
+
+        customer_weights = 1.0 / np.arange(1, n_customers + 1)
+        self.customer_p = customer_weights / customer_weights.sum()
+        self.customers = np.array([f"KUPAC {i:05d}" for i in range(n_customers)], dtype=object)
+        self.pickers = np.array([f"picker{i:03d}" for i in range(n_pickers)], dtype=object)
+        self.delivery_types = np.array(DELIVERY_TYPES, dtype=object)
+
+    def chunk(self, rng, n_rows, first_log_id):
+        item_idx = rng.choice(self.n_items, size=n_rows, p=self.item_p)
+
+        # Mjesec prema sezonskom profilu artikla
+        month_idx = np.empty(n_rows, dtype=np.int64)
+        profiles = self.item_profile[item_idx]
+        for profile, month_p in enumerate(self.profile_month_p):
+            mask = profiles == profile
+            month_idx[mask] = rng.choice(self.n_months, size=mask.sum(), p=month_p)
+
+        # Vrijeme pika unutar mjeseca, radnim satima
+        seconds = (rng.random(n_rows) * self.month_seconds[month_idx]).astype(np.int64)
+        seconds = seconds - seconds % 86400 + rng.integers(6 * 3600, 22 * 3600, size=n_rows)
+        seconds = np.minimum(seconds, self.month_seconds[month_idx] - 1)
+        pick_time = self.month_starts[month_idx] + seconds.astype('timedelta64[s]')
+
+        # Mali dio pikova nosi stari naziv ili dolazi s lokacije drugog artikla (druga zona)
+        names = self.item_names[item_idx]
+        renamed = rng.random(n_rows) < 0.02
+        names[renamed] = self.alt_names[item_idx[renamed]]
+        location_idx = item_idx.copy()
+        moved = rng.random(n_rows) < 0.05
+        location_idx[moved] = rng.integers(0, self.n_items, size=moved.sum())
+
+        qty = np.maximum(1, rng.poisson(self.item_qty[item_idx])).astype(np.float64)
+
+        # Nalog okuplja ~8 pikova; zadatak i picking lista su dijelovi naloga
+        log_ids = np.arange(first_log_id, first_log_id + n_rows)
+        order_no = log_ids // 8
+        customer_idx = rng.choice(len(self.customers), size=n_rows, p=self.customer_p)
+        order_time = pick_time - rng.integers(600, 2 * 86400, size=n_rows).astype('timedelta64[s]')
+
+        return pd.DataFrame({
+            'Broj naloga': [f"NAL{n:09d}" for n in order_no],
+            'Datum_naloga': order_time.astype('datetime64[D]'),
+            'Vrsta isporuke': self.delivery_types[rng.integers(0, len(DELIVERY_TYPES), size=n_rows)],
+            'Broj taska': [f"T{n:010d}" for n in log_ids // 3],
+            'Picking list': [f"PL{n:08d}" for n in order_no // 4],
+            'datum taska': pick_time - rng.integers(60, 3600, size=n_rows).astype('timedelta64[s]'),
+            DATE_COL: pick_time,
+            'Lokacija': self.location_codes[location_idx],
+            GROUP_COL: self.zones[self.item_zone[location_idx]],
+            ITEM_COL: self.item_codes[item_idx],
+            DESC_COL: names,
+            QTY_COL: qty,
+            'Korisnik': self.pickers[rng.integers(0, len(self.pickers), size=n_rows)],
+            'Kupac': self.customers[customer_idx],
+            'Primatelj': self.customers[customer_idx],
+            'LogID': log_ids
+        })
+
+
+def synthetic_view_chunks(
+    n_rows,
+    n_items=30000,
+    n_months=24,
+    chunk_rows=1_000_000,
+    seed=42,
+    zipf_exponent=1.1,
+    seasonality=0.6,
+    n_customers=2000,
+    n_pickers=60
+):
+    """
+    Generira n_rows pikova sa svim kolonama view-a v_pickingStorageSystem, u dijelovima.
+
+    Popularnost artikala je Zipfova, pola artikala ima sezonski vrh u jednom
+    mjesecu (ostali samo blagi rast kroz godine), a zona dolazi iz lokacije
+    pika kao u view-u. Dio pikova nosi stari naziv artikla ili dolazi s
+    lokacije u drugoj zoni. Isti seed i chunk_rows daju iste podatke.
+
+    Args:
+        n_rows: Ukupan broj pikova
+        n_items: Broj artikala
+        n_months: Broj mjeseci od siječnja FIRST_YEAR
+        chunk_rows: Broj redaka po dijelu
+        seed: Sjeme generatora slučajnih brojeva
+        zipf_exponent: Eksponent Zipfove raspodjele popularnosti
+        seasonality: Amplituda sezonskog vrha (0 bez sezonalnosti)
+        n_customers: Broj kupaca (također Zipfova raspodjela)
+        n_pickers: Broj skladištara
+
+    Yields:
+        DataFrame s nazivima kolona iz ABC_XYZ.py upita i kolonom 'LogID'
+    """
+    catalog = _Catalog(n_items, n_months, zipf_exponent, seasonality, n_customers, n_pickers, seed)
+    for chunk_no, start in enumerate(range(0, n_rows, chunk_rows), start=1):
+        rng = np.random.default_rng([seed, chunk_no])
+        yield catalog.chunk(rng, min(chunk_rows, n_rows - start), start + 1)
+
+
+def write_standin(path, n_rows, **kwargs):
+    """
+    Puni SQLite zamjenu baze (abc_xyz.standin) tablicom dbo.v_pickingStorageSystem.
+
+    Returns:
+        Konekcija iz connect_standin
+    """
+    from abc_xyz.standin import connect_standin, load_picking_view
+
+    conn = connect_standin(path)
+    for chunk in synthetic_view_chunks(n_rows, **kwargs):
+        load_picking_view(conn, chunk)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS dbo.IX_v_pickingStorageSystem_PickDateTime "
+        "ON v_pickingStorageSystem (PickDateTime)"
+    )
+    conn.commit()
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generator sintetičkih picking podataka')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Broj pikova (do 50M)')
+    parser.add_argument('--items', type=int, default=30000, help='Broj artikala')
+    parser.add_argument('--months', type=int, default=24, help='Broj mjeseci')
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help='Broj redaka po dijelu')
+    parser.add_argument('--seed', type=int, default=42, help='Sjeme generatora')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--sqlite', type=str, help='SQLite zamjena baze (abc_xyz.standin)')
+    target.add_argument('--parquet-dir', type=str, help='Direktorij za Parquet datoteke po dijelovima')
+    args = parser.parse_args()
+
+    options = dict(n_items=args.items, n_months=args.months, chunk_rows=args.chunk_rows, seed=args.seed)
+    start = time.perf_counter()
+    if args.sqlite:
+        print(f"Punjenje SQLite baze {args.sqlite} s {args.rows} pikova...")
+        write_standin(args.sqlite, args.rows, **options).close()
+    else:
+        print(f"Spremanje {args.rows} pikova u {args.parquet_dir}...")
+        os.makedirs(args.parquet_dir, exist_ok=True)
+        for chunk_no, chunk in enumerate(synthetic_view_chunks(args.rows, **options)):
+            chunk.to_parquet(os.path.join(args.parquet_dir, f"picking-{chunk_no:05d}.parquet"), index=False)
+    print(f"Gotovo za {time.perf_counter() - start:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+USE [Reports]
+GO
+
+-- Trajanje i memorija po fazama svake analize pokrenute iz backenda
+-- (jedan redak po fazi; puni ga run_abc_xyz_script uz ANALYSIS_PROFILE=True).
+IF OBJECT_ID(N'[dbo].[AnalysisRunProfiles]', N'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[AnalysisRunProfiles] (
+        [ProfileID] INT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+        [ResultID] INT NOT NULL REFERENCES [dbo].[AnalysisResults] ([ResultID]) ON DELETE CASCADE,
+        [StageOrder] INT NOT NULL,
+        [Stage] NVARCHAR(50) NOT NULL,
+        [WallSeconds] FLOAT NULL,
+        [CpuSeconds] FLOAT NULL,
+        [PeakMemoryMB] FLOAT NULL
+    )
+
+    CREATE INDEX [IX_AnalysisRunProfiles_Stage_Result]
+        ON [dbo].[AnalysisRunProfiles] ([Stage], [ResultID])
+END
+GO
+
+-- Primjer praćenja regresija: prosječno trajanje faza po tjednu
+--   SELECT p.Stage, DATEPART(ISO_WEEK, r.AnalysisDate) AS Week, AVG(p.WallSeconds) AS AvgSeconds
+--   FROM dbo.AnalysisRunProfiles p JOIN dbo.AnalysisResults r ON r.ResultID = p.ResultID
+--   GROUP BY p.Stage, DATEPART(ISO_WEEK, r.AnalysisDate)
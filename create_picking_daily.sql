@@ -0,0 +1,24 @@
+USE [Reports]
+GO
+
+-- Dnevni agregat picking podataka: jedan redak po danu, artiklu, nazivu i zoni.
+-- Puni ga "python -m abc_xyz.daily" nakon sp_Import_Picking (vidi run_daily_import.bat).
+IF OBJECT_ID(N'[dbo].[PickingDaily]', N'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[PickingDaily] (
+        [PickDate] DATE NOT NULL,
+        [ItemCode] NVARCHAR(50) NOT NULL,
+        [ItemName] NVARCHAR(500) NULL,
+        [Storage_system] NVARCHAR(50) NULL,
+        [PickCount] INT NOT NULL,
+        [QtyCount] INT NOT NULL,
+        [QtySum] FLOAT NULL
+    )
+
+    CREATE CLUSTERED INDEX [IX_PickingDaily_Date_Item_Zone]
+        ON [dbo].[PickingDaily] ([PickDate], [ItemCode], [Storage_system])
+END
+GO
+
+-- Jednokratno punjenje povijesti:
+--   python -m abc_xyz.daily backfill --start-date 2023-01-01 --end-date <jučer>
@@ -1,4 +1,17 @@
 @echo off
 echo Pokretanje dnevnog importa podataka u Picking tablicu...
-sqlcmd -S ft-AppServer01\SQLEXPRESS -d Reports -i "C:\VS\Reports\daily_import_picking.sql" -o "C:\VS\Reports\logs\import_log_%date:~-4,4%%date:~-7,2%%date:~-10,2%.txt"
+sqlcmd -b -S ft-AppServer01\SQLEXPRESS -d Reports -i "C:\VS\Reports\daily_import_picking.sql" -o "C:\VS\Reports\logs\import_log_%date:~-4,4%%date:~-7,2%%date:~-10,2%.txt"
+if errorlevel 1 (
+    echo Import nije uspio; dnevni agregat i dashboard se ne osvježavaju.
+    exit /b 1
+)
 echo Import završen.
+echo Osvježavanje dnevnog agregata picking podataka...
+cd /d "C:\VS\Reports"
+python -m abc_xyz.daily refresh >> "C:\VS\Reports\logs\import_log_%date:~-4,4%%date:~-7,2%%date:~-10,2%.txt"
+if errorlevel 1 (
+    echo Osvježavanje dnevnog agregata nije uspjelo; dashboard se ne osvježava.
+    exit /b 1
+)
+echo Osvježavanje sažetka dashboarda...
+curl -s -X POST -H "X-Import-Token: %IMPORT_NOTIFY_TOKEN%" http://localhost:6000/api/dashboard/cache/invalidate